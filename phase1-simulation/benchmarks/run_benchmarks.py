@@ -0,0 +1,482 @@
+"""
+Phase 1 benchmark suite: timings for the simulation and alert hot paths,
+stored as JSON baselines and gated against regressions.
+
+Usage (from the repository root):
+    python phase1-simulation/benchmarks/run_benchmarks.py                   # compare with baseline
+    python phase1-simulation/benchmarks/run_benchmarks.py --update-baseline # record a new baseline
+    python phase1-simulation/benchmarks/run_benchmarks.py --filter alert_logic
+
+Timings are host-specific: record the baseline on the machine that runs the
+gate. Absolute limits (max_seconds / min_rate) apply on any host.
+"""
+import sys
+import os
+import gc
+import io
+import json
+import time
+import argparse
+import platform
+import contextlib
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+for path in (os.path.join(project_dir, 'src'), project_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+import numpy as np
+
+from wound_model import WoundModel
+from noise import NoiseGenerator
+from sensor_channel import SensorChannel
+from alert_logic import AlertLogic
+from alert_service import LocalBroker, AlertService
+from trace_evaluator import evaluate_traces
+from monte_carlo import make_simulator
+
+BASELINE_PATH = os.path.join(current_dir, 'baseline.json')
+DEFAULT_TOLERANCE = 0.5     # allowed slowdown vs baseline (0.5 = 50% slower)
+DEFAULT_REPEAT = 5
+MIN_TIME_S = 0.2            # keep repeating short cases until this much time is measured
+MAX_RUNS = 1000
+MIN_REGRESSION_S = 5e-5     # slowdowns smaller than this are timer noise, never a regression
+
+SAMPLING_INTERVALS = [5, 15, 60]
+SIMULATION_DAYS = 10
+
+# ==============================
+# REGISTRY
+# ==============================
+BENCHMARKS = []
+
+
+def benchmark(name, grid=None, max_seconds=None, min_rate=None):
+    """
+    Register a benchmark case.
+
+    The decorated function takes the grid parameters as keyword arguments
+    and returns (run, items): run() executes the measured work once and
+    returns its elapsed seconds (so per-run setup stays out of the
+    timing); items is the work done per run (calls, samples, readings).
+
+    Args:
+        name: Case name; each grid point is recorded as name[key=value,...]
+        grid: dict param -> list of values (every combination is run)
+        max_seconds: Absolute gate on the best run time, independent of the baseline
+        min_rate: Absolute gate on items per second
+    """
+    def register(func):
+        BENCHMARKS.append({'name': name, 'func': func, 'grid': grid or {},
+                           'max_seconds': max_seconds, 'min_rate': min_rate})
+        return func
+    return register
+
+
+def time_grid(sampling_interval, days=SIMULATION_DAYS):
+    return np.arange(0, days * 24, sampling_interval / 60.0)
+
+
+def simulate(scenario, n_patients, sampling_interval=15, days=SIMULATION_DAYS, seed=0):
+    return make_simulator(scenario, sampling_interval, seed=seed).run(n_patients, days)
+
+
+# ==============================
+# MODEL / SENSOR HOT PATHS
+# ==============================
+@benchmark('wound_model.get_pH_get_temperature', {'sampling_interval': SAMPLING_INTERVALS})
+def bench_wound_model_scalar(sampling_interval):
+    """Per-timestep clean-model calls, as in the per-sample simulation loop."""
+    model = WoundModel('infection')
+    t = time_grid(sampling_interval).tolist()
+
+    def run():
+        start = time.perf_counter()
+        for ti in t:
+            model.get_pH(ti)
+            model.get_temperature(ti)
+        return time.perf_counter() - start
+    return run, len(t)
+
+
+@benchmark('wound_model.trajectory', {'sampling_interval': SAMPLING_INTERVALS})
+def bench_wound_model_trajectory(sampling_interval):
+    """Whole-grid clean curves with the trajectory cache cleared (cold)."""
+    model = WoundModel('infection')
+    t = time_grid(sampling_interval)
+
+    def run():
+        WoundModel._trajectory_cache.clear()
+        start = time.perf_counter()
+        model.trajectory(t)
+        return time.perf_counter() - start
+    return run, len(t)
+
+
+@benchmark('noise.sample', {'sampling_interval': SAMPLING_INTERVALS})
+def bench_noise_sample(sampling_interval):
+    n = len(time_grid(sampling_interval))
+    noise = NoiseGenerator(0.10, 0.01, sampling_interval, rng=0)
+
+    def run():
+        noise.reset()
+        start = time.perf_counter()
+        for _ in range(n):
+            noise.sample()
+        return time.perf_counter() - start
+    return run, n
+
+
+@benchmark('noise.sample_batch', {'n_patients': [1, 100, 1000]})
+def bench_noise_sample_batch(n_patients):
+    n_steps = len(time_grid(15))
+    noise = NoiseGenerator(0.10, 0.01, 15, rng=0)
+
+    def run():
+        start = time.perf_counter()
+        noise.sample_batch(n_steps, n_patients)
+        return time.perf_counter() - start
+    return run, n_steps * n_patients
+
+
+@benchmark('sensor_channel.read', {'sampling_interval': SAMPLING_INTERVALS})
+def bench_sensor_channel_read(sampling_interval):
+    channel = SensorChannel(WoundModel('infection'),
+                            NoiseGenerator(0.10, 0.01, sampling_interval, rng=0), 'temperature')
+    t = time_grid(sampling_interval).tolist()
+
+    def run():
+        start = time.perf_counter()
+        for ti in t:
+            channel.read(ti)
+        return time.perf_counter() - start
+    return run, len(t)
+
+
+@benchmark('batch_simulation.iter_chunks', {'n_patients': [100, 1000, 10000]}, max_seconds=10.0)
+def bench_batch_simulation(n_patients):
+    """10-day seeded cohort simulated in chunks (10k patients must stay under 10 s)."""
+    simulator = make_simulator('infection', seed=0)
+
+    def run():
+        start = time.perf_counter()
+        for chunk in simulator.iter_chunks(n_patients, SIMULATION_DAYS, chunk_size=2000):
+            pass
+        return time.perf_counter() - start
+    return run, n_patients * len(time_grid(15))
+
+
+@benchmark('sensor_array.run', {'n_channels': [2, 4], 'correlated': [False, True]})
+def bench_sensor_array(n_channels, correlated):
+    """1000 seeded patients x 10 days; cost per channel is array volume only."""
+    from sensor_array import SensorArray
+    channels = ('pH', 'temperature', 'moisture', 'strain')[:n_channels]
+    array = SensorArray.from_wound_model(WoundModel('infection'), channels, seed=0)
+    if correlated:
+        correlation = np.full((n_channels, n_channels), 0.3)
+        np.fill_diagonal(correlation, 1.0)
+        array.set_noise_correlation(correlation)
+
+    def run():
+        start = time.perf_counter()
+        array.run(1000, SIMULATION_DAYS)
+        return time.perf_counter() - start
+    return run, 1000 * len(time_grid(15)) * n_channels
+
+
+@benchmark('population.validate_cohort', {'batch_size': [250, 1000]})
+def bench_validate_cohort(batch_size):
+    """1000 heterogeneous seeded patients x 10 days: sample, simulate, score."""
+    from population import PopulationSampler, validate_cohort
+    sampler = PopulationSampler(seed=0)
+
+    def run():
+        start = time.perf_counter()
+        validate_cohort(sampler, 1000, simulation_days=SIMULATION_DAYS, seed=0,
+                        batch_size=batch_size)
+        return time.perf_counter() - start
+    return run, 1000
+
+
+# ==============================
+# ALERT HOT PATHS
+# ==============================
+@benchmark('alert_logic.update_get_status', {'sampling_interval': SAMPLING_INTERVALS})
+def bench_alert_logic_update(sampling_interval):
+    """Per-sample update plus get_status polling (the diagnostic status path)."""
+    data = simulate('infection', 1, sampling_interval)
+    samples = list(zip(data['pH'][0].tolist(), data['temp'][0].tolist(),
+                       data['time_hours'].tolist()))
+
+    def run():
+        engine = AlertLogic(sampling_interval_minutes=sampling_interval)
+        start = time.perf_counter()
+        for pH, temp, t in samples:
+            engine.update(pH, temp, t)
+            engine.get_status()
+        return time.perf_counter() - start
+    return run, len(samples)
+
+
+@benchmark('alert_logic.lock', {'sampling_interval': [1, 5, 15],
+                                'baseline_mode': ['exact', 'approximate']})
+def bench_alert_logic_lock(sampling_interval, baseline_mode):
+    """Latency of the single update() that locks the 24 h baseline."""
+    data = simulate('normal', 1, sampling_interval, days=2)
+    pH, temp, t = data['pH'][0], data['temp'][0], data['time_hours']
+    lock = int(np.searchsorted(t, 24.0))
+
+    def run():
+        engine = AlertLogic(sampling_interval_minutes=sampling_interval,
+                            baseline_mode=baseline_mode)
+        engine.update_many(pH[:lock], temp[:lock], t[:lock])
+        start = time.perf_counter()
+        engine.update(pH[lock], temp[lock], t[lock])
+        elapsed = time.perf_counter() - start
+        assert engine.baseline_locked
+        return elapsed
+    return run, 1
+
+
+@benchmark('trace_evaluator.evaluate_traces', max_seconds=5e-3)
+def bench_evaluate_trace():
+    """Vectorized scoring of one 10-day trace (must take under 5 ms)."""
+    data = simulate('infection', 1)
+
+    def run():
+        start = time.perf_counter()
+        evaluate_traces(data['pH'][0], data['temp'][0], data['time_hours'])
+        return time.perf_counter() - start
+    return run, 1
+
+
+@benchmark('trace_evaluator.evaluate_traces_batch', {'n_traces': [100, 1000]})
+def bench_evaluate_traces_batch(n_traces):
+    data = simulate('infection', n_traces)
+
+    def run():
+        start = time.perf_counter()
+        evaluate_traces(data['pH'], data['temp'], data['time_hours'])
+        return time.perf_counter() - start
+    return run, n_traces
+
+
+@benchmark('alert_service.process', {'n_patients': [100, 1000]}, min_rate=100_000)
+def bench_alert_service(n_patients):
+    """Gateway ingestion throughput in max_batch ticks (must exceed 100k readings/s)."""
+    data = simulate('infection', n_patients)
+    n_steps = data['pH'].shape[1]
+    device_ids = np.array([f'dev{p}' for p in range(n_patients)])
+
+    # Time-ordered arrival: every patient reports once per sampling step
+    rows = np.tile(np.arange(n_patients), n_steps)
+    steps = np.repeat(np.arange(n_steps), n_patients)
+    ticks = []
+    for lo in range(0, len(rows), 4096):
+        r, s = rows[lo:lo + 4096], steps[lo:lo + 4096]
+        ticks.append((device_ids[r].tolist(), data['pH'][r, s], data['temp'][r, s],
+                      data['time_hours'][s]))
+
+    def run():
+        broker = LocalBroker()
+        broker.subscribe('dressing/+/alert')
+        service = AlertService(broker, capacity=n_patients)
+        start = time.perf_counter()
+        for tick in ticks:
+            service.process(*tick)
+        return time.perf_counter() - start
+    return run, len(rows)
+
+
+# ==============================
+# END-TO-END RUNS
+# ==============================
+@benchmark('m1_3.run_single_test', {'sampling_interval': [5, 15, 30, 60],
+                                     'scenario': ['normal', 'infection']})
+def bench_run_single_test(sampling_interval, scenario):
+    from m1_3_robustness_analysis import run_single_test
+
+    def run():
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_single_test(scenario, sampling_interval, 1.0, 7.5, 1.0, 0.75, seed=0)
+        return time.perf_counter() - start
+    return run, len(time_grid(sampling_interval))
+
+
+@benchmark('m1_3.run_single_test_early_exit', {'sampling_interval': [5, 15, 30, 60],
+                                                'scenario': ['normal', 'infection']})
+def bench_run_single_test_early_exit(sampling_interval, scenario):
+    """Time-to-alert only: the run stops once the first alert is settled."""
+    from m1_3_robustness_analysis import run_single_test
+
+    def run():
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_single_test(scenario, sampling_interval, 1.0, 7.5, 1.0, 0.75, seed=0,
+                            metrics=['alert_time'])
+        return time.perf_counter() - start
+    return run, len(time_grid(sampling_interval))
+
+
+@benchmark('alert_probability.alert_time_distribution', {'sampling_interval': [5, 15, 60],
+                                                      'scenario': ['normal', 'infection']})
+def bench_alert_time_distribution(sampling_interval, scenario):
+    """Semi-analytic alert-time distribution for one configuration."""
+    from alert_probability import alert_time_distribution
+
+    def run():
+        start = time.perf_counter()
+        alert_time_distribution(scenario, sampling_interval)
+        return time.perf_counter() - start
+    return run, len(time_grid(sampling_interval))
+
+
+@benchmark('m1_3.sweep', {'n_replicates': [20, 200]})
+def bench_m1_3_sweep(n_replicates):
+    """All five T3.x suites (both scenarios) with n_replicates per point."""
+    import m1_3_robustness_analysis as m1_3
+    suites = list(m1_3.TEST_SUITES.values())
+
+    def run():
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for test_name, varied_param, values in suites:
+                m1_3.run_test_suite(test_name, varied_param, values, n_replicates)
+        return time.perf_counter() - start
+    return run, sum(len(values) for _, _, values in suites) * len(m1_3.SCENARIOS) * n_replicates
+
+
+# ==============================
+# RUNNER
+# ==============================
+def expand_cases(name_filter=None):
+    """(full name, case, params) for every registered grid point."""
+    for case in BENCHMARKS:
+        names = list(case['grid'])
+        for values in np.ndindex(*[len(case['grid'][n]) for n in names]):
+            params = {n: case['grid'][n][i] for n, i in zip(names, values)}
+            label = ','.join(f'{k}={v}' for k, v in params.items())
+            full_name = f"{case['name']}[{label}]" if label else case['name']
+            if name_filter is None or name_filter in full_name:
+                yield full_name, case, params
+
+
+def run_case(case, params, repeat=DEFAULT_REPEAT):
+    """
+    Time one grid point: one warm-up run, then at least `repeat` measured
+    runs with garbage collection
+    disabled, continuing (up to MAX_RUNS) until MIN_TIME_S has been measured so
+    the best-of time of sub-millisecond cases is stable.
+    Returns:
+        dict: {'params', 'items', 'runs', 'best_s', 'median_s', 'rate_per_s'}
+    """
+    run, items = case['func'](**params)
+    run()
+
+    # Like timeit, keep the cyclic collector out of the measurements
+    gc.collect()
+    gc.disable()
+    try:
+        times = [run() for _ in range(repeat)]
+        while sum(times) < MIN_TIME_S and len(times) < MAX_RUNS:
+            times.append(run())
+    finally:
+        gc.enable()
+    best = min(times)
+    return {
+        'params': params,
+        'items': items,
+        'runs': len(times),
+        'best_s': best,
+        'median_s': float(np.median(times)),
+        'rate_per_s': items / best if best > 0 else float('inf')
+    }
+
+
+def check_result(name, case, result, baseline=None, tolerance=DEFAULT_TOLERANCE):
+    """
+    Regression and absolute gates for one result.
+    Returns:
+        list of failure messages (empty = pass)
+    """
+    failures = []
+    if (baseline is not None and result['best_s'] > baseline['best_s'] * (1 + tolerance)
+            and result['best_s'] - baseline['best_s'] > MIN_REGRESSION_S):
+        failures.append(f"{name}: {result['best_s'] * 1e3:.3f} ms vs baseline "
+                        f"{baseline['best_s'] * 1e3:.3f} ms (> {tolerance:.0%} slower)")
+    if case['max_seconds'] is not None and result['best_s'] > case['max_seconds']:
+        failures.append(f"{name}: {result['best_s']:.3f} s exceeds limit {case['max_seconds']} s")
+    if case['min_rate'] is not None and result['rate_per_s'] < case['min_rate']:
+        failures.append(f"{name}: {result['rate_per_s']:,.0f}/s below floor {case['min_rate']:,}/s")
+    return failures
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'system': platform.system(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+
+
+def run_benchmarks(name_filter=None, repeat=DEFAULT_REPEAT, baseline_path=BASELINE_PATH,
+                   tolerance=DEFAULT_TOLERANCE, update_baseline=False, output_path=None):
+    """
+    Run the suite, print a table and apply the gates.
+    Returns:
+        int: Process exit code (1 if any gate failed)
+    """
+    baseline = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path) as f:
+            baseline = json.load(f)['results']
+
+    results = {}
+    failures = []
+    print(f"{'benchmark':<68} {'best':>11} {'rate/s':>13} {'vs base':>8}")
+    for name, case, params in expand_cases(name_filter):
+        result = run_case(case, params, repeat)
+        results[name] = result
+        reference = baseline.get(name)
+        ratio = f"{result['best_s'] / reference['best_s']:.2f}x" if reference else '-'
+        print(f"{name:<68} {result['best_s'] * 1e3:>9.3f}ms {result['rate_per_s']:>13,.0f} {ratio:>8}")
+        failures += check_result(name, case, result, None if update_baseline else reference,
+                                 tolerance)
+
+    report = {'environment': environment(), 'results': results}
+    if output_path:
+        with open(output_path, 'w') as f:
+            json.dump(report, f, indent=2)
+    if update_baseline:
+        # Keep entries for cases that were filtered out of this run
+        with open(baseline_path, 'w') as f:
+            json.dump({'environment': report['environment'],
+                       'results': {**baseline, **results}}, f, indent=2)
+        print(f"Baseline saved to: {baseline_path}")
+
+    if failures:
+        print("\nREGRESSIONS:")
+        for message in failures:
+            print(f"  {message}")
+        return 1
+    print("\nAll benchmark gates passed")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Phase 1 benchmark suite")
+    parser.add_argument('--filter', default=None, help="only run cases whose name contains this")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="measured runs per case")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown vs baseline (0.5 = 50%%)")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="write this run's timings to the baseline file")
+    parser.add_argument('--output', default=None, help="also write this run's results as JSON")
+    args = parser.parse_args()
+
+    sys.exit(run_benchmarks(args.filter, args.repeat, args.baseline, args.tolerance,
+                            args.update_baseline, args.output))
@@ -0,0 +1,413 @@
+"""
+Headless command-line entry point for Phase 1 simulations and sweeps.
+
+Scenarios, sensor noise specs and alert parameters come from the JSON
+files in configs/. matplotlib and pandas are only imported when a plot or
+DataFrame output is requested, so batch workers start without them.
+
+Examples (from the repository root):
+    python phase1-simulation/cli.py simulate infection --patients 1000
+    python phase1-simulation/cli.py sweep --suite T3.1 T3.4 --replicates 200 --csv out.csv
+    python phase1-simulation/cli.py full-factorial --seeds 4 --workers 8
+    python phase1-simulation/cli.py replay logs/ --workers 4
+    python phase1-simulation/cli.py boundary dt_threshold --low 0.5 --high 1.5 --deadline 168
+    python phase1-simulation/cli.py adaptive infection --patients 500 --sparse 120
+    python phase1-simulation/cli.py cohort --patients 10000 --infected 0.3
+    python phase1-simulation/cli.py screen --pH 7.3 7.5 7.7 --dt 0.8 1.0 1.2 --verify 1000
+"""
+import sys
+import os
+import csv
+import json
+import argparse
+import logging
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_path = os.path.join(current_dir, 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+import numpy as np
+
+from scenario_config import load_scenario, load_sensor_specs, build_simulator, build_alert_logic
+from trace_evaluator import evaluate_traces
+from monte_carlo import DetectionAccumulator
+from instrumentation import Profiler
+from plotting import pyplot
+
+
+# ==============================
+# COMMANDS
+# ==============================
+def cmd_simulate(args):
+    """Seeded cohort for one scenario config; prints the detection summary as JSON."""
+    config = load_scenario(args.config, simulation_days=args.days,
+                           sampling_interval_minutes=args.interval, seed=args.seed)
+    simulator = build_simulator(config, load_sensor_specs(args.sensor_specs))
+    alert_logic = build_alert_logic(config)
+
+    accumulator = DetectionAccumulator()
+    if args.trace or args.plot or args.show:
+        # Trace export and plotting need the whole cohort at once
+        chunks = [simulator.run(args.patients, config['simulation_days'])]
+    else:
+        chunks = simulator.iter_chunks(args.patients, config['simulation_days'], args.chunk_size)
+
+    for data in chunks:
+        result = evaluate_traces(data['pH'], data['temp'], data['time_hours'], alert_logic)
+        accumulator.add(result['first_alert_time'], result['peak_violation_rate'])
+
+    if args.trace:
+        from trace_io import TraceWriter
+        with TraceWriter(args.trace, n_traces=args.patients, scenario=config['scenario'],
+                         sampling_interval_minutes=config['sampling_interval_minutes'],
+                         seed=config['seed']) as writer:
+            writer.append(data['time_hours'], data['pH'], data['temp'])
+
+    if args.plot or args.show:
+        plot_trace(data, result, alert_logic, args.plot, args.show)
+
+    print(dump_json({'config': config, **accumulator.summary()}, indent=2))
+
+
+def cmd_sweep(args):
+    """T3.x one-at-a-time sweeps around the scenario config's parameters."""
+    import m1_3_robustness_analysis as m1_3
+    config = load_scenario(args.config, sampling_interval_minutes=args.interval)
+    alert = config['alert']
+    baseline_params = {
+        'sampling_interval': config['sampling_interval_minutes'],
+        'noise_multiplier': config['noise_multiplier'],
+        'pH_threshold': alert.get('pH_threshold', m1_3.BASELINE_PARAMS['pH_threshold']),
+        'dt_threshold': alert.get('temp_delta_threshold', m1_3.BASELINE_PARAMS['dt_threshold']),
+        'violation_threshold': alert.get('violation_threshold',
+                                         m1_3.BASELINE_PARAMS['violation_threshold'])
+    }
+    sensor_specs = load_sensor_specs(args.sensor_specs)
+
+    cache = None
+    if args.cache:
+        from result_cache import ResultCache
+        cache = ResultCache(args.cache, max_bytes=args.cache_mb << 20)
+
+    rows = []
+    for suite in args.suite:
+        test_name, varied_param, values = m1_3.TEST_SUITES[suite]
+        rows += m1_3.run_test_suite(test_name, varied_param, values, args.replicates,
+                                    seed=args.seed, baseline_params=baseline_params,
+                                    sensor_specs=sensor_specs, as_frame=False, cache=cache)
+    if cache is not None:
+        print(f"Result cache: {cache.stats()}")
+
+    if args.csv:
+        write_rows(rows, args.csv)
+        print(f"Results saved to: {args.csv}")
+    if args.plot or args.show:
+        m1_3.generate_sensitivity_plots(rows, show=args.show,
+                                        path=args.plot or 'm1_3_sensitivity_curves.png')
+
+
+def cmd_full_factorial(args):
+    import m1_3_robustness_analysis as m1_3
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    rows = m1_3.run_full_factorial(n_seeds=args.seeds, workers=args.workers,
+                                   chunk_size=args.chunk_size, results_path=args.results,
+                                   as_frame=False)
+    n_alerts = sum(row['alert_triggered'] for row in rows)
+    print(f"{len(rows)} tasks, {n_alerts} with an alert")
+
+
+def cmd_replay(args):
+    """Re-score recorded logs (CSV files or trace directories) with a scenario's alert config."""
+    from replay import find_logs, replay_logs
+    config = load_scenario(args.config)
+    alert_params = {'sampling_interval_minutes': config['sampling_interval_minutes'],
+                    **config['alert']}
+
+    paths = []
+    for path in args.paths:
+        is_log = path.endswith(('.csv', '.trace'))
+        paths += find_logs(path) if os.path.isdir(path) and not is_log else [path]
+
+    for summary in replay_logs(paths, alert_params, workers=args.workers):
+        print(dump_json({key: summary[key] for key in
+                         ('path', 'n_samples', 'baseline', 'first_alert_time')}))
+
+
+def cmd_boundary(args):
+    """Largest threshold meeting the detection target, by sequential bisection."""
+    from boundary_search import find_boundary
+    result = find_boundary(args.param, args.low, args.high, deadline_hours=args.deadline,
+                           detection_target=args.target, fp_limit=args.fp_limit,
+                           precision=args.precision, seed=args.seed,
+                           simulation_days=args.days, max_replicates=args.max_replicates,
+                           sensor_specs=load_sensor_specs(args.sensor_specs))
+    for value, outcome in result['probes']:
+        print(f"{args.param}={value:.4f}: detection {outcome['rate']:.3f} "
+              f"[{outcome['ci_low']:.3f}, {outcome['ci_high']:.3f}] "
+              f"n={outcome['n_replicates']} {'pass' if outcome['passed'] else 'fail'}")
+    summary = {key: result[key] for key in ('param', 'boundary', 'bracket', 'feasible',
+                                             'n_simulated', 'n_evaluated')}
+    if result['false_positive'] is not None:
+        summary['false_positive_rate'] = 1 - result['false_positive']['rate']
+    print(dump_json(summary, indent=2))
+
+
+def cmd_adaptive(args):
+    """Adaptive vs fixed-rate sampling: samples, energy and time-to-alert."""
+    from adaptive_sampling import AdaptiveSchedule, compare_schedules
+    config = load_scenario(args.config, simulation_days=args.days, seed=args.seed)
+    schedule = AdaptiveSchedule(args.dense, args.sparse, config['sampling_interval_minutes'],
+                                args.pH_margin, args.temp_margin)
+    result = compare_schedules(config['scenario'], schedule,
+                               fixed_interval=config['sampling_interval_minutes'],
+                               n_patients=args.patients, seed=config['seed'],
+                               simulation_days=config['simulation_days'],
+                               tick_minutes=args.tick, noise_mult=config['noise_multiplier'],
+                               alert_params={key: config['alert'][key] for key in
+                                             ('pH_threshold', 'temp_delta_threshold',
+                                              'persistence_hours', 'violation_threshold')
+                                             if key in config['alert']},
+                               sensor_specs=load_sensor_specs(args.sensor_specs))
+    print(dump_json(result, indent=2))
+
+
+def cmd_cohort(args):
+    """Detection and false-positive rates over a heterogeneous virtual cohort."""
+    from population import PopulationSampler, validate_cohort
+    config = load_scenario(args.config, simulation_days=args.days,
+                           sampling_interval_minutes=args.interval, seed=args.seed)
+    sampler = PopulationSampler(seed=config['seed'], infected=('bernoulli', args.infected))
+    alert_logic = build_alert_logic(config)
+    result = validate_cohort(sampler, args.patients, alert_logic,
+                             simulation_days=config['simulation_days'],
+                             sampling_interval=config['sampling_interval_minutes'],
+                             noise_mult=config['noise_multiplier'],
+                             sensor_specs=load_sensor_specs(args.sensor_specs),
+                             seed=config['seed'], batch_size=args.chunk_size)
+    print(dump_json({'config': config, **result}, indent=2))
+
+
+def cmd_screen(args):
+    """Analytic screen of a threshold grid; Monte Carlo only for passing configurations."""
+    from alert_probability import screen
+    from monte_carlo import run_monte_carlo
+    specs = load_sensor_specs(args.sensor_specs)
+    grid = {'sampling_interval': args.interval, 'noise_mult': args.noise, 'pH_thresh': args.pH,
+            'dt_thresh': args.dt, 'viol_thresh': args.viol}
+    rows = screen(grid, deadline_hours=args.deadline, simulation_days=args.days,
+                  sensor_specs=specs)
+    for row in rows:
+        row['passed'] = (row['detection_probability'] >= args.target
+                         and row['false_positive_probability'] <= args.fp_limit)
+        if args.verify and row['passed']:
+            params = {name: row[name] for name in grid}
+            infection = run_monte_carlo('infection', n_replicates=args.verify, seed=args.seed,
+                                        simulation_days=args.days, sensor_specs=specs, **params)
+            normal = run_monte_carlo('normal', n_replicates=args.verify, seed=args.seed,
+                                     simulation_days=args.days, sensor_specs=specs, **params)
+            row['mc_alert_rate'] = infection['alert_rate']
+            row['mc_alert_time_p50_hours'] = infection['alert_time_p50_hours']
+            row['mc_false_positive_rate'] = normal['alert_rate']
+
+    print(f"{sum(row['passed'] for row in rows)}/{len(rows)} configurations pass "
+          f"(detection >= {args.target} by {args.deadline:g} h, FP <= {args.fp_limit})")
+    if args.csv:
+        write_rows(rows, args.csv)
+        print(f"Rows written to: {args.csv}")
+    else:
+        for row in rows:
+            if row['passed']:
+                print(dump_json(row))
+
+
+# ==============================
+# OUTPUT HELPERS
+# ==============================
+def json_safe(value):
+    """Copy of nested dicts/lists with NaN and infinite floats replaced by None."""
+    if isinstance(value, dict):
+        return {key: json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(item) for item in value]
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+def dump_json(value, indent=None):
+    """Strict JSON (non-finite floats as null) for stdout consumers."""
+    return json.dumps(json_safe(value), indent=indent, allow_nan=False)
+
+
+def write_rows(rows, path):
+    """Write summary dicts as CSV without pandas."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def plot_trace(data, result, alert_logic, path=None, show=False):
+    """First patient's readings and alert state (same layout as main_m1_2)."""
+    plt = pyplot(show)
+    t = data['time_hours']
+    alerts = result['alert_states'][0]
+    fig, axes = plt.subplots(3, 1, figsize=(12, 10), sharex=True)
+
+    axes[0].plot(t, data['pH_clean'], 'b-', label='Clean (Ground Truth)', linewidth=2)
+    axes[0].plot(t, data['pH'][0], 'b-', alpha=0.3, label='Noisy + Drift')
+    axes[0].axhline(alert_logic.pH_threshold, color='r', linestyle='--', label='Alert Threshold')
+    axes[0].set_ylabel('pH')
+
+    axes[1].plot(t, data['temp_clean'], 'orange', label='Clean (Ground Truth)', linewidth=2)
+    axes[1].plot(t, data['temp'][0], 'orange', alpha=0.3, marker='.', markersize=2,
+                 linestyle='', label='Noisy + Drift')
+    if not np.isnan(result['baseline'][0]):
+        axes[1].axhline(result['baseline'][0] + alert_logic.temp_delta_threshold, color='r',
+                        linestyle='--', label='Alert Threshold')
+    axes[1].set_ylabel('Temperature (degrees celcius)')
+
+    axes[2].fill_between(t, 0, alerts, color='red', alpha=0.5, label='Alert Active')
+    axes[2].set_ylabel('Alert State')
+    axes[2].set_xlabel('Time (hours)')
+    axes[2].set_ylim([-0.1, 1.1])
+    for ax in axes:
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    if path:
+        plt.savefig(path, dpi=150)
+        print(f"Plot saved to: {path}")
+    if show:
+        plt.show()
+    plt.close(fig)
+
+
+# ==============================
+# ARGUMENTS
+# ==============================
+def build_parser():
+    parser = argparse.ArgumentParser(description="Phase 1 simulation CLI")
+    parser.add_argument('--profile', default=None,
+                        help="write per-stage timings of this run to a JSON file")
+    parser.add_argument('--sensor-specs', default=None,
+                        help="sensor noise spec JSON (default configs/sensor_specs.json)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    simulate = commands.add_parser('simulate', help="simulate a seeded cohort for one scenario")
+    simulate.add_argument('config', help="scenario name (normal, infection) or config path")
+    simulate.add_argument('--patients', type=int, default=1)
+    simulate.add_argument('--days', type=int, default=None, help="override simulation_days")
+    simulate.add_argument('--interval', type=int, default=None,
+                          help="override sampling_interval_minutes")
+    simulate.add_argument('--seed', type=int, default=None, help="override the config seed")
+    simulate.add_argument('--chunk-size', type=int, default=2000, help="patients per batch")
+    simulate.add_argument('--trace', default=None, help="write the cohort as a trace directory")
+    simulate.add_argument('--plot', default=None, help="save the first patient's plot (PNG)")
+    simulate.add_argument('--show', action='store_true', help="display the plot interactively")
+    simulate.set_defaults(func=cmd_simulate)
+
+    sweep = commands.add_parser('sweep', help="T3.x one-at-a-time sensitivity sweeps")
+    sweep.add_argument('--config', default='infection',
+                       help="scenario config supplying the baseline parameters")
+    sweep.add_argument('--suite', nargs='+', default=['T3.1', 'T3.2', 'T3.3', 'T3.4', 'T3.5'],
+                       choices=['T3.1', 'T3.2', 'T3.3', 'T3.4', 'T3.5'])
+    sweep.add_argument('--replicates', type=int, default=1000)
+    sweep.add_argument('--interval', type=int, default=None,
+                       help="override the baseline sampling interval")
+    sweep.add_argument('--seed', type=int, default=0)
+    sweep.add_argument('--cache', default=None,
+                       help="result cache directory (reuses summaries of unchanged runs)")
+    sweep.add_argument('--cache-mb', type=int, default=1024, help="result cache size cap (MB)")
+    sweep.add_argument('--csv', default=None, help="write summary rows to a CSV file")
+    sweep.add_argument('--plot', default=None, help="save sensitivity curves (PNG)")
+    sweep.add_argument('--show', action='store_true', help="display the plots interactively")
+    sweep.set_defaults(func=cmd_sweep)
+
+    factorial = commands.add_parser('full-factorial', help="full factorial grid on a process pool")
+    factorial.add_argument('--seeds', type=int, default=1, help="replicates per grid point")
+    factorial.add_argument('--workers', type=int, default=None)
+    factorial.add_argument('--chunk-size', type=int, default=16, help="tasks per worker batch")
+    factorial.add_argument('--results', required=True, help="resumable JSON-lines results file")
+    factorial.set_defaults(func=cmd_full_factorial)
+
+    replay = commands.add_parser('replay', help="re-score recorded logs")
+    replay.add_argument('paths', nargs='+', help="CSV logs, trace directories or folders of logs")
+    replay.add_argument('--config', default='infection', help="scenario config for alert params")
+    replay.add_argument('--workers', type=int, default=1)
+    replay.set_defaults(func=cmd_replay)
+
+    boundary = commands.add_parser('boundary', help="adaptive search for a threshold boundary")
+    boundary.add_argument('param', choices=['pH_threshold', 'dt_threshold', 'violation_threshold'])
+    boundary.add_argument('--low', type=float, required=True)
+    boundary.add_argument('--high', type=float, required=True)
+    boundary.add_argument('--deadline', type=float, default=168.0,
+                          help="detection deadline (hours after start)")
+    boundary.add_argument('--target', type=float, default=0.95, help="required detection rate")
+    boundary.add_argument('--fp-limit', type=float, default=0.01,
+                          help="maximum false-positive rate at the boundary")
+    boundary.add_argument('--precision', type=float, default=0.01)
+    boundary.add_argument('--days', type=int, default=10)
+    boundary.add_argument('--max-replicates', type=int, default=2000)
+    boundary.add_argument('--seed', type=int, default=0)
+    boundary.set_defaults(func=cmd_boundary)
+
+    adaptive = commands.add_parser('adaptive', help="adaptive vs fixed-rate sampling energy")
+    adaptive.add_argument('config', help="scenario name (normal, infection) or config path")
+    adaptive.add_argument('--patients', type=int, default=200)
+    adaptive.add_argument('--days', type=int, default=None, help="override simulation_days")
+    adaptive.add_argument('--seed', type=int, default=None, help="override the config seed")
+    adaptive.add_argument('--dense', type=int, default=15, help="interval near thresholds (min)")
+    adaptive.add_argument('--sparse', type=int, default=60, help="interval far from thresholds (min)")
+    adaptive.add_argument('--pH-margin', type=float, default=0.3)
+    adaptive.add_argument('--temp-margin', type=float, default=0.5)
+    adaptive.add_argument('--tick', type=int, default=5, help="simulation grid (min)")
+    adaptive.set_defaults(func=cmd_adaptive)
+
+    cohort = commands.add_parser('cohort', help="validate alerts on a heterogeneous cohort")
+    cohort.add_argument('--config', default='infection',
+                        help="scenario config supplying the sensor and alert parameters")
+    cohort.add_argument('--patients', type=int, default=1000)
+    cohort.add_argument('--infected', type=float, default=0.5, help="fraction of infected patients")
+    cohort.add_argument('--days', type=int, default=None, help="override simulation_days")
+    cohort.add_argument('--interval', type=int, default=None,
+                        help="override sampling_interval_minutes")
+    cohort.add_argument('--seed', type=int, default=None, help="override the config seed")
+    cohort.add_argument('--chunk-size', type=int, default=1000, help="patients per batch")
+    cohort.set_defaults(func=cmd_cohort)
+
+    screening = commands.add_parser('screen', help="analytic detection/false-positive screen")
+    screening.add_argument('--interval', type=int, nargs='+', default=[15])
+    screening.add_argument('--noise', type=float, nargs='+', default=[1.0])
+    screening.add_argument('--pH', type=float, nargs='+', default=[7.5])
+    screening.add_argument('--dt', type=float, nargs='+', default=[1.0])
+    screening.add_argument('--viol', type=float, nargs='+', default=[0.75])
+    screening.add_argument('--deadline', type=float, default=168.0,
+                           help="detection deadline (hours after start)")
+    screening.add_argument('--target', type=float, default=0.95, help="required detection rate")
+    screening.add_argument('--fp-limit', type=float, default=0.01,
+                           help="maximum false-positive probability")
+    screening.add_argument('--days', type=int, default=10)
+    screening.add_argument('--verify', type=int, default=0,
+                           help="Monte Carlo replicates for each passing configuration")
+    screening.add_argument('--seed', type=int, default=0)
+    screening.add_argument('--csv', default=None, help="write all rows to a CSV file")
+    screening.set_defaults(func=cmd_screen)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    profiler = Profiler().start() if args.profile else None
+    try:
+        args.func(args)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+            profiler.save(args.profile, command=sys.argv if argv is None else argv)
+            print(f"Profile saved to: {args.profile}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,19 +5,25 @@ NO ALGORITHMIC CHANGES PERMITTED.
 """
 import sys
 import os
+import argparse
+import logging
 current_dir = os.path.dirname(os.path.abspath(__file__))
 src_path = os.path.join(current_dir, 'src')
 if src_path not in sys.path:
     sys.path.insert(0, src_path)
 import numpy as np
-import matplotlib.pyplot as plt
-import pandas as pd
-from itertools import product
 
 from wound_model import WoundModel
-from noise import NoiseGenerator
-from sensor_channel import SensorChannel
+from noise import NoiseGenerator, stream_seed
+from sensor_channel import SensorChannel, CHANNEL_INDEX
 from alert_logic import AlertLogic
+from sweep_executor import SweepExecutor, expand_grid
+from trace_evaluator import evaluate_traces
+from monte_carlo import run_monte_carlo, run_monte_carlo_grid, make_simulator
+from instrumentation import Profiler, stage
+from plotting import pyplot
+from result_cache import ResultCache
+from results_sink import ResultsSink, GroupedAggregator, aggregate, to_csv
 
 # ====================================
 # TEST CONFIGURATIONS
@@ -28,8 +34,21 @@ pH_THRESHOLDS = [7.3, 7.5, 7.7]         # T3.3
 DT_THRESHOLDS = [0.8, 1.0, 1.2]         # T3.4
 VIOLATION_THRESHOLDS = [0.60, 0.75, 0.90]    # T3.5
 
+# (test name, varied parameter, values) for each T3.x suite
+TEST_SUITES = {
+    'T3.1': ("T3.1_Sampling", "sampling_interval", SAMPLING_INTERVALS),
+    'T3.2': ("T3.2_Noise", "noise_multiplier", NOISE_MULTIPLIERS),
+    'T3.3': ("T3.3_pH", "pH_threshold", pH_THRESHOLDS),
+    'T3.4': ("T3.4_DeltaT", "dt_threshold", DT_THRESHOLDS),
+    'T3.5': ("T3.5_Persistence", "violation_threshold", VIOLATION_THRESHOLDS),
+}
+
 SCENARIOS = ['normal', 'infection']
 SIMULATION_DAYS = 10    # Extended for late alerts
+MC_REPLICATES = 1000    # Seeded replicates per parameter point
+
+FULL_FACTORIAL_RESULTS = 'phase1-simulation/data/validation/m1_3_full_factorial.jsonl'
+SUITE_RESULTS = 'phase1-simulation/data/validation/m1_3_results'
 
 # =================================
 # BASELINE PARAMETERS
@@ -42,20 +61,37 @@ BASELINE_PARAMS = {
     'violation_threshold': 0.75
 }
 
+# Parameters that only affect alert evaluation, not the simulated traces
+ALERT_PARAMS = ('pH_threshold', 'dt_threshold', 'violation_threshold')
+
+# Metrics run_single_test can stop early for ('alert_time' covers alert_triggered)
+RUN_METRICS = ('alert_time', 'violation_rate_peak')
+
 # =============================
 # UTILITY FUNCTIONS
 # ============================
 
-def run_single_test(scenario, sampling_interval, noise_mult, pH_thresh, dt_thresh, viol_thresh):
+def run_single_test(scenario, sampling_interval, noise_mult, pH_thresh, dt_thresh, viol_thresh,
+                    seed=None, metrics=None):
     """
     Run one simulation with specified parameters.
+    seed: Root seed for the noise streams (None = non-reproducible)
+    metrics: None runs all SIMULATION_DAYS. A subset of RUN_METRICS stops as
+             soon as those are final: 'alert_time' once the first alert is
+             found or the window can no longer fill to the alert count in the
+             remaining samples, 'violation_rate_peak' once the peak can no
+             longer be exceeded.
     Returns:
         dict: {
-        'alert_triggered': bool,
+        'alert_triggered': bool (None if 'alert_time' not requested),
         'alert_time': float or None,
-        'violation_rate_peak': float
+        'violation_rate_peak': float (None if not requested),
+        'samples_skipped': samples left unevaluated by the early exit
     }
     """
+    if metrics is not None and not set(metrics) <= set(RUN_METRICS):
+        raise ValueError(f"Unknown metrics: {sorted(set(metrics) - set(RUN_METRICS))}")
+
     # Setup wound model
     wound = WoundModel(scenario=scenario)
 
@@ -63,13 +99,15 @@ def run_single_test(scenario, sampling_interval, noise_mult, pH_thresh, dt_thres
     pH_noise = NoiseGenerator(
         noise_sigma=0.05 * noise_mult,
         drift_sigma_per_hour=0.002,
-        sampling_interval_minutes=sampling_interval
+        sampling_interval_minutes=sampling_interval,
+        rng=None if seed is None else stream_seed(seed, 0, CHANNEL_INDEX['pH'])
     )
 
     temp_noise = NoiseGenerator(
         noise_sigma=0.10 * noise_mult,
         drift_sigma_per_hour=0.01,
-        sampling_interval_minutes=sampling_interval
+        sampling_interval_minutes=sampling_interval,
+        rng=None if seed is None else stream_seed(seed, 0, CHANNEL_INDEX['temperature'])
     )
 
     # Setup sensor channels
@@ -91,14 +129,26 @@ def run_single_test(scenario, sampling_interval, noise_mult, pH_thresh, dt_thres
 
     alert_triggered = False
     alert_time = None
-    peak_violation_rate = 0.0
-
-    for t in time_points:
-        # Read sensors
-        pH_reading = pH_channel.read(t)
-        temp_reading = temp_channel.read(t)
-
-        # Update alert logic
+    n_samples = len(time_points)
+    n_processed = n_samples
+
+    # Read sensors for the whole run in one block (cheaper than the alert
+    # loop even when the run stops early)
+    pH_readings = pH_channel.read_batch(time_points)[0]
+    temp_readings = temp_channel.read_batch(time_points)[0]
+
+    want_alert = metrics is None or 'alert_time' in metrics
+    want_peak = metrics is None or 'violation_rate_peak' in metrics
+    window_size = alert_engine.window_size
+    alert_count = alert_engine.alert_count()
+    # The window count rises by at most one per sample, so neither bound below
+    # can settle an outcome while more than window_size samples remain; a full
+    # window of violations (the largest peak) always raises an alert
+    tail = n_samples - window_size - 1 if metrics is not None else n_samples
+
+    for i, (t, pH_reading, temp_reading) in enumerate(zip(time_points, pH_readings,
+                                                           temp_readings)):
+        # Update alert logic (it tracks the peak violation rate itself)
         alert_active = alert_engine.update(pH_reading, temp_reading, t)
 
         # Track first alert
@@ -106,183 +156,324 @@ def run_single_test(scenario, sampling_interval, noise_mult, pH_thresh, dt_thres
             alert_triggered = True
             alert_time = t
 
-        # Track peak violation rate
-        status = alert_engine.get_status()
-        if status['violation_rate'] > peak_violation_rate:
-            peak_violation_rate = status['violation_rate']
+        if (alert_active and metrics is not None) or i >= tail:
+            reachable = alert_engine.violation_count + n_samples - i - 1
+            peak = alert_engine.peak_violation_count
+            alert_final = alert_triggered or reachable < alert_count
+            peak_final = peak == window_size or reachable <= peak
+            if (alert_final or not want_alert) and (peak_final or not want_peak):
+                n_processed = i + 1
+                break
 
     return {
-            'alert_triggered': alert_triggered,
-            'alert_time': alert_time,
-            'violation_rate_peak': peak_violation_rate
+            'alert_triggered': alert_triggered if want_alert else None,
+            'alert_time': alert_time if want_alert else None,
+            'violation_rate_peak': alert_engine.peak_violation_rate if want_peak else None,
+            'samples_skipped': n_samples - n_processed
         }
 
 
-def run_test_suite(test_name, varied_param, param_values):
+def run_test_suite(test_name, varied_param, param_values, n_replicates=MC_REPLICATES, seed=0,
+                   baseline_params=None, sensor_specs=None, as_frame=True, cache=None):
     """
-    Run Systematic test varying one parameter.
+    Run Systematic test varying one parameter, with n_replicates seeded
+    Monte Carlo runs per point aggregated online (no traces retained).
     Args:
         test_name: eg., "T3.1_Sampling_Interval"
         varied_param: e.g, "sampling_interval"
         param_values: list of values to test
+        n_replicates: Replicates per (scenario, value)
+        seed: Root seed; replicate i uses the same noise substream at every point
+        baseline_params: Values of the other parameters (default BASELINE_PARAMS)
+        sensor_specs: Noise spec per channel (default monte_carlo.SENSOR_SPECS)
+        as_frame: Return a DataFrame (imports pandas) instead of a list of dicts
+        cache: ResultCache reusing summaries of unchanged parameter points
     Returns:
-        pd.DataFrame with results
+        pd.DataFrame with one summary row per (scenario, value)
     """
+    baseline_params = BASELINE_PARAMS if baseline_params is None else baseline_params
     results = []
 
     for scenario in SCENARIOS:
+        # Alert-only sweeps: simulate once, evaluate every value on the same traces
+        if varied_param in ALERT_PARAMS:
+            grid = {name: [baseline_params[name]] for name in ALERT_PARAMS}
+            grid[varied_param] = list(param_values)
+            grid_summaries = run_monte_carlo_grid(
+                scenario=scenario,
+                sampling_interval=baseline_params['sampling_interval'],
+                noise_mult=baseline_params['noise_multiplier'],
+                pH_thresholds=grid['pH_threshold'],
+                dt_thresholds=grid['dt_threshold'],
+                viol_thresholds=grid['violation_threshold'],
+                n_replicates=n_replicates,
+                seed=seed,
+                simulation_days=SIMULATION_DAYS,
+                sensor_specs=sensor_specs,
+                cache=cache
+            )
+
         for value in param_values:
             # Build parameter dict
-            params = BASELINE_PARAMS.copy()
+            params = dict(baseline_params)
             params[varied_param] = value
 
-            # Run test
-            result = run_single_test(
-                scenario=scenario,
-                sampling_interval=params['sampling_interval'],
-                noise_mult=params['noise_multiplier'],
-                pH_thresh=params['pH_threshold'],
-                dt_thresh=params['dt_threshold'],
-                viol_thresh=params['violation_threshold']
-            )
+            # Run replicates
+            if varied_param in ALERT_PARAMS:
+                summary = grid_summaries[tuple(params[name] for name in ALERT_PARAMS)]
+            else:
+                summary = run_monte_carlo(
+                    scenario=scenario,
+                    sampling_interval=params['sampling_interval'],
+                    noise_mult=params['noise_multiplier'],
+                    pH_thresh=params['pH_threshold'],
+                    dt_thresh=params['dt_threshold'],
+                    viol_thresh=params['violation_threshold'],
+                    n_replicates=n_replicates,
+                    seed=seed,
+                    simulation_days=SIMULATION_DAYS,
+                    sensor_specs=sensor_specs,
+                    cache=cache
+                )
 
             # Record
             results.append({
                 'test': test_name,
                 'scenario': scenario,
-                varied_param : value,
-                'alert_triggered': result['alert_triggered'],
-                'alert_time_hours': result['alert_time'],
-                'alert_time_days': result['alert_time'] / 24 if result['alert_time'] else None,
-                'peak_violation_rate': result['violation_rate_peak']
+                **params,
+                **summary,
+                'alert_time_days': summary['alert_time_p50_hours'] / 24,
+                'peak_violation_rate': summary['peak_violation_rate_mean']
             })
 
             # Progress
-            print(f"{test_name} | {scenario} | {varied_param}={value} | Alert={result['alert_triggered']}")
+            print(f"{test_name} | {scenario} | {varied_param}={value} | "
+                  f"Alert rate={summary['alert_rate']:.3f}")
 
-    return pd.DataFrame(results)
+    if not as_frame:
+        return results
+    with stage('report.dataframe', len(results)):
+        import pandas as pd
+        return pd.DataFrame(results)
+
+
+def full_factorial_task(task):
+    """
+    Sweep worker: one seeded run of a full-factorial grid point.
+    Same traces and result as run_single_test(..., seed=task['seed']), but
+    simulated and scored in one vectorized pass with no console output.
+    """
+    simulator = make_simulator(task['scenario'], task['sampling_interval'],
+                               task['noise_multiplier'], seed=task['seed'])
+    data = simulator.run(n_patients=1, simulation_days=SIMULATION_DAYS)
+
+    alert_engine = AlertLogic(
+        pH_threshold=task['pH_threshold'],
+        temp_delta_threshold=task['dt_threshold'],
+        persistence_hours=12,
+        sampling_interval_minutes=task['sampling_interval'],
+        violation_threshold=task['violation_threshold']
+    )
+    result = evaluate_traces(data['pH'][0], data['temp'][0], data['time_hours'], alert_engine)
+
+    alert_triggered = bool(result['first_alert_index'] >= 0)
+    return {
+        'alert_triggered': alert_triggered,
+        'alert_time': float(result['first_alert_time']) if alert_triggered else None,
+        'violation_rate_peak': float(result['peak_violation_rate'])
+    }
+
+
+def run_full_factorial(n_seeds=1, workers=None, chunk_size=16, root_seed=0,
+                       results_path=FULL_FACTORIAL_RESULTS, as_frame=True):
+    """
+    Run the full factorial grid (all T3.x axes x scenarios x n_seeds) on a
+    process pool. Partial results are appended to results_path, so re-running
+    after an interruption only executes the missing tasks.
+    Returns:
+        pd.DataFrame with one row per task (list of dicts if not as_frame)
+    """
+    tasks = expand_grid({
+        'scenario': SCENARIOS,
+        'sampling_interval': SAMPLING_INTERVALS,
+        'noise_multiplier': NOISE_MULTIPLIERS,
+        'pH_threshold': pH_THRESHOLDS,
+        'dt_threshold': DT_THRESHOLDS,
+        'violation_threshold': VIOLATION_THRESHOLDS
+    }, n_seeds=n_seeds, root_seed=root_seed)
+
+    print(f"Full factorial sweep: {len(tasks)} tasks")
+    executor = SweepExecutor(full_factorial_task, workers=workers, chunk_size=chunk_size,
+                             results_path=results_path)
+    rows = executor.run(tasks)
+    print(f"Results saved to: {results_path}")
+
+    if not as_frame:
+        return rows
+    import pandas as pd
+    return pd.DataFrame(rows)
 
 
 # ==============================
 # MAIN TEST EXECUTION
 # =============================
-def main():
+def main(n_replicates=MC_REPLICATES, plot=True, show=False, cache=None,
+         results_dir=SUITE_RESULTS):
+    """
+    Run every T3.x suite, appending summary rows to a ResultsSink at
+    results_dir as each suite finishes, then build the CSV, summary table
+    and plots from the stored chunks.
+    """
     print("="*70)
     print("M1.3 ROBUSTNESS & SENSITIVITY ANALYSIS")
     print("="*70)
     print()
 
-    all_results = []
+    descriptions = {
+        'T3.1': "Sampling Interval Stress Test",
+        'T3.2': "Noise Robustness Test",
+        'T3.3': "pH Threshold Sensitivity",
+        'T3.4': "Temperature Delta Sensitivity",
+        'T3.5': "Persistence Strictness",
+    }
 
-    # ===== TEST 3.1: Sampling Interval =====
-    print("Running T3.1: Sampling Interval Stress Test...")
-    df_t31 = run_test_suite("T3.1_Sampling", "sampling_interval", SAMPLING_INTERVALS)
-    all_results.append(df_t31)
-    print()
+    with ResultsSink(results_dir) as sink:
+        for suite, (test_name, varied_param, values) in TEST_SUITES.items():
+            print(f"Running {suite}: {descriptions[suite]}...")
+            sink.extend(run_test_suite(test_name, varied_param, values, n_replicates,
+                                       as_frame=False, cache=cache))
+            sink.flush()  # completed suites survive a crash
+            print()
+        n_rows = sink.n_rows
 
-    # ===== TEST 3.2: Noise Stress =====
-    print("Running T3.2: Noise Robustness Test...")
-    df_t32 = run_test_suite("T3.2_Noise", "noise_multiplier", NOISE_MULTIPLIERS)
-    all_results.append(df_t32)
-    print()
+    # Save to CSV
+    output_path = 'phase1-simulation/data/validation/m1_3_results.csv'
+    with stage('report.csv', n_rows):
+        to_csv(results_dir, output_path)
+    print(f"Results saved to: {output_path}")
 
-    # ====== TEST 3.3: pH Threshold =====
-    print("Running T3.3: pH Threshold Sensitivity...")
-    df_t33 = run_test_suite("T3.3_pH", "pH_threshold", pH_THRESHOLDS)
-    all_results.append(df_t33)
-    print()
+    # Generate summary table
+    with stage('report.summary_table', n_rows):
+        generate_summary_table(results_dir)
 
-    # ==== TEST 3.4: ΔT Threshold ====
-    print("Running T3.4: Temperature Delta Sensitivity...")
-    df_t34 = run_test_suite("T3.4_DeltaT", "dt_threshold", DT_THRESHOLDS)
-    all_results.append(df_t34)
-    print()
+    # Generate sensitivity plots
+    if plot:
+        with stage('report.plots', n_rows):
+            generate_sensitivity_plots(results_dir, show=show)
 
-    # ==== TEST 3.5: Violation Threshold ====
-    print("Running T3.5: Persistence Strictness...")
-    df_t35 = run_test_suite("T3.5_Persistence", "violation_threshold", VIOLATION_THRESHOLDS)
-    all_results.append(df_t35)
-    print()
+SUMMARY_COLUMNS = ['n_replicates', 'alert_rate', 'alert_rate_ci_low', 'alert_rate_ci_high',
+                   'alert_time_p05_hours', 'alert_time_p50_hours', 'alert_time_p95_hours']
 
-    # Consolidate results
-    df_all = pd.concat(all_results, ignore_index=True)
+SUMMARY_RENAME = {
+    'alert_rate': 'alert/FP rate', 'alert_rate_ci_low': 'ci_low', 'alert_rate_ci_high': 'ci_high',
+    'alert_time_p05_hours': 't_p05_h', 'alert_time_p50_hours': 't_p50_h',
+    'alert_time_p95_hours': 't_p95_h'
+}
 
-    # Save to CSV
-    output_path = 'phase1-simulation/data/validation/m1_3_results.csv'
-    df_all.to_csv(output_path, index=False)
-    print(f"Results saved to: {output_path}")
+# (test, x column, y column) of each sensitivity curve
+PLOT_SERIES = [
+    ('T3.4_DeltaT', 'dt_threshold', 'alert_time_days'),
+    ('T3.3_pH', 'pH_threshold', 'alert_time_days'),
+    ('T3.1_Sampling', 'sampling_interval', 'alert_time_days'),
+    ('T3.2_Noise', 'noise_multiplier', 'peak_violation_rate'),
+]
 
-    # Generate summary report
-    generate_summary_report(df_all)
 
-    # Generate sensitivity plots
-    generate_sensitivity_plots(df_all)
+def generate_summary_table(results):
+    """
+    Print compact Monte Carlo summary: detection rate and time-to-alert
+    distribution for infection, false-positive rate (95% Wilson CI) for normal.
+
+    results: Results directory written by ResultsSink, or a list of result rows.
+    Everything is gathered in one grouped pass over the stored chunks (the
+    first row is shown if a parameter point was stored more than once).
+    """
+    params = list(BASELINE_PARAMS)
+    summary = aggregate(results, {
+        'points': GroupedAggregator(['test', 'scenario'] + params,
+                                    {column: (column, 'first') for column in SUMMARY_COLUMNS}),
+        'varied': GroupedAggregator(['test'], {name: (name, 'nunique') for name in params}),
+        'false_positives': GroupedAggregator(['test'], {'points': ('n_alerts', 'nonzero')},
+                                             where={'scenario': 'normal'})
+    })
 
-def generate_summary_report(df):
-    """Print formatted summary of all tests."""
     print("\n" + "="*70)
-    print("M1.3 SUMMARY REPORT")
+    print("M1.3 SUMMARY TABLE")
     print("="*70)
 
-    for test_name in df['test'].unique():
+    import pandas as pd
+    for (test_name,), counts in summary['varied'].items():
         print(f"\n### {test_name}")
-        test_data = df[df['test'] == test_name]
+        varied = [name for name in params if counts[name] > 1] or params
+
+        rows = [{'scenario': key[1], **dict(zip(params, key[2:])), **values}
+                for key, values in summary['points'].items() if key[0] == test_name]
+        rows.sort(key=lambda row: SCENARIOS.index(row['scenario'])
+                  if row['scenario'] in SCENARIOS else len(SCENARIOS))
+        table = pd.DataFrame(rows, columns=['scenario'] + varied + SUMMARY_COLUMNS)
+        print(table.rename(columns=SUMMARY_RENAME).to_string(
+            index=False, float_format=lambda v: f"{v:.3f}"))
+
+        fp = summary['false_positives'].get((test_name,), {'points': 0})['points']
+        if fp > 0:
+            print(f"FALSE POSITIVES DETECTED at {fp:.0f} parameter point(s)")
+        else:
+            print("Zero false positives across all parameter variations")
 
-        # Infection cases
-        infection_data = test_data[test_data['scenario'] == 'infection']
-        print("\n**Infection Scenario:**")
-        print(infection_data[['sampling_interval', 'noise_multiplier', 'pH_threshold',
-                              'dt_threshold', 'violation_threshold',
-                              'alert_triggered', 'alert_time_days']].to_string(index=False))
 
-        # Normal cases
-        normal_data = test_data[test_data['scenario'] == 'normal']
-        false_positives = normal_data[normal_data['alert_triggered'] == True]
+def sensitivity_series(results, scenario='infection'):
+    """
+    Curves plotted by generate_sensitivity_plots, from one grouped pass.
+    Returns:
+        dict: {test: (x values, mean y values)} for each PLOT_SERIES entry
+    """
+    series = aggregate(results, {
+        test: GroupedAggregator([x], {'y': (y, 'mean')}, where={'test': test, 'scenario': scenario})
+        for test, x, y in PLOT_SERIES
+    })
+    return {test: (np.array([key[0] for key in points]),
+                   np.array([values['y'] for values in points.values()]))
+            for test, points in series.items()}
 
-        print("\n**Normal Scenario:**")
-        if len(false_positives) > 0:
-            print(f"FALSE POSITIVES DETECTED: {len(false_possitives)}")
-            print(false_positives[['sampling_interval', 'noise_multiplier', 'pH_threshold',
-                                    'dt_threshold', 'violation_threshold']].to_string(index=False))
 
-        else:
-            print("Zero false positives across all parameter variations")
+def generate_sensitivity_plots(results, show=False,
+                               path='phase1-simulation/data/validation/m1_3_sensitivity_curves.png'):
+    """
+    Generate trade-off curves (saved to path; displayed only if show).
+    results: Results directory written by ResultsSink, or a list of result rows.
+    """
+    series = sensitivity_series(results)
+    t34_x, t34_y = series['T3.4_DeltaT']
+    t33_x, t33_y = series['T3.3_pH']
+    t31_x, t31_y = series['T3.1_Sampling']
+    t32_x, t32_y = series['T3.2_Noise']
 
-def generate_sensitivity_plots(df):
-    """Generate trade-off curves."""
+    plt = pyplot(show)
     fig, axes = plt.subplots(2, 2, figsize=(14, 10))
 
     # T3.4: ΔT Threshold vs Alert Time
-    t34_data = df[(df['test'] == 'T3.4_DeltaT') & (df['scenario'] == 'infection')]
-    axes[0,0].plot(t34_data['dt_threshold'], t34_data['alert_time_days'],
-                   'o-', linewidth=2, markersize=8)
+    axes[0,0].plot(t34_x, t34_y, 'o-', linewidth=2, markersize=8)
     axes[0, 0].set_xlabel('ΔT Threshold (degrees celcius)')
     axes[0, 0].set_ylabel('Alert Time (days)')
     axes[0, 0].set_title('T3.4: Temperature Sensitivity')
     axes[0, 0].grid(True, alpha=0.3)
 
     # T3.3: pH Threshold vs Alert Time
-    t33_data = df[(df['test'] == 'T3.3_pH') & (df['scenario'] == 'infection')]
-    axes[0, 1].plot(t33_data['pH_threshold'], t33_data['alert_time_days'],
-                    's-', linewidth=2, markersize=8, color='orange')
+    axes[0, 1].plot(t33_x, t33_y, 's-', linewidth=2, markersize=8, color='orange')
     axes[0, 1].set_xlabel('pH Threshold')
     axes[0, 1].set_ylabel('Alert Time (days)')
     axes[0, 1].set_title('T3.3: pH Sensitivity')
     axes[0, 1].grid(True, alpha=0.3)
 
     # T3.1: Sampling Interval vs Alert Time
-    t31_data = df[(df['test'] == 'T3.1_Sampling') & (df['scenario'] == 'infection')]
-    axes[1, 0].plot(t31_data['sampling_interval'], t31_data['alert_time_days'],
-                    '^-', linewidth=2, markersize=8, color='green')
+    axes[1, 0].plot(t31_x, t31_y, '^-', linewidth=2, markersize=8, color='green')
     axes[1, 0].set_xlabel('Sampling Interval (minutes)')
     axes[1, 0].set_ylabel('Alert Time (days)')
     axes[1, 0].set_title('T3.1: Sampling Rate Impact')
     axes[1, 0].grid(True, alpha=0.3)
 
     # T3.2 Noise Multiplier vs Violation Rate
-    t32_data = df[(df['test'] == 'T3.2_Noise') & (df['scenario'] == 'infection')]
-    axes[1,1].plot(t32_data['noise_multiplier'], t32_data['peak_violation_rate'] * 100,
-                   'd-', linewidth=2, markersize=8, color='red')
+    axes[1,1].plot(t32_x, t32_y * 100, 'd-', linewidth=2, markersize=8, color='red')
     axes[1, 1].axhline(75, color='black', linestyle='--', label='75% Threshold')
     axes[1, 1].set_xlabel('Noise Multiplier')
     axes[1, 1].set_ylabel('Peak Violation Rate (%)')
@@ -291,11 +482,48 @@ def generate_sensitivity_plots(df):
     axes[1, 1].grid(True, alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig('phase1-simulation/data/validation/m1_3_sensitivity_curves.png', dpi=300)
+    plt.savefig(path, dpi=300)
     print("Sensitivity plots saved")
-    plt.show()
+    if show:
+        plt.show()
+    plt.close(fig)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="M1.3 robustness & sensitivity analysis")
+    parser.add_argument('--full-factorial', action='store_true',
+                        help="run the full factorial grid on a process pool")
+    parser.add_argument('--seeds', type=int, default=1, help="replicates per grid point")
+    parser.add_argument('--replicates', type=int, default=MC_REPLICATES,
+                        help="Monte Carlo replicates per point for the T3.x suites")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--chunk-size', type=int, default=16, help="tasks per worker batch")
+    parser.add_argument('--results', default=FULL_FACTORIAL_RESULTS, help="resumable JSON-lines results file")
+    parser.add_argument('--suite-results', default=SUITE_RESULTS,
+                        help="results directory the T3.x summary rows are streamed to")
+    parser.add_argument('--no-plot', action='store_true', help="skip the sensitivity plots")
+    parser.add_argument('--show', action='store_true', help="display plots interactively")
+    parser.add_argument('--cache', default=None,
+                        help="result cache directory (reuses summaries of unchanged runs)")
+    parser.add_argument('--profile', default=None,
+                        help="write per-stage timings of this run to a JSON file")
+    args = parser.parse_args()
+
+    profiler = Profiler().start() if args.profile else None
+    if args.full_factorial:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+        run_full_factorial(n_seeds=args.seeds, workers=args.workers,
+                           chunk_size=args.chunk_size, results_path=args.results)
+    else:
+        cache = ResultCache(args.cache) if args.cache else None
+        main(n_replicates=args.replicates, plot=not args.no_plot, show=args.show, cache=cache,
+             results_dir=args.suite_results)
+        if cache is not None:
+            print(f"Result cache: {cache.stats()}")
+
+    if profiler is not None:
+        profiler.stop()
+        profiler.save(args.profile, command=sys.argv)
+        print(profiler.report())
+        print(f"Profile saved to: {args.profile}")
 
 
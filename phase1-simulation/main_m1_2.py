@@ -1,5 +1,7 @@
 import sys
 import os
+import logging
+import argparse
 current_dir = os.path.dirname(os.path.abspath(__file__))
 src_path = os.path.join(current_dir, 'src')
 
@@ -7,12 +9,19 @@ if src_path not in sys.path:
     sys.path.insert(0,src_path)
 
 import numpy as np
-import csv
-import matplotlib.pyplot as plt
 from wound_model import WoundModel
 from noise import NoiseGenerator
 from sensor_channel import SensorChannel
 from alert_logic import AlertLogic
+from trace_io import TraceWriter, trace_to_csv
+from plotting import pyplot
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+parser = argparse.ArgumentParser(description="M1.2 noise/drift validation run")
+parser.add_argument('--no-plot', action='store_true', help="skip the validation figure")
+parser.add_argument('--show', action='store_true', help="display the figure interactively")
+args = parser.parse_args()
 
 # ==================================
 # CONFIGURATION
@@ -68,88 +77,76 @@ print("=" * 60)
 hours = SIMULATION_DAYS * 24
 time_points = np.arange(0, hours, SAMPLING_INTERVAL_MIN / 60.0)
 
-pH_clean = []
-pH_noisy = []
-temp_clean = []
-temp_noisy = []
-alert_states = []
-
-csv_rows = []
+# Clean ground truth and noisy traces for the whole time axis at once
+pH_clean = ph_channel.clean(time_points)
+temp_clean = temp_channel.clean(time_points)
 
-for t in time_points:
-    # Clean values
-    pH_clean.append(wound.get_pH(t))
-    temp_clean.append(wound.get_temperature(t))
+pH_noisy = ph_channel.read_batch(time_points)[0]
+temp_noisy = temp_channel.read_batch(time_points)[0]
 
-    # Noisy sensor readings
-    pH_reading = ph_channel.read(t)
-    temp_reading = temp_channel.read(t)
-
-    pH_noisy.append(pH_reading)
-    temp_noisy.append(temp_reading)
+alert_states = []
 
+for t, pH_reading, temp_reading in zip(time_points, pH_noisy, temp_noisy):
     # Update alert logic
     alert = alert_engine.update(pH_reading, temp_reading, t)
     alert_states.append(alert)
 
-    # Record raw sensor-equivalent data for Phase 2 replay
-    csv_rows.append({
-        "time_hours": float(t),
-        "pH": float(pH_reading),
-        "temp": float(temp_reading)
-    })
-
 baseline = alert_engine.temp_baseline
 
 # =============================
-# CSV EXPORT (PHASE 2 HANDOFF)
+# TRACE + CSV EXPORT (PHASE 2 HANDOFF)
 # =============================
 os.makedirs("data/validation", exist_ok=True)
 
+# Raw sensor-equivalent data as a columnar float32 trace (what the firmware
+# sees), plus the CSV layout read by the Phase 2 test harness
+trace_dir = f"data/validation/m1_2_{SCENARIO}.trace"
 csv_filename = f"data/validation/m1_2_{SCENARIO}.csv"
 
-with open(csv_filename, "w", newline="") as f:
-    writer = csv.DictWriter(
-        f,
-        fieldnames=["time_hours", "pH", "temp"]
-    )
-    writer.writeheader()
-    writer.writerows(csv_rows)
+with TraceWriter(trace_dir, scenario=SCENARIO,
+                 sampling_interval_minutes=SAMPLING_INTERVAL_MIN) as writer:
+    writer.append(time_points, pH_noisy, temp_noisy)
+trace_to_csv(trace_dir, csv_filename)
 
+print(f"[EXPORT] Phase 1 trace written to: {trace_dir}")
 print(f"[EXPORT] Phase 1 data written to: {csv_filename}")
 
 # ==========================
 # VISUALIZATION
 # ==========================
-fig, axes = plt.subplots(3, 1, figsize=(12, 10))
-
-# pH plot
-axes[0].plot(time_points, pH_clean, 'b-', label='Clean (Ground Truth)', linewidth=2)
-axes[0].plot(time_points, pH_noisy, 'b-', alpha=0.3, label='Noisy + Drift', markersize=2)
-axes[0].axhline(7.5, color='r', linestyle='--', label='Alert Threshold')
-axes[0].set_ylabel('pH')
-axes[0].legend()
-axes[0].grid(True, alpha=0.3)
-
-# Temperature plot
-axes[1].plot(time_points, temp_clean, 'orange', label='Clean (Ground Truth)', linewidth=2)
-axes[1].plot(time_points, temp_noisy, 'orange', alpha=0.3, marker='.',markersize=2, linestyle='', label='Noisy + Drift')
-axes[1].axhline(baseline + 1.0, color='r', linestyle='--', label='Alert Threshold (ΔT=1.0°C)')
-axes[1].set_ylabel('Temperature (degrees celcius)')
-axes[1].legend()
-axes[1].grid(True, alpha=0.3)
-
-# Alert state
-axes[2].fill_between(time_points, 0, alert_states, color='red', alpha=0.5, label='Alert Active')
-axes[2].set_ylabel('Alert State')
-axes[2].set_xlabel('Time (hours)')
-axes[2].set_ylim([-0.1, 1.1])
-axes[2].legend()
-axes[2].grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('phase1-simulation/data/plots/m1_2_noise_drift_validation.png', dpi=300)
-plt.show()
+if not args.no_plot:
+    plt = pyplot(args.show)
+    fig, axes = plt.subplots(3, 1, figsize=(12, 10))
+
+    # pH plot
+    axes[0].plot(time_points, pH_clean, 'b-', label='Clean (Ground Truth)', linewidth=2)
+    axes[0].plot(time_points, pH_noisy, 'b-', alpha=0.3, label='Noisy + Drift', markersize=2)
+    axes[0].axhline(7.5, color='r', linestyle='--', label='Alert Threshold')
+    axes[0].set_ylabel('pH')
+    axes[0].legend()
+    axes[0].grid(True, alpha=0.3)
+
+    # Temperature plot
+    axes[1].plot(time_points, temp_clean, 'orange', label='Clean (Ground Truth)', linewidth=2)
+    axes[1].plot(time_points, temp_noisy, 'orange', alpha=0.3, marker='.',markersize=2, linestyle='', label='Noisy + Drift')
+    axes[1].axhline(baseline + 1.0, color='r', linestyle='--', label='Alert Threshold (ΔT=1.0°C)')
+    axes[1].set_ylabel('Temperature (degrees celcius)')
+    axes[1].legend()
+    axes[1].grid(True, alpha=0.3)
+
+    # Alert state
+    axes[2].fill_between(time_points, 0, alert_states, color='red', alpha=0.5, label='Alert Active')
+    axes[2].set_ylabel('Alert State')
+    axes[2].set_xlabel('Time (hours)')
+    axes[2].set_ylim([-0.1, 1.1])
+    axes[2].legend()
+    axes[2].grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig('phase1-simulation/data/plots/m1_2_noise_drift_validation.png', dpi=300)
+    if args.show:
+        plt.show()
+    plt.close(fig)
 
 print(f"\n{'='*60}")
 print(f"M1.2 VALIDATION SUMMARY")
@@ -0,0 +1,302 @@
+from collections import deque
+
+import numpy as np
+from streaming_stats import RunningMedian
+from alert_logic import AlertLogic
+from monte_carlo import DetectionAccumulator, make_simulator
+from trace_evaluator import evaluate_traces
+
+# Per-run energy model of one dressing node. Placeholder estimates for an
+# ESP32-class MCU until phase2-firmware/power-profiling has measurements:
+# wake + pH ADC + DS18B20 12-bit conversion, WiFi/MQTT publish of the
+# reading, and deep sleep between samples.
+ENERGY_MODEL = {
+    'sample_mJ': 130.0,
+    'uplink_mJ': 800.0,
+    'sleep_mW': 0.033
+}
+
+
+class TimeWindowAlert:
+    """
+    AlertLogic with the persistence window defined in time instead of samples.
+
+    Times are integer ticks of the simulation grid. Each post-lock reading
+    holds its violation state back to the previous reading, and the alert
+    rate is the violated fraction of the last persistence_hours. On a fixed
+    schedule this reproduces AlertLogic exactly (same baseline lock, same
+    count / window_size >= violation_threshold rule).
+    """
+    def __init__(self, pH_threshold=7.5, temp_delta_threshold=1.0, persistence_hours=12,
+                 violation_threshold=0.75, tick_minutes=5):
+        """
+        Args:
+            pH_threshold, temp_delta_threshold, persistence_hours, violation_threshold:
+                As for AlertLogic
+            tick_minutes: Time grid resolution; the window must be a whole number of ticks
+        """
+        window_ticks = persistence_hours * 60 / tick_minutes
+        if window_ticks != int(window_ticks) or window_ticks <= 0:
+            raise ValueError(f"persistence_hours={persistence_hours} is not a whole number "
+                             f"of {tick_minutes}-minute ticks")
+
+        self.pH_threshold = pH_threshold
+        self.temp_delta_threshold = temp_delta_threshold
+        self.persistence_hours = persistence_hours
+        self.violation_threshold = violation_threshold
+        self.tick_minutes = tick_minutes
+        self.window_ticks = int(window_ticks)
+        self.lock_tick = int(np.ceil(24 * 60 / tick_minutes))  # first tick with t >= 24h
+        self.reset()
+
+    def reset(self):
+        self.baseline_estimator = RunningMedian()
+        self.temp_baseline = None
+        self.baseline_locked = False
+        self.last_tick = None
+        self.window = deque()  # (tick, covered ticks, violated) per reading
+        self.covered_ticks = 0
+        self.violated_ticks = 0
+        self.peak_violated_ticks = 0
+        self.alert_active = False
+
+    def _window(self, tick):
+        """(violated, covered) ticks inside the window ending at tick."""
+        start = tick - self.window_ticks
+        while self.window and self.window[0][0] <= start:
+            _, covered, violated = self.window.popleft()
+            self.covered_ticks -= covered
+            self.violated_ticks -= covered * violated
+
+        if not self.window:
+            return 0, 0
+        # Only the oldest reading can reach back past the window start
+        oldest, covered, violated = self.window[0]
+        overhang = max(0, start - (oldest - covered))
+        return self.violated_ticks - overhang * violated, self.covered_ticks - overhang
+
+    def update(self, pH_reading, temp_reading, tick):
+        """
+        Process one reading taken at an integer tick.
+        Returns:
+            bool: True if alert is active
+        """
+        held = tick - self.last_tick if self.last_tick is not None else 1
+        self.last_tick = tick
+
+        if not self.baseline_locked:
+            self.baseline_estimator.add(temp_reading)
+            if tick < self.lock_tick:
+                return False  # still calibrating
+            self.temp_baseline = self.baseline_estimator.value()
+            self.baseline_estimator = None
+            self.baseline_locked = True
+
+        violation = int(pH_reading > self.pH_threshold
+                        and temp_reading - self.temp_baseline > self.temp_delta_threshold)
+        self.window.append((tick, held, violation))
+        self.covered_ticks += held
+        self.violated_ticks += held * violation
+
+        violated, covered = self._window(tick)
+        if violated > self.peak_violated_ticks:
+            self.peak_violated_ticks = violated
+
+        if covered < self.window_ticks:
+            return False  # Not enough data yet
+
+        self.alert_active = violated / self.window_ticks >= self.violation_threshold
+        return self.alert_active
+
+    @property
+    def peak_violation_rate(self):
+        return self.peak_violated_ticks / self.window_ticks
+
+
+class AdaptiveSchedule:
+    """
+    Sampling-interval policy: sparse while the readings are far from the
+    alert thresholds, dense near them or while the window holds violations.
+
+    A violation needs both pH > pH_threshold and temperature > baseline + dT,
+    so a reading is 'near' only if both gaps are inside their margins.
+    Calibration (first 24 h) runs at a fixed interval since the baseline
+    median needs regular samples.
+
+    With dense and calibration intervals equal to the fixed rate and a
+    sparse interval that is a multiple of it, every reading falls on the
+    fixed-rate grid, and the near-threshold stretches that decide an alert
+    are sampled exactly as at the fixed rate.
+    """
+    def __init__(self, dense_minutes=15, sparse_minutes=60, calibration_minutes=15,
+                 pH_margin=0.3, temp_margin=0.5):
+        """
+        Args:
+            dense_minutes: Interval near the thresholds
+            sparse_minutes: Interval far from the thresholds
+            calibration_minutes: Interval until the baseline locks
+            pH_margin: pH below threshold that still counts as near
+            temp_margin: Degrees below baseline + dT that still count as near
+        """
+        self.dense_minutes = dense_minutes
+        self.sparse_minutes = sparse_minutes
+        self.calibration_minutes = calibration_minutes
+        self.pH_margin = pH_margin
+        self.temp_margin = temp_margin
+
+    @classmethod
+    def fixed(cls, interval_minutes):
+        """Schedule that always samples at interval_minutes (the fixed-rate baseline)."""
+        return cls(interval_minutes, interval_minutes, interval_minutes)
+
+    def next_interval(self, engine, pH_reading, temp_reading):
+        """Minutes until the next reading, given the reading just processed."""
+        if not engine.baseline_locked:
+            return self.calibration_minutes
+        if engine.violated_ticks:
+            return self.dense_minutes
+
+        pH_gap = engine.pH_threshold - pH_reading
+        temp_gap = engine.temp_baseline + engine.temp_delta_threshold - temp_reading
+        near = pH_gap <= self.pH_margin and temp_gap <= self.temp_margin
+        return self.dense_minutes if near else self.sparse_minutes
+
+
+def run_schedule(pH, temp, t_hours, schedule, engine):
+    """
+    Sample one trace (recorded on engine's tick grid) as the schedule dictates.
+
+    Args:
+        pH, temp: 1-D readings at every tick
+        t_hours: Tick times (hours), for reporting the alert time
+        schedule: AdaptiveSchedule
+        engine: TimeWindowAlert (reset first)
+    Returns:
+        dict: {'sample_ticks', 'n_samples', 'first_alert_time' (hours, NaN if
+        none), 'peak_violation_rate', 'baseline'}
+    """
+    engine.reset()
+    pH = pH.tolist()
+    temp = temp.tolist()
+    n_ticks = len(pH)
+    tick_minutes = engine.tick_minutes
+
+    ticks = []
+    first_alert_time = np.nan
+    tick = 0
+    while tick < n_ticks:
+        ticks.append(tick)
+        if engine.update(pH[tick], temp[tick], tick) and np.isnan(first_alert_time):
+            first_alert_time = float(t_hours[tick])
+
+        minutes = schedule.next_interval(engine, pH[tick], temp[tick])
+        step = minutes / tick_minutes
+        if step != int(step) or step < 1:
+            raise ValueError(f"Interval of {minutes} min is not a multiple of the "
+                             f"{tick_minutes}-minute tick")
+        tick += int(step)
+
+    return {
+        'sample_ticks': np.array(ticks),
+        'n_samples': len(ticks),
+        'first_alert_time': first_alert_time,
+        'peak_violation_rate': engine.peak_violation_rate,
+        'baseline': engine.temp_baseline
+    }
+
+
+def run_energy(n_samples, hours, energy_model=None):
+    """
+    Estimated energy of a run (J): per-sample wake/read/uplink plus deep sleep.
+    """
+    model = ENERGY_MODEL if energy_model is None else energy_model
+    per_sample_mJ = model['sample_mJ'] + model['uplink_mJ']
+    return (np.asarray(n_samples) * per_sample_mJ + model['sleep_mW'] * hours * 3600) / 1000
+
+
+def compare_schedules(scenario, schedule=None, fixed_interval=15, n_patients=200, seed=0,
+                      simulation_days=10, tick_minutes=5, noise_mult=1.0, alert_params=None,
+                      energy_model=None, sensor_specs=None, chunk_size=500):
+    """
+    Adaptive vs fixed-rate sampling on the same seeded patients.
+
+    Every patient is simulated once on a tick_minutes grid; the fixed-rate
+    run reads every fixed_interval and is scored with evaluate_traces, the
+    adaptive run reads the ticks its schedule picks. Both see the same
+    noise and drift, so differences come from the schedule alone.
+
+    Args:
+        scenario: 'normal' or 'infection'
+        schedule: AdaptiveSchedule (default AdaptiveSchedule())
+        fixed_interval: Fixed-rate baseline interval (minutes, multiple of tick_minutes)
+        alert_params: pH_threshold, temp_delta_threshold, persistence_hours,
+                      violation_threshold overrides
+        energy_model: Overrides ENERGY_MODEL
+    Returns:
+        dict: {
+        'fixed', 'adaptive': DetectionAccumulator.summary() plus
+            'samples_per_run', 'energy_per_run_J', 'mean_power_mW',
+        'sample_ratio', 'energy_ratio': adaptive / fixed,
+        'alert_delay_hours': {'mean', 'max'} of adaptive - fixed first alert
+            time over patients where both alert (NaN if none),
+        'missed_alerts': patients alerted at the fixed rate only,
+        'extra_alerts': patients alerted adaptively only
+    }
+    """
+    schedule = AdaptiveSchedule() if schedule is None else schedule
+    alert_params = {'pH_threshold': 7.5, 'temp_delta_threshold': 1.0, 'persistence_hours': 12,
+                    'violation_threshold': 0.75, **(alert_params or {})}
+    stride = fixed_interval / tick_minutes
+    if stride != int(stride):
+        raise ValueError(f"fixed_interval={fixed_interval} is not a multiple of "
+                         f"tick_minutes={tick_minutes}")
+    stride = int(stride)
+
+    simulator = make_simulator(scenario, tick_minutes, noise_mult, seed, sensor_specs)
+    engine = TimeWindowAlert(tick_minutes=tick_minutes, **alert_params)
+    fixed_logic = AlertLogic(sampling_interval_minutes=fixed_interval, **alert_params)
+
+    accumulators = {'fixed': DetectionAccumulator(), 'adaptive': DetectionAccumulator()}
+    samples = {'fixed': [], 'adaptive': []}
+    alert_times = {'fixed': [], 'adaptive': []}
+
+    for batch in simulator.iter_chunks(n_patients, simulation_days, chunk_size):
+        fixed = evaluate_traces(batch['pH'][:, ::stride], batch['temp'][:, ::stride],
+                                batch['time_hours'][::stride], fixed_logic)
+        accumulators['fixed'].add(fixed['first_alert_time'], fixed['peak_violation_rate'])
+        samples['fixed'] += [len(batch['time_hours'][::stride])] * len(batch['pH'])
+        alert_times['fixed'].append(fixed['first_alert_time'])
+
+        runs = [run_schedule(pH, temp, batch['time_hours'], schedule, engine)
+                for pH, temp in zip(batch['pH'], batch['temp'])]
+        adaptive_times = np.array([run['first_alert_time'] for run in runs])
+        accumulators['adaptive'].add(adaptive_times,
+                                     [run['peak_violation_rate'] for run in runs])
+        samples['adaptive'] += [run['n_samples'] for run in runs]
+        alert_times['adaptive'].append(adaptive_times)
+
+    hours = simulation_days * 24
+    result = {}
+    for name, accumulator in accumulators.items():
+        energy = run_energy(samples[name], hours, energy_model)
+        result[name] = {
+            **accumulator.summary(),
+            'samples_per_run': float(np.mean(samples[name])),
+            'energy_per_run_J': float(np.mean(energy)),
+            'mean_power_mW': float(np.mean(energy)) / (hours * 3600) * 1000
+        }
+
+    fixed_times = np.concatenate(alert_times['fixed'])
+    adaptive_times = np.concatenate(alert_times['adaptive'])
+    both = ~np.isnan(fixed_times) & ~np.isnan(adaptive_times)
+    delay = adaptive_times[both] - fixed_times[both]
+
+    result['sample_ratio'] = result['adaptive']['samples_per_run'] / result['fixed']['samples_per_run']
+    result['energy_ratio'] = result['adaptive']['energy_per_run_J'] / result['fixed']['energy_per_run_J']
+    result['alert_delay_hours'] = {
+        'mean': float(delay.mean()) if len(delay) else float('nan'),
+        'max': float(delay.max()) if len(delay) else float('nan')
+    }
+    result['missed_alerts'] = int((~np.isnan(fixed_times) & np.isnan(adaptive_times)).sum())
+    result['extra_alerts'] = int((np.isnan(fixed_times) & ~np.isnan(adaptive_times)).sum())
+    return result
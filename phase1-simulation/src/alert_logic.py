@@ -1,5 +1,25 @@
+import logging
 import numpy as np
 from collections import deque
+from streaming_stats import RunningMedian, P2Quantile
+
+# Calibration median estimators: exact two-heap median or the O(1)-memory P^2 sketch
+BASELINE_ESTIMATORS = {
+    'exact': RunningMedian,
+    'approximate': lambda: P2Quantile(0.5)
+}
+
+logger = logging.getLogger(__name__)
+
+
+def min_alert_count(violation_threshold, window_size):
+    """Smallest window count with count / window_size >= violation_threshold."""
+    if not window_size:
+        return 1  # 0/0 never alerts
+    counts = np.arange(window_size + 1)
+    reaching = np.flatnonzero(counts / window_size >= violation_threshold)
+    return int(reaching[0]) if len(reaching) else window_size + 1
+
 
 class AlertLogic:
     """
@@ -11,7 +31,8 @@ class AlertLogic:
                  temp_delta_threshold=1.0,
                  persistence_hours=12,
                  sampling_interval_minutes=15,
-                 violation_threshold=0.75):  # NEW PARAMETER
+                 violation_threshold=0.75,  # NEW PARAMETER
+                 baseline_mode='exact'):
         """
         Args:
             pH_threshold: pH alert level
@@ -19,9 +40,16 @@ class AlertLogic:
             persistence_hours: How long conditions must persist
             sampling_interval_minutes: Sampling rate
             temp_baseline: Normal wound temperature
+            baseline_mode: 'exact' (running median, O(log n) per calibration
+                           sample) or 'approximate' (P^2 estimate, O(1) memory)
         """
+        if baseline_mode not in BASELINE_ESTIMATORS:
+            raise ValueError(f"Unknown baseline mode: {baseline_mode}")
+
         self.pH_threshold = pH_threshold
         self.temp_delta_threshold = temp_delta_threshold
+        self.persistence_hours = persistence_hours
+        self.sampling_interval_minutes = sampling_interval_minutes
 
         # Calculate window size
         samples_per_hour = 60 / sampling_interval_minutes
@@ -29,14 +57,20 @@ class AlertLogic:
 
         # Rolling window for violations (NEW)
         self.violation_window = deque(maxlen=self.window_size)
+        self.violation_count = 0  # running sum of violation_window
+        self.peak_violation_count = 0  # highest violation_count since reset
         self.violation_threshold = violation_threshold
 
         # Baseline tracking
         self.temp_baseline = None
-        self.baseline_samples = []
+        self.baseline_mode = baseline_mode
+        self.baseline_estimator = BASELINE_ESTIMATORS[baseline_mode]()
         self.baseline_window_hours = 24
         self.baseline_locked = False
 
+        # Calibration samples a snapshot can hold: 24h at the nominal rate plus the locking sample
+        self.calibration_capacity = int(self.baseline_window_hours * samples_per_hour) + 2
+
         # Alert state
         self.alert_active = False
 
@@ -51,12 +85,10 @@ class AlertLogic:
         """
         # Collect baseline during first 24 hours
         if not self.baseline_locked:
-            self.baseline_samples.append(temp_reading)
+            self.baseline_estimator.add(temp_reading)
 
             if t_hours >= self.baseline_window_hours:
-                self.temp_baseline = np.median(self.baseline_samples)
-                self.baseline_locked = True
-                print(f"Baseline locked: {self.temp_baseline:.2f} degrees celcius")
+                self._lock_baseline()
             else:
                 return False  # still calibrating
 
@@ -67,32 +99,220 @@ class AlertLogic:
 
         both_violated = pH_violated and temp_violated
 
-        # Add to rolling window
-        self.violation_window.append(1 if both_violated else 0)
+        # Add to rolling window, keeping the running count in step with eviction
+        if len(self.violation_window) == self.window_size:
+            self.violation_count -= self.violation_window[0]
+        violation = 1 if both_violated else 0
+        self.violation_window.append(violation)
+        self.violation_count += violation
+        if self.violation_count > self.peak_violation_count:
+            self.peak_violation_count = self.violation_count
 
         # Check if window is full
         if len(self.violation_window) < self.window_size:
             return False  # Not enough data yet
 
         # Calculate violation rate over window
-        violation_rate = sum(self.violation_window) / self.window_size
+        violation_rate = self.violation_count / self.window_size
 
         # Trigger alert if rate exceeds threshold
         self.alert_active = (violation_rate >= self.violation_threshold)
 
         return self.alert_active
 
+    def update_many(self, pH_array, temp_array, t_array):
+        """
+        Process a chunk of readings at once.
+        Same semantics as calling update() per sample (24h baseline lock,
+        warm-up until the window is full, >= rule against the threshold).
+
+        Args:
+            pH_array: pH readings, 1-D
+            temp_array: Temperature readings, 1-D
+            t_array: Sample times (hours), 1-D
+        Returns:
+            np.ndarray of bool: Alert state after each sample
+        """
+        pH_array = np.asarray(pH_array, dtype=float)
+        temp_array = np.asarray(temp_array, dtype=float)
+        t_array = np.asarray(t_array, dtype=float)
+
+        alerts = np.zeros(len(t_array), dtype=bool)
+        start = 0
+
+        # Calibration samples up to and including the one that locks the baseline
+        if not self.baseline_locked:
+            locking = np.flatnonzero(t_array >= self.baseline_window_hours)
+            start = locking[0] + 1 if len(locking) else len(t_array)
+            for temp_reading in temp_array[:start].tolist():
+                self.baseline_estimator.add(temp_reading)
+
+            if not len(locking):
+                return alerts  # still calibrating
+            self._lock_baseline()
+            start -= 1  # locking sample is also evaluated
+
+        # Threshold checks for the post-lock part of the chunk
+        pH_violated = pH_array[start:] > self.pH_threshold
+        temp_violated = (temp_array[start:] - self.temp_baseline) > self.temp_delta_threshold
+        violations = (pH_violated & temp_violated).astype(np.int64)
+
+        # Sliding-window counts over (previous window contents + new samples)
+        history = np.fromiter(self.violation_window, dtype=np.int64,
+                              count=len(self.violation_window))
+        sequence = np.concatenate((history, violations))
+        csum = np.concatenate(([0], np.cumsum(sequence)))
+
+        end = np.arange(len(history) + 1, len(sequence) + 1)  # window end (exclusive)
+        counts = csum[end] - csum[np.maximum(end - self.window_size, 0)]
+        full = end >= self.window_size
+
+        chunk_alerts = full & (counts / self.window_size >= self.violation_threshold)
+        alerts[start:] = chunk_alerts
+
+        # Carry state forward exactly as the per-sample path would
+        self.violation_window.extend(violations[-self.window_size:].tolist())
+        if len(counts):
+            self.violation_count = int(counts[-1])
+            self.peak_violation_count = max(self.peak_violation_count, int(counts.max()))
+        if full.any():
+            self.alert_active = bool(chunk_alerts[-1])
+
+        return alerts
+
+    @property
+    def peak_violation_rate(self):
+        """Highest get_status()['violation_rate'] since the last reset, tracked in update()."""
+        return self.peak_violation_count / self.window_size if self.window_size else 0.0
+
+    def alert_count(self):
+        """Smallest window violation count that triggers an alert (see min_alert_count)."""
+        return min_alert_count(self.violation_threshold, self.window_size)
+
+    def _lock_baseline(self):
+        # The estimator already holds the median: locking is O(1) and the
+        # calibration samples are released
+        self.temp_baseline = self.baseline_estimator.value()
+        self.baseline_estimator = None
+        self.baseline_locked = True
+        logger.info("Baseline locked: %.2f degrees celcius", self.temp_baseline)
+
+    def config(self):
+        """Constructor arguments reproducing this configuration."""
+        return {
+            'pH_threshold': self.pH_threshold,
+            'temp_delta_threshold': self.temp_delta_threshold,
+            'persistence_hours': self.persistence_hours,
+            'sampling_interval_minutes': self.sampling_interval_minutes,
+            'violation_threshold': self.violation_threshold,
+            'baseline_mode': self.baseline_mode
+        }
+
+    def snapshot_dtype(self):
+        """
+        Fixed binary record layout for this configuration.
+        The window is stored oldest-first; the calibration part holds the
+        exact-mode samples (24h at the nominal rate) or the P^2 markers.
+        """
+        fields = [
+            ('baseline_locked', '?'),
+            ('alert_active', '?'),
+            ('temp_baseline', '<f8'),
+            ('violation_count', '<i4'),
+            ('window_filled', '<i4'),
+            ('violation_window', 'u1', (self.window_size,))
+        ]
+        if self.baseline_mode == 'exact':
+            fields += [('calibration_count', '<i4'),
+                       ('calibration', '<f8', (self.calibration_capacity,))]
+        else:
+            fields += [('p2_count', '<i8'),
+                       ('p2_heights', '<f8', (5,)),
+                       ('p2_positions', '<i8', (5,)),
+                       ('p2_desired', '<f8', (5,))]
+        return np.dtype(fields)
+
+    def snapshot(self, out=None):
+        """
+        Serialize the alert state to a fixed-layout record (see snapshot_dtype).
+
+        Args:
+            out: Record to fill in place (e.g. one row of a memory-mapped
+                 checkpoint). None returns the record as bytes.
+        """
+        record = np.zeros((), dtype=self.snapshot_dtype()) if out is None else out
+
+        record['baseline_locked'] = self.baseline_locked
+        record['alert_active'] = self.alert_active
+        record['temp_baseline'] = np.nan if self.temp_baseline is None else self.temp_baseline
+        record['violation_count'] = self.violation_count
+        record['window_filled'] = len(self.violation_window)
+        window = np.zeros(self.window_size, dtype=np.uint8)
+        window[:len(self.violation_window)] = list(self.violation_window)
+        record['violation_window'] = window
+
+        estimator = self.baseline_estimator
+        if self.baseline_mode == 'exact':
+            samples = estimator.values() if estimator is not None else []
+            if len(samples) > self.calibration_capacity:
+                raise ValueError(f"{len(samples)} calibration samples exceed the snapshot "
+                                 f"capacity of {self.calibration_capacity}")
+            calibration = np.zeros(self.calibration_capacity)
+            calibration[:len(samples)] = samples
+            record['calibration_count'] = len(samples)
+            record['calibration'] = calibration
+        else:
+            count, heights, positions, desired = (estimator.state() if estimator is not None
+                                                  else (0, [], [1, 2, 3, 4, 5], [0.0] * 5))
+            record['p2_count'] = count
+            record['p2_heights'] = np.pad(heights, (0, 5 - len(heights)))
+            record['p2_positions'] = positions
+            record['p2_desired'] = desired
+
+        return record.tobytes() if out is None else None
+
+    def restore(self, record):
+        """
+        Load state written by snapshot() with the same configuration.
+
+        Args:
+            record: bytes from snapshot() or a record of snapshot_dtype()
+        """
+        if isinstance(record, (bytes, bytearray, memoryview)):
+            record = np.frombuffer(record, dtype=self.snapshot_dtype())[0]
+
+        self.baseline_locked = bool(record['baseline_locked'])
+        self.alert_active = bool(record['alert_active'])
+        self.temp_baseline = None if np.isnan(record['temp_baseline']) else float(record['temp_baseline'])
+        self.violation_count = int(record['violation_count'])
+        self.peak_violation_count = self.violation_count  # peak is not part of the record
+        self.violation_window.clear()
+        self.violation_window.extend(record['violation_window'][:record['window_filled']].tolist())
+
+        if self.baseline_locked:
+            self.baseline_estimator = None
+        elif self.baseline_mode == 'exact':
+            self.baseline_estimator = RunningMedian()
+            for value in record['calibration'][:record['calibration_count']].tolist():
+                self.baseline_estimator.add(value)
+        else:
+            self.baseline_estimator = P2Quantile.from_state(
+                0.5, record['p2_count'], record['p2_heights'].tolist(),
+                record['p2_positions'].tolist(), record['p2_desired'].tolist())
+
     def reset(self):
         """Reset alert state (for new simulation runs)"""
         self.violation_window.clear()
+        self.violation_count = 0
+        self.peak_violation_count = 0
         self.alert_active = False
         self.baseline_locked = False
-        self.baseline_samples = []
+        self.baseline_estimator = BASELINE_ESTIMATORS[self.baseline_mode]()
         self.temp_baseline = None
 
     def get_status(self):
         """Return diagnostic information."""
-        current_violations = sum(self.violation_window)
+        current_violations = self.violation_count
         required = int(self.window_size * self.violation_threshold)
 
         return {
@@ -100,6 +320,7 @@ class AlertLogic:
             'window_size': self.window_size,
             'violation_count': current_violations,
             'required_violations': required,
-            'violation_rate': current_violations / self.window_size if self.window_size else 0.0
+            'violation_rate': current_violations / self.window_size if self.window_size else 0.0,
+            'peak_violation_rate': self.peak_violation_rate
         }
 
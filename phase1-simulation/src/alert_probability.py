@@ -0,0 +1,253 @@
+import itertools
+
+import numpy as np
+from numpy.polynomial.hermite_e import hermegauss
+
+from wound_model import WoundModel
+from alert_logic import AlertLogic, min_alert_count
+from monte_carlo import SENSOR_SPECS
+
+
+def normal_cdf(x):
+    """
+    Standard normal CDF, vectorized with NumPy only (Abramowitz & Stegun
+    7.1.26 for erfc; absolute error below 1e-7).
+    """
+    x = np.asarray(x, dtype=float)
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741
+                + t * (-1.453152027 + t * 1.061405429))))
+    tail = 0.5 * poly * np.exp(-z * z)
+    return np.where(x >= 0, 1.0 - tail, tail)
+
+
+def drift_offset_sd(t_hours, drift_sigma_per_hour, calibration_hours=None):
+    """
+    Standard deviation of the random-walk drift at each time, relative to
+    its mean over the calibration samples (None: relative to zero).
+
+    For a random walk Cov(D(s), D(t)) = sigma^2 min(s, t), so the offset
+    D(t) - mean_i D(s_i) has variance
+    sigma^2 (t - 2 mean_i min(s_i, t) + mean_ij min(s_i, s_j)).
+    """
+    t_hours = np.asarray(t_hours, dtype=float)
+    if calibration_hours is None:
+        return drift_sigma_per_hour * np.sqrt(t_hours)
+
+    s = np.asarray(calibration_hours, dtype=float)
+    cross = np.minimum(s[None, :], t_hours[:, None]).mean(axis=1)
+    calibration = np.minimum(s[:, None], s[None, :]).mean()
+    variance = np.maximum(t_hours - 2 * cross + calibration, 0.0)
+    return drift_sigma_per_hour * np.sqrt(variance)
+
+
+def violation_probability(scenario, t_hours, pH_thresh=7.5, dt_thresh=1.0, noise_mult=1.0,
+                          sensor_specs=None, drift=True, nodes=7, lock_index=None):
+    """
+    Per-sample probability that both thresholds are violated, conditioned on
+    the drift of each channel.
+
+    Noise is independent per sample, so given the drift the two threshold
+    checks are independent normal tail probabilities. Each channel's drift
+    (and, for temperature, the error of the median baseline) is represented
+    by one standard normal level per run scaled to the exact per-sample
+    standard deviation, and integrated over with Gauss-Hermite nodes.
+
+    Args:
+        scenario: WoundModel scenario
+        t_hours: Sample times (hours)
+        pH_thresh, dt_thresh, noise_mult, sensor_specs: As for run_monte_carlo
+        drift: False ignores drift and baseline error (noise only)
+        nodes: Quadrature nodes per channel
+        lock_index: Index of the baseline-locking sample (default: first t >= 24 h)
+    Returns:
+        (p, weights): p of shape (n_nodes, n_steps) and node weights summing to 1;
+        the marginal probability is weights @ p
+    """
+    specs = SENSOR_SPECS if sensor_specs is None else sensor_specs
+    t_hours = np.asarray(t_hours, dtype=float)
+    if lock_index is None:
+        lock_index = int(np.searchsorted(t_hours, 24.0))
+    calibration = t_hours[:lock_index + 1]
+
+    wound = WoundModel(scenario)
+    pH_clean, temp_clean = wound.trajectory(t_hours)
+    baseline = np.median(temp_clean[:lock_index + 1])
+
+    pH_sigma = specs['pH']['noise_sigma'] * noise_mult
+    temp_sigma = specs['temperature']['noise_sigma'] * noise_mult
+
+    if drift:
+        pH_offset = drift_offset_sd(t_hours, specs['pH']['drift_sigma_per_hour'])
+        # Median of n normal samples: variance ~ (pi / 2) sigma^2 / n
+        median_sd = temp_sigma * np.sqrt(np.pi / 2 / len(calibration))
+        temp_offset = np.sqrt(drift_offset_sd(t_hours, specs['temperature']['drift_sigma_per_hour'],
+                                              calibration) ** 2 + median_sd ** 2)
+        z, w = hermegauss(nodes)
+        w = w / w.sum()
+    else:
+        pH_offset = temp_offset = np.zeros_like(t_hours)
+        z, w = np.zeros(1), np.ones(1)
+
+    # (node, step) tail probabilities for each channel, combined over the node grid
+    pH_p = normal_cdf((pH_clean + z[:, None] * pH_offset - pH_thresh) / pH_sigma)
+    temp_p = normal_cdf((temp_clean - baseline + z[:, None] * temp_offset - dt_thresh) / temp_sigma)
+    p = (pH_p[:, None, :] * temp_p[None, :, :]).reshape(len(z) ** 2, len(t_hours))
+    return p, np.outer(w, w).ravel()
+
+
+def first_alert_pmf(p, window_size, alert_count, lock_index, negligible=1e-15, block=64):
+    """
+    First-passage probabilities of the windowed alert rule for independent
+    per-sample violations with probabilities p.
+
+    Markov chain on the window's violation count: each sample adds a
+    violation with probability p[k]. Once the window is full, the sample
+    leaving it is a violation with its probability given the current count,
+    approximated by linear regression on the window's Poisson-binomial count
+    (p_j + p_j (1 - p_j) (count - mean) / variance, clipped to [0, 1]). The
+    alert fires the first time a full window holds at least alert_count
+    violations.
+
+    Args:
+        p: Violation probabilities, shape (n_chains, n_steps)
+        window_size: Samples per window
+        alert_count: Violations that trigger an alert (see min_alert_count)
+        lock_index: First sample that enters the window
+        negligible: Leading samples with every p below this count as no violation
+        block: Steps whose transition factors are computed together
+    Returns:
+        Array (n_chains, n_steps): probability that the first alert is at each sample
+    """
+    p = np.atleast_2d(p)
+    n_chains, n_steps = p.shape
+    pmf = np.zeros((n_chains, n_steps))
+    active = np.flatnonzero((p[:, lock_index:] >= negligible).any(axis=0))
+    if alert_count > window_size or not len(active):
+        return pmf
+
+    # Window mean and variance of the count before each sample enters
+    var = p * (1 - p)
+    csum = np.concatenate((np.zeros((n_chains, 1)), np.cumsum(p, axis=1)), axis=1)
+    vsum = np.concatenate((np.zeros((n_chains, 1)), np.cumsum(var, axis=1)), axis=1)
+    counts = np.arange(window_size + 2)
+
+    state = np.zeros((n_chains, window_size + 2))  # column s: count s (last column unused)
+    state[:, 0] = 1.0
+
+    # Before the first non-negligible sample the count stays at zero. Transition
+    # factors are computed for a block of steps at once; the loop only applies them.
+    first = lock_index + active[0]
+    for block_start in range(first, n_steps, block):
+        ks = np.arange(block_start, min(block_start + block, n_steps))
+        sliding = ks - lock_index >= window_size
+        j = np.where(sliding, ks - window_size, 0)  # sample leaving the window
+
+        mean = (csum[:, ks] - csum[:, j]).T
+        variance = (vsum[:, ks] - vsum[:, j]).T
+        slope = np.divide(var[:, j].T, variance, out=np.zeros_like(variance), where=variance > 0)
+        leave = np.clip(p[:, j].T[..., None] + slope[..., None] * (counts - mean[..., None]),
+                        0.0, 1.0)
+        leave[~sliding] = 0.0
+        q = p[:, ks].T[..., None]
+        ups = q * (1 - leave)
+        downs = (1 - q) * leave
+
+        for i, k in enumerate(ks):
+            up = state * ups[i]
+            down = state * downs[i]
+            state -= up
+            state -= down
+            state[:, 1:] += up[:, :-1]
+            state[:, :-1] += down[:, 1:]
+
+            if k - lock_index + 1 >= window_size:
+                pmf[:, k] = state[:, alert_count:].sum(axis=1)
+                state[:, alert_count:] = 0.0
+        if state.sum() < negligible:
+            break  # every chain has alerted
+
+    return pmf
+
+
+def alert_time_distribution(scenario, sampling_interval=15, noise_mult=1.0, pH_thresh=7.5,
+                            dt_thresh=1.0, viol_thresh=0.75, simulation_days=10,
+                            persistence_hours=12, sensor_specs=None, drift=True, nodes=7):
+    """
+    Semi-analytic distribution of the first alert time for one configuration
+    (same parameters as run_monte_carlo). For the 'normal' scenario,
+    alert_probability is the false-positive probability.
+
+    Returns:
+        dict: {
+        'time_hours': sample times,
+        'pmf': probability that the first alert is at each sample,
+        'cdf': probability of an alert at or before each sample,
+        'p_violation': marginal per-sample violation probability,
+        'alert_probability': probability of an alert within the horizon,
+        'alert_time_mean_hours', 'alert_time_p50_hours': given an alert (NaN if
+            alerts are impossible)
+    }
+    """
+    t_hours = np.arange(0, simulation_days * 24, sampling_interval / 60.0)
+    lock_index = int(np.searchsorted(t_hours, 24.0))
+    logic = AlertLogic(persistence_hours=persistence_hours,
+                       sampling_interval_minutes=sampling_interval, violation_threshold=viol_thresh)
+
+    p, weights = violation_probability(scenario, t_hours, pH_thresh, dt_thresh, noise_mult,
+                                       sensor_specs, drift, nodes, lock_index)
+    pmf = weights @ first_alert_pmf(p, logic.window_size,
+                                    min_alert_count(viol_thresh, logic.window_size), lock_index)
+    cdf = np.cumsum(pmf)
+    total = cdf[-1] if len(cdf) else 0.0
+
+    if total > 0:
+        mean = float(pmf @ t_hours / total)
+        median = float(t_hours[np.searchsorted(cdf, total / 2)])
+    else:
+        mean = median = float('nan')
+
+    return {
+        'time_hours': t_hours,
+        'pmf': pmf,
+        'cdf': cdf,
+        'p_violation': weights @ p,
+        'alert_probability': float(total),
+        'alert_time_mean_hours': mean,
+        'alert_time_p50_hours': median
+    }
+
+
+def screen(grid, deadline_hours=168.0, simulation_days=10, sensor_specs=None, drift=True,
+           nodes=7):
+    """
+    Detection and false-positive probabilities for every configuration of a grid.
+
+    Args:
+        grid: {parameter: values} over sampling_interval, noise_mult, pH_thresh,
+              dt_thresh, viol_thresh (missing parameters keep run_monte_carlo's defaults)
+        deadline_hours: Detection counts if the first infection alert is at or before this
+    Returns:
+        list of dict: one row per configuration with the parameters,
+        'detection_probability', 'false_positive_probability' and the
+        infection 'alert_time_p50_hours'
+    """
+    names = list(grid)
+    rows = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(zip(names, values))
+        infection = alert_time_distribution('infection', simulation_days=simulation_days,
+                                            sensor_specs=sensor_specs, drift=drift, nodes=nodes,
+                                            **params)
+        normal = alert_time_distribution('normal', simulation_days=simulation_days,
+                                         sensor_specs=sensor_specs, drift=drift, nodes=nodes,
+                                         **params)
+        by_deadline = infection['time_hours'] <= deadline_hours
+        rows.append({
+            **params,
+            'detection_probability': float(infection['pmf'][by_deadline].sum()),
+            'false_positive_probability': normal['alert_probability'],
+            'alert_time_p50_hours': infection['alert_time_p50_hours']
+        })
+    return rows
@@ -0,0 +1,390 @@
+import asyncio
+import time
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from alert_logic import AlertLogic
+from streaming_stats import RunningStats
+
+
+class PatientAlertStates:
+    """
+    AlertLogic state for many patients as NumPy struct-of-arrays.
+    Readings are processed in batches with the same decisions as calling
+    AlertLogic.update per patient and sample.
+    """
+    def __init__(self, capacity=1024, **alert_params):
+        """
+        Args:
+            capacity: Initial number of patient rows (grows on demand)
+            alert_params: AlertLogic keyword arguments (thresholds, interval, ...)
+        """
+        params = AlertLogic(**alert_params)
+        if params.baseline_mode != 'exact':
+            raise ValueError("PatientAlertStates only supports baseline_mode='exact'")
+        self.params = params
+        self.pH_threshold = params.pH_threshold
+        self.temp_delta_threshold = params.temp_delta_threshold
+        self.violation_threshold = params.violation_threshold
+        self.window_size = params.window_size
+        self.baseline_window_hours = params.baseline_window_hours
+
+        # Calibration samples per patient: 24h at the nominal rate, plus the locking sample
+        self.calibration_capacity = params.calibration_capacity
+
+        self.capacity = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """(Re)allocate every per-patient array, preserving existing rows."""
+        fields = {
+            'window': ((capacity, self.window_size), np.uint8, 0),
+            'head': (capacity, np.int32, 0),
+            'filled': (capacity, np.int32, 0),
+            'count': (capacity, np.int32, 0),
+            'baseline': (capacity, np.float64, np.nan),
+            'locked': (capacity, bool, False),
+            'alert': (capacity, bool, False),
+            'calibration': ((capacity, self.calibration_capacity), np.float64, 0.0),
+            'calibration_count': (capacity, np.int32, 0)
+        }
+        for name, (shape, dtype, fill) in fields.items():
+            array = np.full(shape, fill, dtype=dtype)
+            if self.capacity:
+                array[:self.capacity] = getattr(self, name)
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def ensure_capacity(self, n_patients):
+        if n_patients > self.capacity:
+            self._allocate(max(n_patients, 2 * self.capacity))
+
+    def reset(self, rows):
+        """Clear state for the given patient rows (new dressing)."""
+        self.window[rows] = 0
+        self.head[rows] = 0
+        self.filled[rows] = 0
+        self.count[rows] = 0
+        self.baseline[rows] = np.nan
+        self.locked[rows] = False
+        self.alert[rows] = False
+        self.calibration[rows] = 0.0
+        self.calibration_count[rows] = 0
+
+    def update(self, rows, pH, temp, t_hours):
+        """
+        Process one batch of readings.
+
+        Args:
+            rows: Patient row per reading (repeats are processed in order)
+            pH, temp, t_hours: Reading values, same length as rows
+        Returns:
+            (alerts, changed): bool arrays per reading. alerts is the value
+            AlertLogic.update would return; changed marks readings that flipped
+            their patient's alert state (in arrival order, so an on->off pair
+            inside one batch yields two transitions).
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        pH = np.asarray(pH, dtype=float)
+        temp = np.asarray(temp, dtype=float)
+        t_hours = np.asarray(t_hours, dtype=float)
+        self.ensure_capacity(int(rows.max()) + 1 if len(rows) else 0)
+
+        # Occurrence rank of each reading within its patient; equal ranks are
+        # independent and can be applied together
+        order = np.argsort(rows, kind='stable')
+        sorted_rows = rows[order]
+        group_start = np.flatnonzero(np.r_[True, sorted_rows[1:] != sorted_rows[:-1]])
+        starts = np.repeat(group_start, np.diff(np.r_[group_start, len(rows)]))
+        rank = np.empty(len(rows), dtype=np.int64)
+        rank[order] = np.arange(len(rows)) - starts
+
+        alerts = np.zeros(len(rows), dtype=bool)
+        changed = np.zeros(len(rows), dtype=bool)
+        for r in range(int(rank.max()) + 1 if len(rows) else 0):
+            sel = np.flatnonzero(rank == r)
+            alerts[sel], changed[sel] = self._update_unique(rows[sel], pH[sel], temp[sel],
+                                                            t_hours[sel])
+        return alerts, changed
+
+    def _update_unique(self, rows, pH, temp, t_hours):
+        result = np.zeros(len(rows), dtype=bool)
+        previous = self.alert[rows]
+
+        # Collect baseline during first 24 hours
+        calibrating = ~self.locked[rows]
+        if calibrating.any():
+            cal_rows = rows[calibrating]
+            slots = self.calibration_count[cal_rows]
+            if slots.max() >= self.calibration_capacity:
+                self._grow_calibration(int(slots.max()) + 1)
+            self.calibration[cal_rows, slots] = temp[calibrating]
+            self.calibration_count[cal_rows] += 1
+
+            locking = calibrating & (t_hours >= self.baseline_window_hours)
+            for row in rows[locking]:
+                samples = self.calibration[row, :self.calibration_count[row]]
+                self.baseline[row] = np.median(samples)
+                self.locked[row] = True
+                self.calibration[row] = 0.0  # unused slots stay zero (see write_records)
+                self.calibration_count[row] = 0
+
+            active = ~calibrating | locking
+        else:
+            active = np.ones(len(rows), dtype=bool)
+
+        if not active.any():
+            return result, np.zeros(len(rows), dtype=bool)
+
+        a_rows = rows[active]
+
+        # Threshold checks
+        pH_violated = pH[active] > self.pH_threshold
+        temp_violated = (temp[active] - self.baseline[a_rows]) > self.temp_delta_threshold
+        violation = (pH_violated & temp_violated).astype(np.uint8)
+
+        # Ring-buffer append with running count
+        pos = self.head[a_rows]
+        evicted = np.where(self.filled[a_rows] == self.window_size, self.window[a_rows, pos], 0)
+        self.count[a_rows] += violation.astype(np.int32) - evicted
+        self.window[a_rows, pos] = violation
+        self.head[a_rows] = (pos + 1) % self.window_size
+        self.filled[a_rows] = np.minimum(self.filled[a_rows] + 1, self.window_size)
+
+        # Alert once the window is full
+        full = self.filled[a_rows] == self.window_size
+        full_rows = a_rows[full]
+        self.alert[full_rows] = (self.count[full_rows] / self.window_size
+                                 >= self.violation_threshold)
+
+        result[active] = full & self.alert[a_rows]
+        return result, self.alert[rows] != previous
+
+    def to_records(self, n_patients=None):
+        """
+        Export rows 0..n_patients-1 as AlertLogic.snapshot_dtype() records.
+
+        Returns:
+            Structured array; records[i] restores into an AlertLogic with
+            AlertLogic.restore() and vice versa (see from_records)
+        """
+        n = self.capacity if n_patients is None else n_patients
+        dtype = self.params.snapshot_dtype()
+        records = np.zeros(n, dtype=dtype)
+        self.write_records(records)
+        return records
+
+    def write_records(self, records):
+        """Fill a snapshot record array (e.g. a memory-mapped checkpoint) from rows 0..len-1."""
+        n = len(records)
+        if n > self.capacity:
+            raise ValueError(f"{n} records requested, only {self.capacity} patient rows")
+
+        filled = self.filled[:n]
+        if (self.calibration_count[:n] > self.params.calibration_capacity).any():
+            raise ValueError("Calibration samples exceed the snapshot capacity")
+
+        # Unroll each ring buffer oldest-first: row i is a window_size slice of
+        # the doubled buffer starting at its oldest slot
+        oldest = (self.head[:n] - filled) % max(self.window_size, 1)
+        doubled = np.concatenate((self.window[:n], self.window[:n]), axis=1)
+        window = sliding_window_view(doubled, self.window_size, axis=1)[np.arange(n), oldest]
+
+        records['baseline_locked'] = self.locked[:n]
+        records['alert_active'] = self.alert[:n]
+        records['temp_baseline'] = self.baseline[:n]
+        records['violation_count'] = self.count[:n]
+        records['window_filled'] = filled
+        records['violation_window'] = window  # slots past window_filled are zero
+        records['calibration_count'] = self.calibration_count[:n]
+        records['calibration'] = self.calibration[:n, :self.params.calibration_capacity]
+
+    def from_records(self, records):
+        """Load rows 0..len(records)-1 from snapshot records (see to_records)."""
+        n = len(records)
+        self.ensure_capacity(n)
+
+        filled = records['window_filled']
+        self.window[:n] = records['violation_window']
+        self.filled[:n] = filled
+        self.head[:n] = filled % max(self.window_size, 1)
+        self.count[:n] = records['violation_count']
+        self.baseline[:n] = records['temp_baseline']
+        self.locked[:n] = records['baseline_locked']
+        self.alert[:n] = records['alert_active']
+        self.calibration_count[:n] = records['calibration_count']
+        self.calibration[:n, :self.params.calibration_capacity] = records['calibration']
+
+    def _grow_calibration(self, needed):
+        capacity = max(needed, 2 * self.calibration_capacity)
+        grown = np.zeros((self.capacity, capacity))
+        grown[:, :self.calibration_capacity] = self.calibration
+        self.calibration = grown
+        self.calibration_capacity = capacity
+
+
+class LocalBroker:
+    """
+    In-process stand-in for the MQTT broker used by the firmware comms layer.
+    Topic filters support the MQTT '+' (one level) and '#' (rest) wildcards.
+    Messages are (topic, payload, published_at) tuples.
+
+    Subscriber queues may be bounded: publish() never blocks and raises
+    asyncio.QueueFull if a matching queue is full (nothing is delivered),
+    while publish_async() waits for space, which is how producers get
+    backpressure from a slow consumer.
+    """
+    def __init__(self):
+        self._subscriptions = []
+
+    def subscribe(self, topic_filter, maxsize=0):
+        queue = asyncio.Queue(maxsize)
+        self._subscriptions.append((topic_filter.split('/'), queue))
+        return queue
+
+    def publish(self, topic, payload):
+        queues = self._matching(topic)
+        if any(queue.full() for queue in queues):
+            raise asyncio.QueueFull(topic)
+        message = (topic, payload, time.perf_counter())
+        for queue in queues:
+            queue.put_nowait(message)
+
+    async def publish_async(self, topic, payload):
+        message = (topic, payload, time.perf_counter())
+        for queue in self._matching(topic):
+            await queue.put(message)
+
+    def _matching(self, topic):
+        levels = topic.split('/')
+        return [queue for pattern, queue in self._subscriptions
+                if self._matches(pattern, levels)]
+
+    @staticmethod
+    def _matches(pattern, levels):
+        for i, part in enumerate(pattern):
+            if part == '#':
+                return True
+            if i >= len(levels) or (part != '+' and part != levels[i]):
+                return False
+        return len(pattern) == len(levels)
+
+
+class AlertService:
+    """
+    Gateway ingestion service: consumes dressing readings from the broker,
+    evaluates them in batched ticks and publishes alert transitions.
+
+    Topics:
+        dressing/<device_id>/readings  payload {'t_hours', 'pH', 'temp'}
+        dressing/<device_id>/alert     payload {'t_hours', 'alert_active'}
+    """
+    READINGS_TOPIC = 'dressing/+/readings'
+
+    def __init__(self, broker, capacity=1024, max_batch=4096, queue_size=16384,
+                 **alert_params):
+        """
+        Args:
+            broker: LocalBroker (or compatible publish/subscribe object)
+            capacity: Initial patient capacity
+            max_batch: Maximum readings per tick (bounds per-reading latency)
+            queue_size: Bound on queued readings; producers using
+                        publish_async() wait while it is full
+            alert_params: AlertLogic keyword arguments
+        """
+        self.broker = broker
+        self.queue = broker.subscribe(self.READINGS_TOPIC, maxsize=queue_size)
+        self.max_batch = max_batch
+        self.states = PatientAlertStates(capacity, **alert_params)
+        self.device_rows = {}
+        self.device_ids = []
+
+        self.readings_processed = 0
+        self.ticks = 0
+        self.alerts_dropped = 0
+        self.latency = RunningStats()
+        self.max_latency_s = 0.0
+
+    def row_for(self, device_id):
+        row = self.device_rows.get(device_id)
+        if row is None:
+            row = len(self.device_ids)
+            self.device_rows[device_id] = row
+            self.device_ids.append(device_id)
+            self.states.ensure_capacity(row + 1)
+        return row
+
+    def evaluate(self, device_ids, pH, temp, t_hours):
+        """
+        Evaluate a batch of readings.
+        Returns:
+            (decisions, alerts): Alert decision per reading (bool array) and
+            the (topic, payload) of every alert-state change, in arrival order
+        """
+        rows = np.fromiter((self.row_for(d) for d in device_ids), dtype=np.int64,
+                           count=len(device_ids))
+        decisions, changed = self.states.update(rows, pH, temp, t_hours)
+        alerts = [(f'dressing/{self.device_ids[rows[i]]}/alert', {
+            't_hours': float(t_hours[i]),
+            'alert_active': bool(decisions[i])
+        }) for i in np.flatnonzero(changed)]
+
+        self.readings_processed += len(rows)
+        self.ticks += 1
+        return decisions, alerts
+
+    def process(self, device_ids, pH, temp, t_hours):
+        """
+        Evaluate a batch of readings and publish alert-state changes without
+        waiting. Alerts a full subscriber queue cannot take are dropped and
+        counted in stats(); run() waits for space instead.
+        Returns:
+            np.ndarray of bool: Alert decision per reading
+        """
+        decisions, alerts = self.evaluate(device_ids, pH, temp, t_hours)
+        for topic, payload in alerts:
+            try:
+                self.broker.publish(topic, payload)
+            except asyncio.QueueFull:
+                self.alerts_dropped += 1
+        return decisions
+
+    async def run(self, stop_after=None):
+        """
+        Consume readings until cancelled (or until stop_after readings).
+        Each tick drains whatever is queued, up to max_batch readings, and
+        waits for bounded alert subscribers to take its transitions.
+        """
+        queue = self.queue
+        while stop_after is None or self.readings_processed < stop_after:
+            messages = [await queue.get()]
+            while len(messages) < self.max_batch and not queue.empty():
+                messages.append(queue.get_nowait())
+
+            device_ids = [topic.split('/')[1] for topic, _, _ in messages]
+            payloads = [payload for _, payload, _ in messages]
+            _, alerts = self.evaluate(
+                device_ids,
+                np.fromiter((p['pH'] for p in payloads), float, len(payloads)),
+                np.fromiter((p['temp'] for p in payloads), float, len(payloads)),
+                np.fromiter((p['t_hours'] for p in payloads), float, len(payloads)))
+            for topic, payload in alerts:
+                await self.broker.publish_async(topic, payload)
+
+            done = time.perf_counter()
+            latencies = done - np.fromiter((m[2] for m in messages), float, len(messages))
+            self.latency.add(latencies)
+            self.max_latency_s = max(self.max_latency_s, float(latencies.max()))
+
+            await asyncio.sleep(0)  # let producers run between ticks
+
+    def stats(self):
+        """Throughput/latency counters for monitoring."""
+        return {
+            'readings_processed': self.readings_processed,
+            'ticks': self.ticks,
+            'patients': len(self.device_ids),
+            'alerts_dropped': self.alerts_dropped,
+            'mean_latency_s': self.latency.mean,
+            'max_latency_s': self.max_latency_s
+        }
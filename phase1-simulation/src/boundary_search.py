@@ -0,0 +1,196 @@
+from alert_logic import AlertLogic
+from monte_carlo import make_simulator
+from trace_evaluator import evaluate_traces
+from streaming_stats import wilson_interval
+
+# Sweep parameter name -> AlertLogic keyword (alerts get rarer as each one grows)
+SEARCH_PARAMS = {
+    'pH_threshold': 'pH_threshold',
+    'dt_threshold': 'temp_delta_threshold',
+    'violation_threshold': 'violation_threshold'
+}
+
+# Two-sided z for the sequential Wilson test; the interval is re-checked after
+# every batch, so a wider-than-95% interval keeps the overall error rate down
+DEFAULT_Z = 2.576
+
+
+class TraceBank:
+    """
+    Seeded replicate traces for one scenario, simulated on demand in batches
+    and kept for reuse. Every probe of a search evaluates the same replicates
+    (common random numbers), so neighbouring thresholds are compared on
+    identical noise and each trace is simulated at most once per search.
+    """
+    def __init__(self, scenario, sampling_interval=15, noise_mult=1.0, seed=0,
+                 simulation_days=10, batch_size=100, sensor_specs=None):
+        self.simulator = make_simulator(scenario, sampling_interval, noise_mult, seed,
+                                        sensor_specs)
+        self.simulation_days = simulation_days
+        self.batch_size = batch_size
+        self.batches = []
+
+    @property
+    def n_simulated(self):
+        return sum(batch['pH'].shape[0] for batch in self.batches)
+
+    def batch(self, index):
+        """Replicates [index * batch_size, (index + 1) * batch_size)."""
+        while len(self.batches) <= index:
+            first = len(self.batches) * self.batch_size
+            self.batches.append(self.simulator.run(self.batch_size, self.simulation_days,
+                                                   first_patient=first))
+        return self.batches[index]
+
+
+def probe(bank, alert_logic, success, target, max_replicates=2000, z=DEFAULT_Z):
+    """
+    Sequential test of P(success) >= target over replicate batches.
+
+    After each batch the Wilson interval of the success rate is compared
+    with the target; replication stops as soon as the interval lies
+    entirely on one side.
+
+    Args:
+        bank: TraceBank supplying the replicates
+        alert_logic: AlertLogic with the parameters under test
+        success: Callable(evaluate_traces result) -> bool array per replicate
+        target: Required success probability
+        max_replicates: Replicates after which the point estimate decides
+        z: Normal quantile of the sequential interval
+    Returns:
+        dict: {'passed', 'decided' (False = stopped at max_replicates),
+        'n_replicates', 'successes', 'rate', 'ci_low', 'ci_high'}
+    """
+    successes = 0
+    n = 0
+    index = 0
+    while n < max_replicates:
+        data = bank.batch(index)
+        result = evaluate_traces(data['pH'], data['temp'], data['time_hours'], alert_logic)
+        outcome = success(result)[:max_replicates - n]
+        successes += int(outcome.sum())
+        n += len(outcome)
+        index += 1
+
+        low, high = wilson_interval(successes, n, z)
+        if low >= target or high < target:
+            break
+
+    low, high = wilson_interval(successes, n, z)
+    decided = low >= target or high < target
+    return {
+        'passed': bool(low >= target) if decided else successes / n >= target,
+        'decided': decided,
+        'n_replicates': n,
+        'successes': successes,
+        'rate': successes / n,
+        'ci_low': low,
+        'ci_high': high
+    }
+
+
+def find_boundary(param='dt_threshold', low=0.5, high=1.5, deadline_hours=168.0,
+                  detection_target=0.95, fp_limit=0.01, precision=0.01,
+                  baseline_params=None, seed=0, simulation_days=10, batch_size=100,
+                  max_replicates=2000, z=DEFAULT_Z, sensor_specs=None):
+    """
+    Largest alert threshold that still detects infection by a deadline with
+    probability >= detection_target, found by bisection with sequential
+    replicate tests, plus a false-positive check at that threshold.
+
+    Raising pH_threshold, dt_threshold or violation_threshold only makes
+    alerts rarer, so detection is monotone in the parameter and the
+    false-positive rate is lowest at the largest detecting value.
+
+    Args:
+        param: 'pH_threshold', 'dt_threshold' or 'violation_threshold'
+        low, high: Search bracket
+        deadline_hours: Infection counts as detected if the first alert is at or before this
+        detection_target: Required detection probability (infection scenario)
+        fp_limit: Maximum false-positive probability (normal scenario)
+        precision: Stop when the bracket is narrower than this
+        baseline_params: Values of the other parameters (m1_3 BASELINE_PARAMS layout)
+        seed, simulation_days, batch_size, max_replicates, z: Replication settings
+    Returns:
+        dict: {
+        'param', 'boundary' (None if even `low` misses the target),
+        'bracket': (last passing, first failing) value, None outside [low, high],
+        'feasible': boundary also meets the false-positive limit,
+        'detection', 'false_positive': probe() results at the boundary,
+        'probes': [(value, probe result), ...] in search order,
+        'n_simulated': traces simulated per scenario,
+        'n_evaluated': trace evaluations over all probes
+    }
+    """
+    if param not in SEARCH_PARAMS:
+        raise ValueError(f"Unknown search parameter: {param}")
+    if not low < high:
+        raise ValueError("Search bracket needs low < high")
+
+    params = {'sampling_interval': 15, 'noise_multiplier': 1.0, 'pH_threshold': 7.5,
+              'dt_threshold': 1.0, 'violation_threshold': 0.75, **(baseline_params or {})}
+    bank_args = dict(sampling_interval=params['sampling_interval'],
+                     noise_mult=params['noise_multiplier'], seed=seed,
+                     simulation_days=simulation_days, batch_size=batch_size,
+                     sensor_specs=sensor_specs)
+    infection = TraceBank('infection', **bank_args)
+    normal = TraceBank('normal', **bank_args)
+
+    def alert_logic(value):
+        kwargs = {SEARCH_PARAMS[name]: params[name] for name in SEARCH_PARAMS}
+        kwargs[SEARCH_PARAMS[param]] = value
+        return AlertLogic(persistence_hours=12,
+                          sampling_interval_minutes=params['sampling_interval'], **kwargs)
+
+    def detected(result):
+        return result['first_alert_time'] <= deadline_hours  # NaN (no alert) is False
+
+    def quiet(result):
+        return result['first_alert_index'] < 0
+
+    probes = []
+
+    def detects(value):
+        outcome = probe(infection, alert_logic(value), detected, detection_target,
+                        max_replicates, z)
+        probes.append((value, outcome))
+        return outcome
+
+    # Bracket check: boundary below the range, or at least the top of it
+    boundary = None
+    if detects(high)['passed']:
+        boundary, bracket = high, (high, None)
+    elif not detects(low)['passed']:
+        bracket = (None, low)
+    else:
+        while high - low > precision:
+            mid = (low + high) / 2
+            if detects(mid)['passed']:
+                low = mid
+            else:
+                high = mid
+        boundary, bracket = low, (low, high)
+
+    result = {
+        'param': param,
+        'boundary': boundary,
+        'bracket': bracket,
+        'feasible': False,
+        'detection': None,
+        'false_positive': None,
+        'probes': probes,
+        'n_simulated': 0,
+        'n_evaluated': 0
+    }
+
+    if boundary is not None:
+        result['detection'] = next(p for v, p in reversed(probes) if v == boundary)
+        result['false_positive'] = probe(normal, alert_logic(boundary), quiet, 1 - fp_limit,
+                                         max_replicates, z)
+        result['feasible'] = result['detection']['passed'] and result['false_positive']['passed']
+
+    result['n_simulated'] = max(infection.n_simulated, normal.n_simulated)
+    result['n_evaluated'] = (sum(p['n_replicates'] for _, p in probes)
+                             + (result['false_positive'] or {}).get('n_replicates', 0))
+    return result
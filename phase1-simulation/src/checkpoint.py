@@ -0,0 +1,166 @@
+import ast
+import json
+import os
+import struct
+
+import numpy as np
+from alert_logic import AlertLogic
+from alert_service import PatientAlertStates
+from noise import NoiseGenerator
+
+MAGIC = b'SDCKPT1\n'
+ALIGNMENT = 64
+
+
+def write_checkpoint(path, kind, config, dtype, count, fill):
+    """
+    Write `count` fixed-layout records behind a small JSON header.
+
+    Records are filled in place through a writable memory map, and the
+    file is renamed into place afterwards, so a crash mid-write never
+    leaves a truncated checkpoint.
+
+    Args:
+        path: Checkpoint file
+        kind: Record type tag ('alert_logic' or 'noise')
+        config: JSON-able constructor arguments for restoring
+        dtype: Record dtype
+        count: Number of records
+        fill: Callable filling the (count,) record array
+    """
+    header = json.dumps({'kind': kind, 'config': config, 'dtype': str(dtype.descr),
+                         'count': count}).encode()
+    offset = -(-(len(MAGIC) + 4 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC + struct.pack('<I', len(header)) + header)
+        f.write(b'\0' * (offset - f.tell()))
+        f.truncate(offset + count * dtype.itemsize)
+
+    if count:
+        mapped = np.memmap(tmp_path, dtype=dtype, mode='r+', offset=offset, shape=(count,))
+        fill(mapped)
+        mapped.flush()
+        del mapped
+    os.replace(tmp_path, path)
+
+
+def open_checkpoint(path, mode='r'):
+    """
+    Memory-map a checkpoint written by write_checkpoint.
+
+    Returns:
+        (header, records): header dict and the record array (zero-copy)
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a checkpoint file: {path}")
+        (length,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(length))
+
+    dtype = np.dtype(ast.literal_eval(header['dtype']))
+    offset = -(-(len(MAGIC) + 4 + length) // ALIGNMENT) * ALIGNMENT
+    if not header['count']:
+        return header, np.zeros(0, dtype=dtype)
+    return header, np.memmap(path, dtype=dtype, mode=mode, offset=offset,
+                             shape=(header['count'],))
+
+
+def _expect(header, kind):
+    if header['kind'] != kind:
+        raise ValueError(f"Checkpoint holds {header['kind']!r} records, expected {kind!r}")
+
+
+# =================================
+# ALERT STATE
+# =================================
+
+def save_alert_logics(path, engines):
+    """Checkpoint AlertLogic objects sharing one configuration."""
+    engines = list(engines)
+    reference = engines[0] if engines else AlertLogic()
+    config = reference.config()
+    if any(engine.config() != config for engine in engines):
+        raise ValueError("All AlertLogic objects in a checkpoint must share one configuration")
+
+    def fill(records):
+        for engine, record in zip(engines, records):
+            engine.snapshot(out=record)
+
+    dtype = reference.snapshot_dtype()
+    write_checkpoint(path, 'alert_logic', config, dtype, len(engines), fill)
+
+
+def load_alert_logics(path):
+    """Restore the AlertLogic objects saved by save_alert_logics/save_patient_states."""
+    header, records = open_checkpoint(path)
+    _expect(header, 'alert_logic')
+
+    engines = []
+    for record in records:
+        engine = AlertLogic(**header['config'])
+        engine.restore(record)
+        engines.append(engine)
+    return engines
+
+
+def save_patient_states(path, states, n_patients=None):
+    """
+    Checkpoint the first n_patients rows of a PatientAlertStates table.
+    Records use AlertLogic's layout, so they can be restored either into
+    PatientAlertStates or into individual AlertLogic objects.
+    """
+    n = states.capacity if n_patients is None else n_patients
+    write_checkpoint(path, 'alert_logic', states.params.config(), states.params.snapshot_dtype(),
+                     n, states.write_records)
+
+
+def load_patient_states(path, capacity=None):
+    """Restore a PatientAlertStates table from an alert-state checkpoint."""
+    header, records = open_checkpoint(path)
+    _expect(header, 'alert_logic')
+
+    states = PatientAlertStates(max(capacity or 0, len(records), 1), **header['config'])
+    states.from_records(records)
+    return states
+
+
+# =================================
+# NOISE STATE
+# =================================
+
+def save_noise_generators(path, generators):
+    """Checkpoint NoiseGenerators sharing one noise spec."""
+    generators = list(generators)
+    config = _noise_config(generators[0]) if generators else {}
+    if any(_noise_config(gen) != config for gen in generators):
+        raise ValueError("All NoiseGenerators in a checkpoint must share one noise spec")
+
+    def fill(records):
+        for gen, record in zip(generators, records):
+            gen.snapshot(out=record)
+
+    write_checkpoint(path, 'noise', config, NoiseGenerator.SNAPSHOT_DTYPE, len(generators), fill)
+
+
+def load_noise_generators(path):
+    """Restore the NoiseGenerators saved by save_noise_generators."""
+    header, records = open_checkpoint(path)
+    _expect(header, 'noise')
+
+    generators = []
+    for record in records:
+        gen = NoiseGenerator(**header['config'])
+        gen.restore(record)
+        generators.append(gen)
+    return generators
+
+
+def _noise_config(gen):
+    return {
+        'noise_sigma': gen.noise_sigma,
+        'drift_sigma_per_hour': gen.drift_sigma_per_hour,
+        'sampling_interval_minutes': gen.sampling_interval_minutes,
+        'block_size': gen.block_size
+    }
@@ -0,0 +1,160 @@
+import numpy as np
+from alert_logic import AlertLogic
+from trace_evaluator import evaluate_traces, as_batch, rolling_counts, window_full, first_alert
+
+# Defaults mirror the constants compiled into AlertEngine (alert_engine.h)
+FIRMWARE_DEFAULTS = {
+    'pH_threshold': 7.5,
+    'temp_delta_threshold': 1.0,
+    'persistence_hours': 12,
+    'violation_threshold': 0.75
+}
+
+
+def emulate_alert_engine(pH, temp, t_hours, sampling_interval_minutes=15, **params):
+    """
+    Vectorized replay of the firmware AlertEngine::update over whole traces.
+
+    Reproduces the C++ types rather than AlertLogic's float64 arithmetic:
+        - readings, thresholds, baseline and violation rate are float32
+        - samples_per_hour is uint8 integer division (60 / interval)
+        - the clock is uint16 floor(time_hours); the baseline locks on the
+          first sample whose integer hour is >= 24
+        - the baseline is sorted[n / 2] of the calibration samples (upper
+          median for even n), not the average of the middle pair
+        - the window count is a uint8 (wraps above 255 violations)
+        - peak_violation_rate is the maximum of getViolationRate(), which
+          divides by the samples in the window, so a partly filled window
+          can report a higher rate than AlertLogic's count / window_size
+
+    Args:
+        pH, temp: Readings, shape (n_steps,) or (n_traces, n_steps)
+        t_hours: Sample times (hours), shape (n_steps,), shared by all traces
+        sampling_interval_minutes: AlertEngine constructor argument
+        params: Overrides of FIRMWARE_DEFAULTS
+    Returns:
+        dict: Same keys as evaluate_traces (per-trace arrays for 2-D input)
+    """
+    config = {**FIRMWARE_DEFAULTS, **params}
+    pH, temp, t_hours, single = as_batch(pH, temp, t_hours)
+    pH = pH.astype(np.float32)
+    temp = temp.astype(np.float32)
+    n_traces, n_steps = pH.shape
+
+    samples_per_hour = np.uint8(60 // int(sampling_interval_minutes))
+    window_size = int(np.uint16(config['persistence_hours'] * int(samples_per_hour)))
+
+    # uint16 uptime from floor() of the float time, as in the test harness
+    uptime = np.floor(t_hours.astype(np.float32)).astype(np.int64) % 65536
+    locking = np.flatnonzero(uptime >= 24)
+    lock_index = int(locking[0]) if len(locking) else n_steps
+
+    baseline = np.full(n_traces, np.nan, dtype=np.float32)
+    violations = np.zeros((n_traces, n_steps), dtype=bool)
+    if lock_index < n_steps:
+        calibration = np.sort(temp[:, :lock_index + 1], axis=1)
+        baseline = calibration[:, (lock_index + 1) // 2]
+
+        delta = temp[:, lock_index:] - baseline[:, None]
+        violations[:, lock_index:] = ((pH[:, lock_index:] > np.float32(config['pH_threshold']))
+                                      & (delta > np.float32(config['temp_delta_threshold'])))
+
+    window_counts = rolling_counts(violations, window_size).astype(np.uint8)
+    full = window_full(n_steps, lock_index, window_size)
+    rate = window_counts.astype(np.float32) / np.float32(window_size)
+    alert_states = full & (rate >= np.float32(config['violation_threshold']))
+
+    # getViolationRate(): count / violation_window.size(), 0 while empty
+    in_window = np.clip(np.arange(n_steps) - lock_index + 1, 0, window_size)
+    reported = window_counts.astype(np.float32) / np.maximum(in_window, 1).astype(np.float32)
+
+    first_alert_index, first_alert_time = first_alert(alert_states, t_hours)
+    peak = reported.max(axis=1, initial=np.float32(0))
+
+    result = {
+        'baseline': baseline,
+        'lock_index': lock_index if lock_index < n_steps else -1,
+        'violations': violations,
+        'window_counts': window_counts,
+        'alert_states': alert_states,
+        'first_alert_index': first_alert_index,
+        'first_alert_time': first_alert_time,
+        'peak_violation_rate': peak
+    }
+
+    if single:
+        result = {key: (value[0] if isinstance(value, np.ndarray) else value)
+                  for key, value in result.items()}
+
+    return result
+
+
+def compare_with_reference(pH, temp, t_hours, sampling_interval_minutes=15, first_trace=0,
+                           **params):
+    """
+    Differential check of AlertLogic (float64 reference) against the
+    firmware emulation on the same traces.
+
+    Args:
+        pH, temp, t_hours: As for emulate_alert_engine
+        first_trace: Global index of the first trace (for chunked runs)
+        params: Alert parameters shared by both sides
+    Returns:
+        list of dicts, one per trace whose decisions differ: {
+        'trace', 'index' (first divergent sample), 't_hours',
+        'reference', 'firmware' (decisions at that sample),
+        'n_divergent' (samples that differ),
+        'reference_alert_time', 'firmware_alert_time',
+        'reference_baseline', 'firmware_baseline'
+    }
+    """
+    config = {**FIRMWARE_DEFAULTS, **params}
+    pH, temp, t_hours, _ = as_batch(pH, temp, t_hours)
+
+    reference = evaluate_traces(pH, temp, t_hours,
+                                AlertLogic(sampling_interval_minutes=sampling_interval_minutes,
+                                           **config))
+    firmware = emulate_alert_engine(pH, temp, t_hours, sampling_interval_minutes, **config)
+
+    differs = reference['alert_states'] != firmware['alert_states']
+    divergences = []
+    for trace in np.flatnonzero(differs.any(axis=1)):
+        index = int(differs[trace].argmax())
+        divergences.append({
+            'trace': first_trace + int(trace),
+            'index': index,
+            't_hours': float(t_hours[index]),
+            'reference': bool(reference['alert_states'][trace, index]),
+            'firmware': bool(firmware['alert_states'][trace, index]),
+            'n_divergent': int(differs[trace].sum()),
+            'reference_alert_time': float(reference['first_alert_time'][trace]),
+            'firmware_alert_time': float(firmware['first_alert_time'][trace]),
+            'reference_baseline': float(reference['baseline'][trace]),
+            'firmware_baseline': float(firmware['baseline'][trace])
+        })
+    return divergences
+
+
+def differential_check(simulator, n_traces, simulation_days=10, chunk_size=2000, **params):
+    """
+    Stream simulated traces through compare_with_reference chunk by chunk.
+
+    Args:
+        simulator: BatchSimulator (seeded for reproducible trace indices)
+        n_traces: Traces to check
+        params: Alert parameters
+    Returns:
+        dict: {'n_traces', 'n_divergent_traces', 'divergences'}
+    """
+    divergences = []
+    for start, chunk in zip(range(0, n_traces, chunk_size),
+                            simulator.iter_chunks(n_traces, simulation_days, chunk_size)):
+        divergences.extend(compare_with_reference(
+            chunk['pH'], chunk['temp'], chunk['time_hours'],
+            simulator.sampling_interval_minutes, first_trace=start, **params))
+
+    return {
+        'n_traces': n_traces,
+        'n_divergent_traces': len(divergences),
+        'divergences': divergences
+    }
@@ -0,0 +1,189 @@
+import functools
+import importlib
+import json
+import time
+
+# Hot paths wrapped while a Profiler is active:
+# (module, class, method, stage name, items per call from (result, self, *args))
+HOT_PATHS = [
+    ('wound_model', 'WoundModel', 'get_pH', 'clean_model', None),
+    ('wound_model', 'WoundModel', 'get_temperature', 'clean_model', None),
+    ('wound_model', 'WoundModel', 'trajectory', 'clean_model',
+     lambda result, self, time_points: len(time_points)),
+    ('noise', 'NoiseGenerator', 'sample', 'noise', None),
+    ('noise', 'NoiseGenerator', 'sample_batch', 'noise',
+     lambda result, self, n_steps, n_patients=1: n_steps * n_patients),
+    ('sensor_channel', 'SensorChannel', 'read', 'sensor_read', None),
+    ('sensor_channel', 'SensorChannel', 'read_batch', 'sensor_read',
+     lambda result, self, time_points, n_patients=1: len(time_points) * n_patients),
+    ('batch_simulation', 'BatchSimulator', '_simulate', 'batch_simulation',
+     lambda result, self, *args: result['pH'].size),
+    ('alert_logic', 'AlertLogic', 'update', 'alert_update', None),
+    ('alert_logic', 'AlertLogic', 'update_many', 'alert_update',
+     lambda result, self, pH_array, *args: len(pH_array)),
+    ('alert_logic', 'AlertLogic', 'get_status', 'alert_get_status', None),
+]
+
+
+class _Stage:
+    """Context manager timing one entry into a stage (only used when profiling)."""
+    __slots__ = ('profiler', 'name', 'items', 'start', 'child_s')
+
+    def __init__(self, profiler, name, items):
+        self.profiler = profiler
+        self.name = name
+        self.items = items
+
+    def __enter__(self):
+        self.child_s = 0.0
+        self.profiler._stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        stack = self.profiler._stack
+        stack.pop()
+        if stack:
+            stack[-1].child_s += elapsed
+        self.profiler._record(self.name, self.items, elapsed, elapsed - self.child_s)
+
+
+class _NullStage:
+    """Shared no-op context for stage() while profiling is off."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+_active = None
+
+
+def stage(name, items=1):
+    """
+    Time a block as a named pipeline stage of the active Profiler.
+    With no active profiler this returns a shared no-op context.
+
+    Args:
+        name: Stage name (e.g. 'report.plots')
+        items: Samples/rows processed by the block (for the per-second rate)
+    """
+    if _active is None:
+        return _NULL_STAGE
+    return _Stage(_active, name, items)
+
+
+def active_profiler():
+    """The Profiler currently collecting, or None."""
+    return _active
+
+
+class Profiler:
+    """
+    Opt-in per-stage wall time, call counts and throughput.
+
+    While active (``with Profiler() as prof:``), the HOT_PATHS methods are
+    replaced by timing wrappers and stage() blocks are recorded; on exit the
+    original methods are restored, so disabled runs execute the unmodified
+    code. Stage times are inclusive ('total_s') and exclusive of nested
+    stages ('self_s'). Stats are collected per process.
+    """
+    def __init__(self, hot_paths=None):
+        """
+        Args:
+            hot_paths: Methods to wrap (default HOT_PATHS)
+        """
+        self.hot_paths = HOT_PATHS if hot_paths is None else hot_paths
+        self.stats = {}
+        self.wall_s = 0.0
+        self._stack = []
+        self._patched = []
+        self._started = None
+
+    def _record(self, name, items, total_s, self_s):
+        entry = self.stats.get(name)
+        if entry is None:
+            entry = self.stats[name] = {'calls': 0, 'items': 0, 'total_s': 0.0, 'self_s': 0.0}
+        entry['calls'] += 1
+        entry['items'] += items
+        entry['total_s'] += total_s
+        entry['self_s'] += self_s
+
+    def _wrap(self, method, name, items):
+        profiler = self
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            with _Stage(profiler, name, 1) as block:
+                result = method(*args, **kwargs)
+                if items is not None:
+                    block.items = items(result, *args, **kwargs)
+            return result
+        return timed
+
+    def start(self):
+        global _active
+        if _active is not None:
+            raise ValueError("A Profiler is already active")
+
+        for module_name, class_name, method_name, name, items in self.hot_paths:
+            cls = getattr(importlib.import_module(module_name), class_name)
+            original = cls.__dict__[method_name]
+            self._patched.append((cls, method_name, original))
+            setattr(cls, method_name, self._wrap(original, name, items))
+
+        _active = self
+        self._started = time.perf_counter()
+        return self
+
+    def stop(self):
+        global _active
+        if _active is not self:
+            return
+        self.wall_s += time.perf_counter() - self._started
+        for cls, method_name, original in reversed(self._patched):
+            setattr(cls, method_name, original)
+        self._patched = []
+        _active = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: {'wall_s', 'stages': {name: {'calls', 'items', 'total_s',
+            'self_s', 'items_per_s', 'share_of_wall'}}}, stages by descending self time
+        """
+        stages = {}
+        for name, entry in sorted(self.stats.items(), key=lambda kv: -kv[1]['self_s']):
+            stages[name] = {
+                **entry,
+                'items_per_s': entry['items'] / entry['total_s'] if entry['total_s'] else 0.0,
+                'share_of_wall': entry['self_s'] / self.wall_s if self.wall_s else 0.0
+            }
+        return {'wall_s': self.wall_s, 'stages': stages}
+
+    def save(self, path, **metadata):
+        """Write the profile as JSON (extra keyword arguments are stored alongside)."""
+        with open(path, 'w') as f:
+            json.dump({**metadata, **self.to_dict()}, f, indent=2)
+
+    def report(self):
+        """Profile as a printable table."""
+        lines = [f"{'stage':<24} {'calls':>10} {'items':>12} {'self_s':>9} {'total_s':>9} "
+                 f"{'items/s':>12} {'share':>6}"]
+        for name, s in self.to_dict()['stages'].items():
+            lines.append(f"{name:<24} {s['calls']:>10} {s['items']:>12} {s['self_s']:>9.3f} "
+                         f"{s['total_s']:>9.3f} {s['items_per_s']:>12,.0f} "
+                         f"{s['share_of_wall']:>6.1%}")
+        lines.append(f"wall time: {self.wall_s:.3f} s")
+        return '\n'.join(lines)
@@ -0,0 +1,207 @@
+import numpy as np
+from wound_model import WoundModel
+from noise import NoiseGenerator
+from alert_logic import AlertLogic
+from batch_simulation import BatchSimulator
+from trace_evaluator import evaluate_traces, evaluate_threshold_grid
+from streaming_stats import RunningStats, P2Quantile, wilson_interval
+from instrumentation import stage
+
+# run_single_test's sensor noise spec (see configs/sensor_specs.json); noise_sigma
+# is scaled by the noise multiplier
+SENSOR_SPECS = {
+    'pH': {'noise_sigma': 0.05, 'drift_sigma_per_hour': 0.002},
+    'temperature': {'noise_sigma': 0.10, 'drift_sigma_per_hour': 0.01}
+}
+
+
+class DetectionAccumulator:
+    """
+    Online aggregation of per-replicate detection outcomes.
+    Keeps only counters, running moments and quantile sketches, so memory
+    is the same for 1k or 1M replicates.
+    """
+    def __init__(self, quantiles=(0.05, 0.5, 0.95)):
+        self.n_replicates = 0
+        self.n_alerts = 0
+        self.alert_time = RunningStats()
+        self.alert_time_quantiles = {q: P2Quantile(q) for q in quantiles}
+        self.peak_violation_rate = RunningStats()
+
+    def add(self, first_alert_times, peak_violation_rates):
+        """
+        Args:
+            first_alert_times: Per-replicate first alert time (NaN = no alert)
+            peak_violation_rates: Per-replicate peak violation rate
+        """
+        first_alert_times = np.atleast_1d(first_alert_times)
+        alerted = first_alert_times[~np.isnan(first_alert_times)]
+
+        self.n_replicates += len(first_alert_times)
+        self.n_alerts += len(alerted)
+        self.alert_time.add(alerted)
+        for sketch in self.alert_time_quantiles.values():
+            for value in alerted:
+                sketch.add(value)
+        self.peak_violation_rate.add(peak_violation_rates)
+
+    def summary(self):
+        """Compact summary row (times in hours)."""
+        low, high = wilson_interval(self.n_alerts, self.n_replicates)
+        row = {
+            'n_replicates': self.n_replicates,
+            'n_alerts': self.n_alerts,
+            'alert_rate': self.n_alerts / self.n_replicates if self.n_replicates else float('nan'),
+            'alert_rate_ci_low': low,
+            'alert_rate_ci_high': high,
+            'alert_time_mean_hours': self.alert_time.mean if self.n_alerts else float('nan'),
+            'alert_time_std_hours': self.alert_time.std
+        }
+        for q, sketch in self.alert_time_quantiles.items():
+            row[f'alert_time_p{round(q * 100):02d}_hours'] = sketch.value()
+        row['peak_violation_rate_mean'] = self.peak_violation_rate.mean
+        return row
+
+
+def make_simulator(scenario, sampling_interval=15, noise_mult=1.0, seed=None,
+                   sensor_specs=None):
+    """
+    BatchSimulator with run_single_test's wound model and sensor noise spec.
+    sensor_specs: {'pH'|'temperature': {'noise_sigma', 'drift_sigma_per_hour'}}
+                  (default SENSOR_SPECS)
+    """
+    specs = SENSOR_SPECS if sensor_specs is None else sensor_specs
+    pH_spec, temp_spec = specs['pH'], specs['temperature']
+    return BatchSimulator(
+        WoundModel(scenario=scenario),
+        NoiseGenerator(pH_spec['noise_sigma'] * noise_mult, pH_spec['drift_sigma_per_hour'],
+                       sampling_interval),
+        NoiseGenerator(temp_spec['noise_sigma'] * noise_mult, temp_spec['drift_sigma_per_hour'],
+                       sampling_interval),
+        sampling_interval_minutes=sampling_interval,
+        seed=seed
+    )
+
+
+def run_params(scenario, sampling_interval, noise_mult, pH_thresh, dt_thresh, viol_thresh,
+               n_replicates, seed, simulation_days, sensor_specs=None):
+    """
+    Everything that determines a Monte Carlo summary, as a ResultCache key.
+    batch_size is left out: replicate streams do not depend on it.
+    """
+    return {
+        'kind': 'monte_carlo',
+        'scenario': scenario,
+        'sampling_interval': sampling_interval,
+        'noise_multiplier': noise_mult,
+        'sensor_specs': SENSOR_SPECS if sensor_specs is None else sensor_specs,
+        'alert': {'pH_threshold': pH_thresh, 'temp_delta_threshold': dt_thresh,
+                  'persistence_hours': 12, 'violation_threshold': viol_thresh},
+        'n_replicates': n_replicates,
+        'seed': seed,
+        'simulation_days': simulation_days
+    }
+
+
+def run_monte_carlo(scenario, sampling_interval=15, noise_mult=1.0, pH_thresh=7.5,
+                    dt_thresh=1.0, viol_thresh=0.75, n_replicates=1000, seed=0,
+                    batch_size=500, simulation_days=10, accumulator=None, sensor_specs=None,
+                    cache=None):
+    """
+    Seeded replicates of run_single_test's configuration, aggregated online.
+
+    Replicate i always uses patient substream i of `seed`, so results do not
+    depend on batch_size. Traces are simulated and evaluated one batch at a
+    time and discarded.
+
+    cache: ResultCache for the summary (seeded runs without an accumulator only)
+
+    Returns:
+        dict: DetectionAccumulator.summary() for the configuration. For the
+              'normal' scenario, alert_rate is the false-positive rate.
+    """
+    if cache is not None and seed is not None and accumulator is None:
+        params = run_params(scenario, sampling_interval, noise_mult, pH_thresh, dt_thresh,
+                            viol_thresh, n_replicates, seed, simulation_days, sensor_specs)
+        return cache.get_or_compute(params, lambda: run_monte_carlo(
+            scenario, sampling_interval, noise_mult, pH_thresh, dt_thresh, viol_thresh,
+            n_replicates, seed, batch_size, simulation_days, sensor_specs=sensor_specs))
+
+    simulator = make_simulator(scenario, sampling_interval, noise_mult, seed, sensor_specs)
+    alert_logic = AlertLogic(
+        pH_threshold=pH_thresh,
+        temp_delta_threshold=dt_thresh,
+        persistence_hours=12,
+        sampling_interval_minutes=sampling_interval,
+        violation_threshold=viol_thresh
+    )
+
+    if accumulator is None:
+        accumulator = DetectionAccumulator()
+
+    for batch in simulator.iter_chunks(n_replicates, simulation_days, chunk_size=batch_size):
+        with stage('alert_evaluation', batch['pH'].size):
+            result = evaluate_traces(batch['pH'], batch['temp'], batch['time_hours'], alert_logic)
+        accumulator.add(result['first_alert_time'], result['peak_violation_rate'])
+
+    return accumulator.summary()
+
+
+def run_monte_carlo_grid(scenario, sampling_interval=15, noise_mult=1.0,
+                         pH_thresholds=(7.5,), dt_thresholds=(1.0,), viol_thresholds=(0.75,),
+                         n_replicates=1000, seed=0, batch_size=200, simulation_days=10,
+                         sensor_specs=None, cache=None):
+    """
+    Simulate each replicate once and evaluate every alert-threshold
+    combination on it (common random numbers across thresholds).
+
+    Gives the same summaries as calling run_monte_carlo once per combination
+    with the same seed, at the simulation cost of a single call.
+
+    batch_size sets peak memory: each batch evaluates all pH x dT pairs at
+    once, about 18 bytes x n_pH x n_dT x batch_size x samples per trace
+    (3 x 3 pairs, 200 traces, 10 days at 15 min: ~31 MB).
+
+    With a ResultCache, each combination is stored under the same key as
+    the equivalent run_monte_carlo call; the grid is only simulated if any
+    combination is missing.
+
+    Returns:
+        dict: (pH_threshold, dt_threshold, viol_threshold) -> summary dict
+    """
+    combinations = [(pH_thresh, dt_thresh, viol_thresh) for pH_thresh in pH_thresholds
+                    for dt_thresh in dt_thresholds for viol_thresh in viol_thresholds]
+    if cache is not None and seed is not None:
+        params = {combo: run_params(scenario, sampling_interval, noise_mult, *combo,
+                                    n_replicates, seed, simulation_days, sensor_specs)
+                  for combo in combinations}
+        cached = {combo: cache.get(p) for combo, p in params.items()}
+        if all(summary is not None for summary in cached.values()):
+            return cached
+
+        summaries = run_monte_carlo_grid(scenario, sampling_interval, noise_mult, pH_thresholds,
+                                         dt_thresholds, viol_thresholds, n_replicates, seed,
+                                         batch_size, simulation_days, sensor_specs)
+        for combo, summary in summaries.items():
+            if cached[combo] is None:
+                cache.put(params[combo], summary)
+        return summaries
+
+    simulator = make_simulator(scenario, sampling_interval, noise_mult, seed, sensor_specs)
+    alert_logic = AlertLogic(persistence_hours=12, sampling_interval_minutes=sampling_interval)
+
+    accumulators = {combo: DetectionAccumulator() for combo in combinations}
+
+    for batch in simulator.iter_chunks(n_replicates, simulation_days, chunk_size=batch_size):
+        with stage('alert_evaluation', batch['pH'].size):
+            result = evaluate_threshold_grid(batch['pH'], batch['temp'], batch['time_hours'],
+                                             pH_thresholds, dt_thresholds, viol_thresholds,
+                                             alert_logic)
+        for i, pH_thresh in enumerate(pH_thresholds):
+            for j, dt_thresh in enumerate(dt_thresholds):
+                for k, viol_thresh in enumerate(viol_thresholds):
+                    accumulators[(pH_thresh, dt_thresh, viol_thresh)].add(
+                        result['first_alert_time'][i, j, k],
+                        result['peak_violation_rate'][i, j, k])
+
+    return {key: acc.summary() for key, acc in accumulators.items()}
@@ -1,20 +1,73 @@
 import numpy as np
 
+
+def stream_seed(seed, patient_index, channel_index):
+    """
+    SeedSequence for one (patient, channel) noise substream.
+
+    The substream depends only on the root seed and the indices, so serial,
+    batched and parallel runs that visit patients in any order draw the same
+    numbers for the same patient.
+
+    Args:
+        seed: Root seed (int or SeedSequence)
+        patient_index: Global index of the virtual patient
+        channel_index: Sensor channel index (see sensor_channel.CHANNEL_INDEX)
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return np.random.SeedSequence(seed.entropy,
+                                      spawn_key=seed.spawn_key + (patient_index, channel_index))
+    return np.random.SeedSequence(seed, spawn_key=(patient_index, channel_index))
+
+
+def child_streams(rng=None):
+    """
+    (noise, drift) Generators for one noise substream.
+
+    Args:
+        rng: Seed (int), np.random.SeedSequence or np.random.Generator
+    """
+    if isinstance(rng, np.random.Generator):
+        return tuple(rng.spawn(2))
+
+    if not isinstance(rng, np.random.SeedSequence):
+        rng = np.random.SeedSequence(rng)
+    return tuple(
+        np.random.default_rng(np.random.SeedSequence(rng.entropy, spawn_key=rng.spawn_key + (i,)))
+        for i in range(2)
+    )
+
+
 class NoiseGenerator:
     """
     Generates Gaussian noise + random-walk drift for sensor simulation
     Design principle: Firmware-portable logic (no pandas, no ML)
     """
-    def __init__(self, noise_sigma, drift_sigma_per_hour, sampling_interval_minutes=15):
+    # Fixed checkpoint record (see snapshot/restore)
+    SNAPSHOT_DTYPE = np.dtype([
+        ('current_drift', '<f8'),
+        ('block_len', '<i8'),      # 0 = no live block, streams stored at current state
+        ('block_pos', '<i8'),
+        ('stream_state', '<u8', (2, 4)),  # PCG64 state/inc as (hi, lo) words per stream
+        ('stream_uinteger', '<u4', (2,)),
+        ('stream_has_uint32', '?', (2,))
+    ])
+
+    def __init__(self, noise_sigma, drift_sigma_per_hour, sampling_interval_minutes=15,
+                 rng=None, block_size=1024):
         """
         Args:
             noise_sigma: Standard deviation of Gaussian noise per sample
             drift_sigma_per_hour: Drift accumulation rate (std dev per hour)
             sampling_interval_minutes: Time between samples
+            rng: Seed (int), np.random.SeedSequence or np.random.Generator.
+                 None draws fresh OS entropy (non-reproducible).
+            block_size: Samples pre-generated per refill for sample()
         """
         self.noise_sigma = noise_sigma
         self.drift_sigma_per_hour = drift_sigma_per_hour
         self.sampling_interval_minutes = sampling_interval_minutes
+        self.block_size = block_size
 
         # Calculate drift per sample (not per hour)
         hours_per_sample = sampling_interval_minutes / 60.0
@@ -22,26 +75,184 @@ class NoiseGenerator:
 
         # Internal state
         self.current_drift = 0.0
+        self.seed(rng)
+
+    def seed(self, rng=None):
+        """
+        Attach new random streams.
+
+        Noise and drift increments come from two independent child streams,
+        so the values drawn never depend on how requests are split into blocks.
+        """
+        self._noise_rng, self._drift_rng = child_streams(rng)
+
+        # Pre-generated block for sample(); empty until first use
+        self._noise_block = np.empty(0)
+        self._increment_block = np.empty(0)
+        self._block_pos = 0
+        self._block_states = None  # stream states the current block was drawn from
+
+    def clone(self, rng=None):
+        """New generator with the same noise spec and its own stream (state not copied)."""
+        return NoiseGenerator(self.noise_sigma, self.drift_sigma_per_hour,
+                              self.sampling_interval_minutes, rng=rng,
+                              block_size=self.block_size)
 
     def reset(self):
         """Reset drift accumulation (for new simulation runs)"""
         self.current_drift = 0.0
 
+    def _take(self, n):
+        """Next n (noise, increment) draws, buffered values first."""
+        k = min(n, len(self._noise_block) - self._block_pos)
+        noise = self._noise_block[self._block_pos:self._block_pos + k]
+        increments = self._increment_block[self._block_pos:self._block_pos + k]
+        self._block_pos += k
+
+        if n > k:
+            noise = np.concatenate((noise, self._noise_rng.normal(0, self.noise_sigma, n - k)))
+            increments = np.concatenate((increments, self._drift_rng.normal(
+                0, self.drift_sigma_per_sample, n - k)))
+
+        return noise, increments
+
+    def sample_batch(self, n_steps, n_patients=1):
+        """
+        Generate noise and drift for a whole block of samples at once.
+
+        Drift is the cumulative sum of the per-sample increments, continued
+        from the current drift state, so consecutive calls with the same
+        n_patients extend the same random walks (long runs can be generated
+        in chunks). After a multi-patient call the drift state is per patient;
+        call reset() before switching n_patients or going back to sample().
+
+        Rows consume this generator's stream in order; use one generator per
+        patient (see stream_seed) for per-patient streams.
+
+        Args:
+            n_steps: Number of timesteps per patient
+            n_patients: Number of independent traces
+        Returns:
+            (noise, drift): Arrays of shape (n_patients, n_steps)
+        """
+        if np.ndim(self.current_drift) and len(self.current_drift) != n_patients:
+            raise ValueError(f"Drift state holds {len(self.current_drift)} patients, "
+                             f"got n_patients={n_patients}; call reset() first")
+
+        noise, increments = self._take(n_patients * n_steps)
+        noise = noise.reshape(n_patients, n_steps)
+        increments = increments.reshape(n_patients, n_steps)
+
+        # Prepend the carried drift so the running sum matches serial accumulation
+        start = np.broadcast_to(np.reshape(self.current_drift, (-1, 1)), (n_patients, 1))
+        drift = np.cumsum(np.concatenate((start, increments), axis=1), axis=1)[:, 1:]
+
+        if n_steps:
+            self.current_drift = drift[0, -1] if n_patients == 1 else drift[:, -1].copy()
+
+        return noise, drift
+
+    def sample_block(self, n):
+        """
+        Generate n consecutive samples of a single trace.
+        Returns:
+            (noise, drift): 1-D arrays of length n
+        """
+        noise, drift = self.sample_batch(n)
+        return noise[0], drift[0]
+
     def sample(self):
         """
         Generate one noisy sample with drift.
         Returns:
             (noise, drift): Separate components for debugging
         """
-        #Gaussian noise (zero-mean, per-sample)
-        noise = np.random.normal(0, self.noise_sigma)
+        if np.ndim(self.current_drift):
+            raise ValueError("Drift state is per patient after a multi-patient "
+                             "sample_batch(); call reset() before sample()")
+
+        if self._block_pos >= len(self._noise_block):
+            self._refill(self.block_size)
+
+        noise = self._noise_block[self._block_pos]
 
         # Random-walk drift update
-        drift_increment = np.random.normal(0, self.drift_sigma_per_sample)
-        self.current_drift += drift_increment
+        self.current_drift += self._increment_block[self._block_pos]
+        self._block_pos += 1
 
         return noise, self.current_drift
 
+    def _refill(self, n):
+        self._block_states = (self._noise_rng.bit_generator.state,
+                              self._drift_rng.bit_generator.state)
+        self._noise_block = self._noise_rng.normal(0, self.noise_sigma, n)
+        self._increment_block = self._drift_rng.normal(0, self.drift_sigma_per_sample, n)
+        self._block_pos = 0
+
+    def snapshot(self, out=None):
+        """
+        Serialize drift and stream position to a fixed-layout record (SNAPSHOT_DTYPE).
+
+        A partly consumed sample() block is stored as the stream states it
+        was drawn from plus the read position; restore() redraws it.
+        Requires PCG64 streams (the default) and a scalar drift state.
+
+        Args:
+            out: Record to fill in place; None returns the record as bytes
+        """
+        if np.ndim(self.current_drift):
+            raise ValueError("Cannot snapshot per-patient drift state; call reset() first")
+
+        live = self._block_pos < len(self._noise_block)
+        states = self._block_states if live else (self._noise_rng.bit_generator.state,
+                                                  self._drift_rng.bit_generator.state)
+
+        record = np.zeros((), dtype=self.SNAPSHOT_DTYPE) if out is None else out
+        record['current_drift'] = self.current_drift
+        record['block_len'] = len(self._noise_block) if live else 0
+        record['block_pos'] = self._block_pos if live else 0
+        for i, state in enumerate(states):
+            if state['bit_generator'] != 'PCG64':
+                raise ValueError(f"Unsupported bit generator: {state['bit_generator']}")
+            words = [w for value in (state['state']['state'], state['state']['inc'])
+                     for w in (value >> 64, value & 0xFFFFFFFFFFFFFFFF)]
+            record['stream_state'][i] = words
+            record['stream_uinteger'][i] = state['uinteger']
+            record['stream_has_uint32'][i] = state['has_uint32']
+
+        return record.tobytes() if out is None else None
+
+    def restore(self, record):
+        """
+        Load state written by snapshot(); the noise spec must match.
+
+        Args:
+            record: bytes from snapshot() or a record of SNAPSHOT_DTYPE
+        """
+        if isinstance(record, (bytes, bytearray, memoryview)):
+            record = np.frombuffer(record, dtype=self.SNAPSHOT_DTYPE)[0]
+
+        self._noise_rng = np.random.Generator(np.random.PCG64())
+        self._drift_rng = np.random.Generator(np.random.PCG64())
+        for i, rng in enumerate((self._noise_rng, self._drift_rng)):
+            hi_state, lo_state, hi_inc, lo_inc = (int(w) for w in record['stream_state'][i])
+            rng.bit_generator.state = {
+                'bit_generator': 'PCG64',
+                'state': {'state': hi_state << 64 | lo_state, 'inc': hi_inc << 64 | lo_inc},
+                'has_uint32': int(record['stream_has_uint32'][i]),
+                'uinteger': int(record['stream_uinteger'][i])
+            }
+
+        self.current_drift = float(record['current_drift'])
+        if record['block_len']:
+            self._refill(int(record['block_len']))
+            self._block_pos = int(record['block_pos'])
+        else:
+            self._noise_block = np.empty(0)
+            self._increment_block = np.empty(0)
+            self._block_pos = 0
+            self._block_states = None
+
     def add_noise_and_drift(self, clean_value):
         """
         Apply noise + drift to a clean sensor reading.
@@ -0,0 +1,19 @@
+import sys
+
+
+def pyplot(show=False):
+    """
+    Import matplotlib.pyplot on first use, so scripts and workers that never
+    plot do not pay for it. Unless the figure is to be shown interactively,
+    the non-GUI Agg backend is selected (headless hosts, batch runs).
+
+    Args:
+        show: True if the caller will call plt.show()
+    Returns:
+        The matplotlib.pyplot module
+    """
+    import matplotlib
+    if not show and 'matplotlib.pyplot' not in sys.modules:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
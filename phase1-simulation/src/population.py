@@ -0,0 +1,195 @@
+import numpy as np
+from noise import stream_seed
+from wound_model import WoundModel
+from alert_logic import AlertLogic
+from trace_evaluator import evaluate_traces
+from monte_carlo import DetectionAccumulator, SENSOR_SPECS
+from sensor_array import SensorArray
+
+# Substream index of the per-patient parameter draw (clear of CHANNEL_INDEX
+# and sensor_array.ARRAY_STREAM)
+POPULATION_STREAM = 254
+
+# Per-patient parameter distributions, as (kind, *args):
+#   ('constant', value)
+#   ('normal', mean, sd[, low, high])   optionally clipped to [low, high]
+#   ('lognormal', median, log_sd)
+#   ('uniform', low, high)
+#   ('bernoulli', p)                    'infected' only
+# Spreads are placeholders pending cohort data; centres are WoundModel's defaults.
+DEFAULT_DISTRIBUTIONS = {
+    'infected': ('bernoulli', 0.5),
+    'PH_base': ('normal', 6.0, 0.2, 5.0, 7.0),
+    'T_base': ('normal', 36.8, 0.3, 35.5, 38.0),
+    'alpha': ('lognormal', 2.0, 0.15),
+    'beta': ('lognormal', 1.65, 0.15),
+    'onset_hours': ('uniform', 24.0, 96.0),
+    'tau_hours': ('lognormal', 36.0, 0.3),
+    'ISI_onset': ('constant', 0.2),
+    'ISI_rise': ('constant', 0.6),
+    'ISI_normal': ('uniform', 0.05, 0.15),
+}
+
+DISTRIBUTION_KINDS = {'constant': 1, 'normal': (2, 4), 'lognormal': 2, 'uniform': 2,
+                      'bernoulli': 1}
+
+
+class PopulationSampler:
+    """
+    Virtual patient cohort: per-patient WoundModel parameters drawn from
+    configurable distributions, generated lazily in batches.
+
+    Each patient has its own substream (see noise.stream_seed), so a
+    patient's parameters depend only on the seed and the patient index,
+    not on the batch size. Every parameter takes a fixed column of the
+    patient's draw, so changing one distribution leaves the others as they were.
+    """
+    def __init__(self, distributions=None, seed=None, **overrides):
+        """
+        Args:
+            distributions: {parameter: spec} replacing DEFAULT_DISTRIBUTIONS
+            seed: Root seed (None draws fresh OS entropy, non-reproducible)
+            **overrides: Individual specs on top, e.g. infected=('bernoulli', 0.2)
+        """
+        specs = dict(DEFAULT_DISTRIBUTIONS if distributions is None else distributions)
+        specs.update(overrides)
+
+        for name, spec in specs.items():
+            if name != 'infected' and name not in WoundModel.PARAMETERS:
+                raise ValueError(f"Unknown wound model parameter: {name}")
+            kind, args = spec[0], spec[1:]
+            counts = DISTRIBUTION_KINDS.get(kind)
+            if counts is None:
+                raise ValueError(f"Unknown distribution '{kind}' for {name}")
+            if len(args) not in np.atleast_1d(counts):
+                raise ValueError(f"Distribution '{kind}' for {name} takes {counts} argument(s)")
+            if (kind == 'bernoulli') != (name == 'infected'):
+                raise ValueError("'infected' needs a bernoulli distribution (and only it)")
+
+        self.distributions = specs
+        self.seed = seed
+        self._rng = np.random.default_rng() if seed is None else None
+
+    def _draws(self, n_patients, first_patient):
+        """(uniform, standard normal) draws, each (n_patients, n_parameters)."""
+        shape = (n_patients, len(self.distributions))
+        if self.seed is None:
+            return self._rng.random(shape), self._rng.standard_normal(shape)
+
+        uniform = np.empty(shape)
+        normal = np.empty(shape)
+        for row in range(n_patients):
+            rng = np.random.default_rng(stream_seed(self.seed, first_patient + row,
+                                                    POPULATION_STREAM))
+            rng.random(out=uniform[row])
+            rng.standard_normal(out=normal[row])
+        return uniform, normal
+
+    def sample(self, n_patients, first_patient=0):
+        """
+        Parameters of n_patients consecutive patients.
+        Returns:
+            dict: {'patient_index': (n,) ints, 'infected': (n,) bools (if
+            distributed; otherwise every patient counts as infected),
+            <parameter>: (n,) floats for each distribution}
+        """
+        uniform, normal = self._draws(n_patients, first_patient)
+        params = {'patient_index': np.arange(first_patient, first_patient + n_patients)}
+        for column, (name, spec) in enumerate(self.distributions.items()):
+            params[name] = _transform(spec, uniform[:, column], normal[:, column])
+        return params
+
+    def iter_batches(self, n_patients, batch_size=1000):
+        """Yield sample() dicts of up to batch_size patients (bounded memory)."""
+        for start in range(0, n_patients, batch_size):
+            yield self.sample(min(batch_size, n_patients - start), start)
+
+
+def _transform(spec, uniform, normal):
+    kind, args = spec[0], spec[1:]
+    if kind == 'constant':
+        return np.full(len(uniform), float(args[0]))
+    if kind == 'bernoulli':
+        return uniform < args[0]
+    if kind == 'uniform':
+        return args[0] + (args[1] - args[0]) * uniform
+    if kind == 'lognormal':
+        return args[0] * np.exp(args[1] * normal)
+    values = args[0] + args[1] * normal
+    return np.clip(values, args[2], args[3]) if len(args) == 4 else values
+
+
+def batch_models(params):
+    """
+    (infection, normal) WoundModels evaluating every patient of a batch at
+    once: each parameter is a (n_patients, 1) column.
+    """
+    columns = {name: np.asarray(values, dtype=float)[:, None] for name, values in params.items()
+               if name in WoundModel.PARAMETERS}
+    return WoundModel('infection', **columns), WoundModel('normal', **columns)
+
+
+def batch_trajectory(params, time_points):
+    """
+    Clean pH and temperature curves for a batch of patients.
+
+    Infected patients follow the 'infection' ISI curve with their own onset
+    and time constant; the others heal at their constant ISI_normal.
+
+    Args:
+        params: PopulationSampler.sample() dict
+        time_points: 1-D array of times since wound creation (hours)
+    Returns:
+        (pH, temperature): arrays of shape (n_patients, len(time_points))
+    """
+    time_points = np.asarray(time_points, dtype=float)
+    infection, normal = batch_models(params)
+    infected = np.asarray(params.get('infected', np.ones(len(params['patient_index']), bool)))
+
+    ISI = np.where(infected[:, None], infection.compute_ISI(time_points),
+                   normal.compute_ISI(time_points))
+    ISI = np.broadcast_to(ISI, (len(infected), len(time_points)))
+    return infection.PH_base + infection.alpha * ISI, infection.T_base + infection.beta * ISI
+
+
+def validate_cohort(sampler, n_patients, alert_logic=None, simulation_days=10,
+                    sampling_interval=15, noise_mult=1.0, sensor_specs=None, seed=None,
+                    batch_size=1000):
+    """
+    Detection and false-positive rates over a heterogeneous cohort.
+
+    Each batch of patients is sampled, turned into clean curves, given
+    sensor noise and drift (SensorArray, one substream per patient), scored
+    with evaluate_traces and discarded, so memory is bounded by batch_size.
+
+    Args:
+        sampler: PopulationSampler
+        n_patients: Cohort size
+        alert_logic: AlertLogic supplying the thresholds (default AlertLogic())
+        simulation_days, sampling_interval, noise_mult, sensor_specs: As for run_monte_carlo
+        seed: Root seed of the sensor noise (None = non-reproducible)
+        batch_size: Patients per batch
+    Returns:
+        dict: {'infected': DetectionAccumulator summary (detection),
+        'healing': summary (alert_rate is the false-positive rate)}
+    """
+    if alert_logic is None:
+        alert_logic = AlertLogic(sampling_interval_minutes=sampling_interval)
+    array = SensorArray.from_wound_model(WoundModel(), ('pH', 'temperature'),
+                                         sensor_specs or SENSOR_SPECS, noise_mult,
+                                         sampling_interval_minutes=sampling_interval, seed=seed)
+    time_points = array.time_axis(simulation_days)
+    accumulators = {'infected': DetectionAccumulator(), 'healing': DetectionAccumulator()}
+
+    for params in sampler.iter_batches(n_patients, batch_size):
+        pH_clean, temp_clean = batch_trajectory(params, time_points)
+        readings = array.add_noise(np.stack((pH_clean, temp_clean), axis=-1),
+                                   first_patient=int(params['patient_index'][0]))
+        result = evaluate_traces(readings[..., 0], readings[..., 1], time_points, alert_logic)
+
+        infected = params.get('infected', np.ones(len(params['patient_index']), dtype=bool))
+        for group, mask in (('infected', infected), ('healing', ~infected)):
+            accumulators[group].add(result['first_alert_time'][mask],
+                                    result['peak_violation_rate'][mask])
+
+    return {group: accumulator.summary() for group, accumulator in accumulators.items()}
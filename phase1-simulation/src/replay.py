@@ -0,0 +1,139 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+from alert_logic import AlertLogic
+from trace_io import Trace, iter_csv_chunks
+
+LOG_SUFFIXES = ('.csv', '.trace')
+
+
+def iter_log_chunks(path, chunk_rows=65536):
+    """
+    Yield (time_hours, pH, temp) chunks from a recorded log: a Phase 1 CSV
+    (time_hours,pH,temp) or a single-trace columnar trace directory.
+    """
+    if os.path.isdir(path):
+        trace = Trace(path)
+        if trace.n_traces != 1:
+            raise ValueError(f"{path} holds {trace.n_traces} traces; replay expects one log "
+                             f"per device (export one with trace_to_csv)")
+        for start in range(0, trace.n_samples, chunk_rows):
+            arrays = trace.traces(start, start + chunk_rows)
+            yield arrays['time_hours'], arrays['pH'], arrays['temp']
+    else:
+        yield from iter_csv_chunks(path, chunk_rows)
+
+
+def find_logs(directory):
+    """Recorded logs (CSV files and trace directories) in a directory, sorted."""
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.endswith(LOG_SUFFIXES))
+
+
+def replay_log(path, alert_logic=None, chunk_rows=65536):
+    """
+    Stream one log through AlertLogic in fixed-size chunks.
+
+    Only one chunk is in memory at a time; each chunk goes through
+    AlertLogic.update_many, which carries the window and baseline across
+    chunk boundaries.
+
+    Args:
+        path: CSV file or trace directory
+        alert_logic: AlertLogic to feed (default AlertLogic()); its state
+                     is updated in place
+        chunk_rows: Samples per chunk
+    Yields:
+        dict: Alert transition {'path', 'index', 't_hours', 'alert_active'}
+    """
+    for _, events in _replay_chunks(path, alert_logic, chunk_rows):
+        yield from events
+
+
+def score_log(path, alert_params=None, chunk_rows=65536):
+    """
+    Replay one log and summarize it.
+
+    Args:
+        path: CSV file or trace directory
+        alert_params: AlertLogic keyword arguments
+    Returns:
+        dict: {'path', 'n_samples', 'baseline', 'first_alert_time', 'events'}
+    """
+    engine = AlertLogic(**(alert_params or {}))
+    n_samples = 0
+    events = []
+    for n, chunk_events in _replay_chunks(path, engine, chunk_rows):
+        n_samples += n
+        events.extend(chunk_events)
+
+    onsets = [e['t_hours'] for e in events if e['alert_active']]
+    return {
+        'path': path,
+        'n_samples': n_samples,
+        'baseline': engine.temp_baseline,
+        'first_alert_time': onsets[0] if onsets else None,
+        'events': events
+    }
+
+
+def replay_logs(paths, alert_params=None, workers=1, chunk_rows=65536, max_pending=None):
+    """
+    Re-score many logs, one fresh AlertLogic per log.
+
+    Files are distributed over a process pool with at most max_pending
+    logs in flight, so memory stays bounded by (in-flight logs x chunk)
+    for any number of files.
+
+    Args:
+        paths: Iterable of log paths (e.g. find_logs(directory)); consumed lazily
+        alert_params: AlertLogic keyword arguments
+        workers: Worker processes (1 = inline, None = all cores)
+        chunk_rows: Samples per chunk
+        max_pending: Logs submitted but not yet collected (default 2 x workers)
+    Yields:
+        score_log() summaries in completion order
+    """
+    if workers == 1:
+        for path in paths:
+            yield score_log(path, alert_params, chunk_rows)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    paths = iter(paths)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        while True:
+            for path in paths:
+                pending.add(pool.submit(score_log, path, alert_params, chunk_rows))
+                if len(pending) >= max_pending:
+                    break
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def _replay_chunks(path, alert_logic, chunk_rows):
+    """Yield (samples in chunk, transition events) per chunk."""
+    engine = alert_logic if alert_logic is not None else AlertLogic()
+    previous = False
+    offset = 0
+
+    for t, pH, temp in iter_log_chunks(path, chunk_rows):
+        alerts = engine.update_many(pH, temp, t)
+        changes = np.flatnonzero(np.diff(np.concatenate(([previous], alerts))))
+        yield len(t), [{
+            'path': path,
+            'index': offset + int(i),
+            't_hours': float(t[i]),
+            'alert_active': bool(alerts[i])
+        } for i in changes]
+
+        if len(alerts):
+            previous = alerts[-1]
+        offset += len(t)
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_source_versions = {}
+
+
+def source_version(src_dir=SRC_DIR):
+    """
+    Hash of every .py file in src/ (names and contents), computed once per
+    process. Any code change yields new cache keys, so stale results are
+    never returned after an edit.
+    """
+    version = _source_versions.get(src_dir)
+    if version is None:
+        digest = hashlib.sha256()
+        for name in sorted(os.listdir(src_dir)):
+            if name.endswith('.py'):
+                digest.update(name.encode() + b'\0')
+                with open(os.path.join(src_dir, name), 'rb') as f:
+                    digest.update(f.read() + b'\0')
+        version = _source_versions[src_dir] = digest.hexdigest()
+    return version
+
+
+def _to_jsonable(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, tuple):
+        return list(value)
+    raise TypeError(f"Cannot hash {type(value).__name__} in cache parameters")
+
+
+def cache_key(params, source=None):
+    """
+    Content address of a run: SHA-256 of its parameters and the source version.
+
+    Args:
+        params: JSON-able dict (scenario, noise spec, interval, alert params,
+                seed, replicates, ...); key order does not matter
+        source: Source version (default source_version())
+    """
+    payload = json.dumps({'params': params, 'source': source or source_version()},
+                         sort_keys=True, default=_to_jsonable)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache of run summaries (and optional traces).
+
+    Entries live at <directory>/<key[:2]>/<key>.json (+ .npz for traces).
+    Writes go to a temporary file that is renamed into place, so concurrent
+    writers in a process pool never expose a partial entry; two workers
+    computing the same key write identical content. Reads refresh the
+    entry's mtime and eviction removes the least recently used entries (the
+    summary and its traces together) once the directory exceeds max_bytes.
+    The cap is enforced on opening the cache and whenever writes push the
+    directory past it, so it holds across runs of any length.
+    """
+    def __init__(self, directory, max_bytes=1 << 30, source=None):
+        """
+        Args:
+            directory: Cache root (created if missing)
+            max_bytes: Size cap enforced by evict()
+            source: Source version mixed into keys (default: hash of src/)
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.source = source or source_version()
+        os.makedirs(directory, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._size = 0  # directory size at the last evict() plus bytes written since
+        self.evict()
+
+    def key(self, params):
+        return cache_key(params, self.source)
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, key[:2], key + suffix)
+
+    def get(self, params):
+        """
+        Cached summary for params, or None (counted as a miss).
+        """
+        path = self._path(self.key(params), '.json')
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return None
+
+        self._touch(path)
+        self.hits += 1
+        return entry['summary']
+
+    def get_traces(self, params):
+        """Cached trace arrays for params as a dict, or None."""
+        path = self._path(self.key(params), '.npz')
+        try:
+            with np.load(path) as data:
+                traces = {name: data[name] for name in data.files}
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        self._touch(path)
+        return traces
+
+    def put(self, params, summary, traces=None):
+        """
+        Store a summary (JSON-able dict) and optionally a dict of arrays.
+        """
+        key = self.key(params)
+        os.makedirs(os.path.join(self.directory, key[:2]), exist_ok=True)
+
+        if traces is not None:
+            self._write(self._path(key, '.npz'), lambda f: np.savez(f, **traces))
+        # Summary last: its presence marks a complete entry
+        entry = json.dumps({'params': params, 'summary': summary}, default=_to_jsonable)
+        self._write(self._path(key, '.json'), lambda f: f.write(entry.encode()))
+
+        self.writes += 1
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def get_or_compute(self, params, compute):
+        """
+        Cached summary for params, computing and storing it on a miss.
+        """
+        summary = self.get(params)
+        if summary is None:
+            summary = compute()
+            self.put(params, summary)
+        return summary
+
+    def _write(self, path, write):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            self._size += os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def _touch(path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # evicted concurrently or read-only cache
+
+    def _entries(self):
+        """
+        (mtime, size, paths) of every stored entry: its summary and traces
+        files together, dated by the more recently used of the two.
+        """
+        entries = {}
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                stem, suffix = os.path.splitext(name)
+                if suffix not in ('.json', '.npz'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                mtime, size, paths = entries.get(stem, (0.0, 0, []))
+                entries[stem] = (max(mtime, stat.st_mtime), size + stat.st_size, paths + [path])
+        return list(entries.values())
+
+    def size_bytes(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits max_bytes.
+        Returns:
+            int: Entries removed
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, paths in entries:
+            if total <= self.max_bytes:
+                break
+            # Summary first: without it the entry already reads as missing
+            for path in sorted(paths, key=lambda path: not path.endswith('.json')):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass  # removed by another process
+            removed += 1
+            total -= size
+        self._size = total
+        self.evictions += removed
+        return removed
+
+    def stats(self):
+        """Hit/miss counters for this process."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'writes': self.writes,
+            'evictions': self.evictions
+        }
@@ -0,0 +1,317 @@
+import csv
+import json
+import os
+
+import numpy as np
+
+FORMAT_NAME = 'smart-dressing-results'
+FORMAT_VERSION = 1
+
+
+class ResultsSink:
+    """
+    Append-only store for sweep result rows, written while the sweep runs.
+
+    A results directory holds header.json (column names, in first-row
+    order) and numbered chunk files, each an .npz with one array per
+    column. Rows are buffered and written chunk_rows at a time; each chunk
+    is renamed into place once complete, so a crash loses at most the
+    buffered rows.
+    """
+    def __init__(self, path, chunk_rows=10000, append=False, metadata=None):
+        """
+        Args:
+            path: Results directory (created if missing)
+            chunk_rows: Rows per chunk file
+            append: Continue an existing results directory after its chunks
+                    (False: existing chunks are removed)
+            metadata: Extra JSON-able header fields (new results only)
+        """
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self._buffer = []
+
+        os.makedirs(path, exist_ok=True)
+        header_path = os.path.join(path, 'header.json')
+        if append and os.path.exists(header_path):
+            self.header = _read_header(path)
+        else:
+            if os.path.exists(header_path):
+                _read_header(path)  # only ever clear a results directory
+                for chunk in chunk_paths(path):
+                    os.remove(chunk)
+            self.header = {'format': FORMAT_NAME, 'version': FORMAT_VERSION, 'columns': None,
+                           **(metadata or {})}
+            self._write_header()
+        self._chunks = chunk_paths(path)
+        self.n_rows = sum(_chunk_rows(chunk) for chunk in self._chunks)
+
+    @property
+    def columns(self):
+        return self.header['columns']
+
+    def append(self, row):
+        """Buffer one result dict (scalar values; None is stored as NaN)."""
+        if self.columns is None:
+            self.header['columns'] = list(row)
+            self._write_header()
+        elif set(row) != set(self.columns):
+            raise ValueError(f"Row columns {sorted(row)} do not match {sorted(self.columns)}")
+
+        self._buffer.append(row)
+        self.n_rows += 1
+        if len(self._buffer) >= self.chunk_rows:
+            self.flush()
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def flush(self):
+        """Write buffered rows as a new chunk."""
+        if not self._buffer:
+            return
+        chunk = rows_to_columns(self._buffer, self.columns)
+        path = os.path.join(self.path, f'chunk-{len(self._chunks):06d}.npz')
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **chunk)
+        os.replace(tmp_path, path)
+
+        self._chunks.append(path)
+        self._buffer = []
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write_header(self):
+        tmp_path = os.path.join(self.path, 'header.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.header, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.path, 'header.json'))
+
+
+def rows_to_columns(rows, columns=None):
+    """
+    Result dicts as {column: array}. None becomes NaN; columns mixing
+    numbers and None are stored as float. None in a non-numeric column
+    raises ValueError (NaN has no string or object form).
+    """
+    columns = list(rows[0]) if columns is None and rows else columns or []
+    chunk = {}
+    for name in columns:
+        values = [row[name] for row in rows]
+        missing = any(value is None for value in values)
+        if missing:
+            values = [np.nan if value is None else value for value in values]
+        array = np.asarray(values)
+        if array.dtype == object:
+            raise ValueError(f"Column '{name}' does not hold scalars of one type")
+        if missing and array.dtype.kind not in 'biuf':
+            raise ValueError(f"Column '{name}' is not numeric and cannot hold None")
+        chunk[name] = array
+    return chunk
+
+
+def chunk_paths(path):
+    """Complete chunk files of a results directory, in write order."""
+    return [os.path.join(path, name) for name in sorted(os.listdir(path))
+            if name.startswith('chunk-') and name.endswith('.npz')]
+
+
+def iter_chunks(source, columns=None):
+    """
+    Yield {column: array} chunks of results.
+
+    Args:
+        source: Results directory, or a list of result dicts (one chunk)
+        columns: Columns to load (default: all)
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        if source:
+            chunk = rows_to_columns(list(source))
+            yield chunk if columns is None else {name: chunk[name] for name in columns}
+        return
+
+    _read_header(source)
+    for path in chunk_paths(source):
+        with np.load(path) as data:
+            yield {name: data[name] for name in (data.files if columns is None else columns)}
+
+
+def to_csv(source, csv_path):
+    """Stream results to a CSV file, one chunk at a time. Returns rows written."""
+    n_rows = 0
+    with open(csv_path, 'w', newline='') as f:
+        writer = None
+        for chunk in iter_chunks(source):
+            if writer is None:
+                writer = csv.writer(f)
+                writer.writerow(list(chunk))
+            writer.writerows(zip(*(column.tolist() for column in chunk.values())))
+            n_rows += len(next(iter(chunk.values())))
+    return n_rows
+
+
+class GroupedAggregator:
+    """
+    Grouped reductions over result chunks in one pass.
+
+    Each chunk is reduced with vectorized per-group operations and merged
+    into running per-group state, so memory scales with the number of
+    groups, not rows. Supported operations: 'count' (rows), 'sum', 'mean',
+    'min', 'max' (NaN ignored), 'nonzero' (rows with a non-zero value),
+    'first' (value in the first row) and 'nunique' (distinct values).
+    """
+    OPERATIONS = ('count', 'sum', 'mean', 'min', 'max', 'nonzero', 'first', 'nunique')
+
+    def __init__(self, by, metrics, where=None):
+        """
+        Args:
+            by: Key column names
+            metrics: {output name: (column, operation)}
+            where: Optional {column: value} equality filter applied first
+        """
+        for name, (_, operation) in metrics.items():
+            if operation not in self.OPERATIONS:
+                raise ValueError(f"Unknown operation '{operation}' for '{name}'")
+        self.by = list(by)
+        self.metrics = dict(metrics)
+        self.where = dict(where or {})
+        self._groups = {}
+
+    def add(self, chunk):
+        """Fold one {column: array} chunk into the group state."""
+        n_rows = len(next(iter(chunk.values()))) if chunk else 0
+        mask = np.ones(n_rows, dtype=bool)
+        for name, value in self.where.items():
+            mask &= chunk[name] == value
+        if not mask.any():
+            return
+
+        # One integer code per distinct key combination in this chunk
+        keys, codes = [], []
+        for name in self.by:
+            values, inverse = np.unique(chunk[name][mask], return_inverse=True)
+            keys.append(values)
+            codes.append(inverse.ravel())
+        shape = tuple(len(values) for values in keys)
+        combined = np.ravel_multi_index(codes, shape) if self.by else np.zeros(mask.sum(), int)
+        groups, first_rows, inverse = np.unique(combined, return_index=True, return_inverse=True)
+        n_groups = len(groups)
+
+        partial = {name: self._reduce(chunk[column][mask], operation, inverse, n_groups,
+                                      first_rows)
+                   for name, (column, operation) in self.metrics.items()}
+
+        for g, code in enumerate(groups):
+            index = np.unravel_index(code, shape) if self.by else ()
+            key = tuple(values[i].item() for values, i in zip(keys, index))
+            state = self._groups.get(key)
+            if state is None:
+                self._groups[key] = {name: value[g] for name, value in partial.items()}
+                continue
+            for name, (_, operation) in self.metrics.items():
+                state[name] = _merge(state[name], partial[name][g], operation)
+
+    @staticmethod
+    def _reduce(values, operation, inverse, n_groups, first_rows):
+        """Per-group partial state for one chunk (list indexed by group)."""
+        if operation == 'first':
+            return [values[i].item() for i in first_rows]
+        if operation == 'nunique':
+            sets = [set() for _ in range(n_groups)]
+            for g, value in zip(inverse.tolist(), values.tolist()):
+                sets[g].add(value)
+            return sets
+        if operation == 'count':
+            return np.bincount(inverse, minlength=n_groups).tolist()
+
+        values = values.astype(float)
+        finite = ~np.isnan(values)
+        if operation == 'nonzero':
+            return np.bincount(inverse, weights=finite & (values != 0), minlength=n_groups).tolist()
+        if operation in ('min', 'max'):
+            out = np.full(n_groups, np.nan)
+            (np.fmin if operation == 'min' else np.fmax).at(out, inverse, values)
+            return out.tolist()
+
+        total = np.bincount(inverse, weights=np.where(finite, values, 0.0), minlength=n_groups)
+        if operation == 'sum':
+            return total.tolist()
+        count = np.bincount(inverse, weights=finite, minlength=n_groups)
+        return list(zip(total.tolist(), count.tolist()))  # mean: (sum, count)
+
+    def result(self):
+        """
+        Returns:
+            dict: {key tuple: {output name: value}} in sorted key order
+        """
+        result = {}
+        for key in sorted(self._groups):
+            state = self._groups[key]
+            row = {}
+            for name, (_, operation) in self.metrics.items():
+                value = state[name]
+                if operation == 'mean':
+                    value = value[0] / value[1] if value[1] else float('nan')
+                elif operation == 'nunique':
+                    value = len(value)
+                row[name] = value
+            result[key] = row
+        return result
+
+
+def aggregate(source, aggregators):
+    """
+    Feed every chunk of source (see iter_chunks) to each aggregator in a
+    single pass.
+
+    Args:
+        source: Results directory or list of result dicts
+        aggregators: {name: GroupedAggregator}
+    Returns:
+        dict: {name: aggregator.result()}
+    """
+    columns = set()
+    for aggregator in aggregators.values():
+        columns.update(aggregator.by, aggregator.where,
+                       (column for column, _ in aggregator.metrics.values()))
+
+    for chunk in iter_chunks(source, sorted(columns)):
+        for aggregator in aggregators.values():
+            aggregator.add(chunk)
+    return {name: aggregator.result() for name, aggregator in aggregators.items()}
+
+
+def _merge(state, value, operation):
+    if operation in ('count', 'sum', 'nonzero'):
+        return state + value
+    if operation == 'min':
+        return float(np.fmin(state, value))
+    if operation == 'max':
+        return float(np.fmax(state, value))
+    if operation == 'mean':
+        return (state[0] + value[0], state[1] + value[1])
+    if operation == 'nunique':
+        return state | value
+    return state  # first
+
+
+def _read_header(path):
+    with open(os.path.join(path, 'header.json')) as f:
+        header = json.load(f)
+    if header.get('format') != FORMAT_NAME:
+        raise ValueError(f"Not a results directory: {path}")
+    return header
+
+
+def _chunk_rows(path):
+    with np.load(path) as data:
+        return len(data[data.files[0]]) if data.files else 0
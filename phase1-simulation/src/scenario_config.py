@@ -0,0 +1,87 @@
+import json
+import os
+
+from alert_logic import AlertLogic
+from monte_carlo import make_simulator
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'configs')
+SENSOR_SPECS_PATH = os.path.join(CONFIG_DIR, 'sensor_specs.json')
+
+SCENARIO_DEFAULTS = {
+    'scenario': 'normal',
+    'simulation_days': 10,
+    'sampling_interval_minutes': 15,
+    'noise_multiplier': 1.0,
+    'seed': None,
+    'alert': {}
+}
+ALERT_KEYS = ('pH_threshold', 'temp_delta_threshold', 'persistence_hours',
+              'violation_threshold', 'baseline_mode')
+SPEC_KEYS = ('noise_sigma', 'drift_sigma_per_hour')
+
+
+def _read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def scenario_path(name_or_path):
+    """Resolve 'infection' / 'scenario_infection' to configs/scenario_infection.json."""
+    if os.path.exists(name_or_path):
+        return name_or_path
+    name = os.path.splitext(os.path.basename(name_or_path))[0]
+    if not name.startswith('scenario_'):
+        name = f'scenario_{name}'
+    return os.path.join(CONFIG_DIR, f'{name}.json')
+
+
+def load_scenario(name_or_path, **overrides):
+    """
+    Load a scenario config (configs/scenario_*.json), filled with defaults.
+
+    Args:
+        name_or_path: Scenario name ('infection') or path to a JSON file
+        overrides: Top-level values replacing the file's (None = keep);
+                   'alert' entries are merged
+    Returns:
+        dict: {'scenario', 'simulation_days', 'sampling_interval_minutes',
+        'noise_multiplier', 'seed', 'alert': AlertLogic threshold kwargs}
+    """
+    config = {**SCENARIO_DEFAULTS, **_read_json(scenario_path(name_or_path))}
+    alert = {**config['alert'], **(overrides.pop('alert', None) or {})}
+    config.update({key: value for key, value in overrides.items() if value is not None})
+    config['alert'] = alert
+
+    unknown = set(config) - set(SCENARIO_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown scenario config key(s): {sorted(unknown)}")
+    unknown = set(alert) - set(ALERT_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown alert parameter(s): {sorted(unknown)}")
+    return config
+
+
+def load_sensor_specs(path=None):
+    """
+    Noise spec per channel (default configs/sensor_specs.json).
+    Returns:
+        dict: {'pH'|'temperature': {'noise_sigma', 'drift_sigma_per_hour', ...}}
+    """
+    specs = _read_json(path or SENSOR_SPECS_PATH)
+    for channel in ('pH', 'temperature'):
+        if channel not in specs or any(key not in specs[channel] for key in SPEC_KEYS):
+            raise ValueError(f"Sensor spec for '{channel}' needs {', '.join(SPEC_KEYS)}")
+    return specs
+
+
+def build_simulator(config, sensor_specs=None):
+    """BatchSimulator for a loaded scenario config (seeded from config['seed'])."""
+    return make_simulator(config['scenario'], config['sampling_interval_minutes'],
+                          config['noise_multiplier'], config['seed'],
+                          sensor_specs or load_sensor_specs())
+
+
+def build_alert_logic(config):
+    """AlertLogic for a loaded scenario config."""
+    return AlertLogic(sampling_interval_minutes=config['sampling_interval_minutes'],
+                      **config['alert'])
@@ -0,0 +1,233 @@
+import numpy as np
+from noise import stream_seed, child_streams
+from sensor_channel import CHANNEL_MODELS
+from scenario_config import load_sensor_specs
+
+# Substream index of the joint multi-channel draw (clear of CHANNEL_INDEX)
+ARRAY_STREAM = 255
+
+
+class SensorArray:
+    """
+    Any number of sensor channels simulated together as one matrix.
+
+    Each channel has its own clean-model function and noise spec (Gaussian
+    noise + random-walk drift, as NoiseGenerator). White noise can be
+    correlated across channels through a covariance matrix; drift stays
+    independent per channel. A call draws every channel at once, so the
+    per-patient cost is one stream setup regardless of the channel count.
+    """
+    def __init__(self, sampling_interval_minutes=15, seed=None):
+        """
+        Args:
+            sampling_interval_minutes: Time between samples
+            seed: Root seed. When set, every patient gets its own substream
+                  (see noise.stream_seed), so results do not depend on
+                  chunking. None draws fresh OS entropy (non-reproducible).
+        """
+        self.sampling_interval_minutes = sampling_interval_minutes
+        self.seed = seed
+        self._rng = np.random.default_rng() if seed is None else None
+
+        self.names = []
+        self.models = []
+        self.drift_sigma_per_hour = np.empty(0)
+        self.noise_covariance = np.empty((0, 0))
+        self._noise_factor = np.empty((0, 0))
+        self._diagonal = True
+
+    @classmethod
+    def from_wound_model(cls, wound_model, channels=('pH', 'temperature', 'moisture', 'strain'),
+                         sensor_specs=None, noise_mult=1.0, **kwargs):
+        """
+        Array reading a WoundModel's clean curves.
+
+        Args:
+            wound_model: Instance of WoundModel
+            channels: Channel names (see sensor_channel.CHANNEL_MODELS)
+            sensor_specs: {channel: {'noise_sigma', 'drift_sigma_per_hour'}}
+                          (default configs/sensor_specs.json)
+            noise_mult: Scales every channel's noise_sigma
+            **kwargs: sampling_interval_minutes, seed
+        """
+        specs = load_sensor_specs() if sensor_specs is None else sensor_specs
+        array = cls(**kwargs)
+        for name in channels:
+            if name not in CHANNEL_MODELS:
+                raise ValueError(f"Unknown sensor: {name}")
+            if name not in specs:
+                raise ValueError(f"No sensor spec for '{name}'")
+            array.add_channel(name, getattr(wound_model, CHANNEL_MODELS[name][0]),
+                              specs[name]['noise_sigma'] * noise_mult,
+                              specs[name]['drift_sigma_per_hour'])
+        return array
+
+    def add_channel(self, name, model, noise_sigma, drift_sigma_per_hour):
+        """
+        Register a channel (uncorrelated with the existing ones).
+
+        Args:
+            name: Channel name (unique)
+            model: Clean value as a function of time (hours), vectorized over arrays
+            noise_sigma: Standard deviation of Gaussian noise per sample
+            drift_sigma_per_hour: Drift accumulation rate (std dev per hour)
+        Returns:
+            int: Column index of the channel
+        """
+        if name in self.names:
+            raise ValueError(f"Channel '{name}' already registered")
+
+        n = len(self.names)
+        covariance = np.zeros((n + 1, n + 1))
+        covariance[:n, :n] = self.noise_covariance
+        covariance[n, n] = noise_sigma ** 2
+
+        self.names.append(name)
+        self.models.append(model)
+        self.drift_sigma_per_hour = np.append(self.drift_sigma_per_hour, drift_sigma_per_hour)
+        self.set_noise_covariance(covariance)
+        return n
+
+    def set_noise_covariance(self, covariance):
+        """
+        Set the cross-channel covariance of the white noise (channels x
+        channels, in add_channel order). The diagonal is each channel's
+        noise_sigma squared.
+        """
+        covariance = np.array(covariance, dtype=float)
+        n = len(self.names)
+        if covariance.shape != (n, n):
+            raise ValueError(f"Covariance must be {n}x{n}, got {covariance.shape}")
+        if not np.allclose(covariance, covariance.T):
+            raise ValueError("Covariance must be symmetric")
+
+        self._diagonal = not np.any(covariance - np.diag(np.diag(covariance)))
+        if self._diagonal:
+            if np.any(np.diag(covariance) < 0):
+                raise ValueError("Noise variances must be non-negative")
+            factor = np.diag(np.sqrt(np.diag(covariance)))
+        else:
+            try:
+                factor = np.linalg.cholesky(covariance)
+            except np.linalg.LinAlgError:
+                raise ValueError("Covariance must be positive definite") from None
+
+        self.noise_covariance = covariance
+        self._noise_factor = factor
+
+    def set_noise_correlation(self, correlation):
+        """Covariance from a correlation matrix and the channels' noise_sigma."""
+        sigma = self.noise_sigma
+        self.set_noise_covariance(np.asarray(correlation, dtype=float) * np.outer(sigma, sigma))
+
+    @property
+    def noise_sigma(self):
+        return np.sqrt(np.diag(self.noise_covariance))
+
+    @property
+    def drift_sigma_per_sample(self):
+        return self.drift_sigma_per_hour * np.sqrt(self.sampling_interval_minutes / 60.0)
+
+    def index(self, name):
+        """Column of a channel in read() output."""
+        return self.names.index(name)
+
+    def time_axis(self, simulation_days):
+        """Sample times (hours) covering simulation_days at the configured rate."""
+        hours = simulation_days * 24
+        return np.arange(0, hours, self.sampling_interval_minutes / 60.0)
+
+    def clean(self, time_points):
+        """
+        Clean ground truth of every channel.
+        Returns:
+            Array of shape (len(time_points), n_channels)
+        """
+        time_points = np.asarray(time_points, dtype=float)
+        clean = np.empty((len(time_points), len(self.names)))
+        for j, model in enumerate(self.models):
+            clean[:, j] = model(time_points)
+        return clean
+
+    def _standard_normals(self, n_patients, n_steps, first_patient):
+        """(noise, drift) standard normals, each (n_patients, n_steps, n_channels)."""
+        shape = (n_patients, n_steps, len(self.names))
+        if self.seed is None:
+            return self._rng.standard_normal(shape), self._rng.standard_normal(shape)
+
+        noise = np.empty(shape)
+        increments = np.empty(shape)
+        for row in range(n_patients):
+            noise_rng, drift_rng = child_streams(
+                stream_seed(self.seed, first_patient + row, ARRAY_STREAM))
+            noise_rng.standard_normal(out=noise[row])
+            drift_rng.standard_normal(out=increments[row])
+        return noise, increments
+
+    def read(self, time_points, n_patients=1, first_patient=0):
+        """
+        Noisy readings of every channel for n_patients independent traces.
+
+        Args:
+            time_points: 1-D array of times since wound creation (hours)
+            n_patients: Number of independent traces
+            first_patient: Global index of the first patient (seeded mode)
+        Returns:
+            Array of shape (n_patients, len(time_points), n_channels)
+        """
+        return self.add_noise(self.clean(time_points), n_patients, first_patient)
+
+    def add_noise(self, clean, n_patients=None, first_patient=0):
+        """
+        Noisy readings around given clean values, e.g. per-patient curves.
+
+        Args:
+            clean: (n_steps, n_channels) shared by every patient, or
+                   (n_patients, n_steps, n_channels) per patient
+            n_patients: Number of traces (default: clean's leading axis, else 1)
+            first_patient: Global index of the first patient (seeded mode)
+        Returns:
+            Array of shape (n_patients, n_steps, n_channels)
+        """
+        clean = np.asarray(clean, dtype=float)
+        if n_patients is None:
+            n_patients = len(clean) if clean.ndim == 3 else 1
+        noise, increments = self._standard_normals(n_patients, clean.shape[-2], first_patient)
+
+        if self._diagonal:
+            noise *= np.diag(self._noise_factor)
+        else:
+            noise = noise @ self._noise_factor.T
+
+        increments *= self.drift_sigma_per_sample
+        drift = np.cumsum(increments, axis=1)
+
+        # Same summation order as SensorChannel.read (clean + noise + drift)
+        noise += clean
+        noise += drift
+        return noise
+
+    def run(self, n_patients, simulation_days, first_patient=0):
+        """
+        Simulate n_patients traces over simulation_days.
+        Returns:
+            dict: {
+            'time_hours': (n_steps,) array,
+            'channels': channel names (last axis order),
+            'clean': (n_steps, n_channels) array,
+            'readings': (n_patients, n_steps, n_channels) array
+        }
+        """
+        time_points = self.time_axis(simulation_days)
+        clean = self.clean(time_points)
+        return {
+            'time_hours': time_points,
+            'channels': list(self.names),
+            'clean': clean,
+            'readings': self.add_noise(clean, n_patients, first_patient)
+        }
+
+    def iter_chunks(self, n_patients, simulation_days, chunk_size=1000):
+        """Same as run(), but yields results in patient chunks to bound memory."""
+        for start in range(0, n_patients, chunk_size):
+            yield self.run(min(chunk_size, n_patients - start), simulation_days, start)
@@ -1,6 +1,19 @@
+import numpy as np
 from wound_model import WoundModel
 from noise import NoiseGenerator
 
+# Stable channel indices used to derive per-channel noise substreams
+CHANNEL_INDEX = {'pH': 0, 'temperature': 1, 'moisture': 2, 'strain': 3}
+
+# WoundModel clean-model method per channel, and its position in
+# WoundModel.trajectory() output (None: not part of the cached trajectory)
+CHANNEL_MODELS = {
+    'pH': ('get_pH', 0),
+    'temperature': ('get_temperature', 1),
+    'moisture': ('get_moisture', None),
+    'strain': ('get_strain', None)
+}
+
 class SensorChannel:
     """
     Combines clean physiological model with realistic sensor imperfections.
@@ -11,30 +24,58 @@ class SensorChannel:
         Args:
             wound_model: Instance of WoundModel
             noise_generator: Instance of NoiseGenerator
-            sensor_name: 'pH' or 'temperature' (for extraction)
+            sensor_name: 'pH', 'temperature', 'moisture' or 'strain' (for extraction)
         """
+        if sensor_name not in CHANNEL_MODELS:
+            raise ValueError(f"Unknown sensor: {sensor_name}")
+
         self.wound_model = wound_model
         self.noise_gen = noise_generator
         self.sensor_name = sensor_name
 
+        # Resolve the clean model once instead of dispatching on the name per read
+        method, self._trajectory_index = CHANNEL_MODELS[sensor_name]
+        self._model = getattr(wound_model, method)
+
+    def clean(self, time_points):
+        """
+        Clean ground truth for this channel over a time axis.
+
+        Args:
+            time_points: 1-D array of times since wound creation (hours)
+        Returns:
+            1-D array of clean values (pH and temperature: read-only, cached per grid)
+        """
+        if self._trajectory_index is None:
+            return self._model(np.asarray(time_points, dtype=float))
+        return self.wound_model.trajectory(time_points)[self._trajectory_index]
+
+    def read_batch(self, time_points, n_patients=1):
+        """
+        Simulate readings for many patients over a whole time axis.
+
+        Args:
+            time_points: 1-D array of times since wound creation (hours)
+            n_patients: Number of independent noisy traces
+        Returns:
+            Array of shape (n_patients, len(time_points))
+        """
+        clean_values = self.clean(time_points)
+        noise, drift = self.noise_gen.sample_batch(len(clean_values), n_patients)
+
+        return clean_values + noise + drift
+
     def read(self, t_hours):
         """
-        Simulate a sensorelf.reading at time t
+        Simulate a sensor reading at time t
 
         Args:
             t_hours: Time since wound creation
         Returns:
             Noisy sensor value
         """
-        # Get clean ground truth
-        if self.sensor_name == 'pH':
-            clean_value = self.wound_model.get_pH(t_hours)
-        elif self.sensor_name == 'temperature':
-            clean_value = self.wound_model.get_temperature(t_hours)
-        else:
-            raise ValueError(f"Uknown sensor: {self.sensor_name}")
+        # Single timestamps skip the trajectory cache (one entry per t would churn it)
+        clean_value = self._model(t_hours)
 
         # Add noise + drift
-        noisy_value = self.noise_gen.add_noise_and_drift(clean_value)
-
-        return noisy_value
+        return self.noise_gen.add_noise_and_drift(clean_value)
@@ -0,0 +1,192 @@
+import heapq
+import math
+
+import numpy as np
+
+
+class RunningStats:
+    """
+    Count, mean and variance in O(1) memory (Welford / Chan et al. merge).
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, values):
+        """Fold a scalar or array of values into the running statistics."""
+        values = np.atleast_1d(np.asarray(values, dtype=float))
+        if not len(values):
+            return
+
+        other = RunningStats()
+        other.count = len(values)
+        other.mean = float(values.mean())
+        other._m2 = float(((values - other.mean) ** 2).sum())
+        self.merge(other)
+
+    def merge(self, other):
+        """Combine with another RunningStats (e.g. from a parallel worker)."""
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.count = total
+
+    @property
+    def variance(self):
+        """Sample variance (NaN for fewer than two values)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else float('nan')
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance) if self.count > 1 else float('nan')
+
+
+class P2Quantile:
+    """
+    Streaming quantile estimate with five markers (Jain & Chlamtac P^2).
+    Constant memory regardless of how many values are added.
+    """
+    def __init__(self, q):
+        """
+        Args:
+            q: Quantile in (0, 1), e.g. 0.5 for the median
+        """
+        self.q = q
+        self.count = 0
+        self._heights = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self._increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    def add(self, value):
+        """Add one observation."""
+        value = float(value)
+        self.count += 1
+
+        if self.count <= 5:
+            self._heights.append(value)
+            self._heights.sort()
+            return
+
+        h = self._heights
+        n = self._positions
+
+        # Find the cell containing the value, extending the extremes if needed
+        if value < h[0]:
+            h[0] = value
+            k = 0
+        elif value >= h[4]:
+            h[4] = value
+            k = 3
+        else:
+            k = 0
+            while value >= h[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Adjust the three middle markers towards their desired positions
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not h[i - 1] < candidate < h[i + 1]:
+                    candidate = h[i] + step * (h[i + step] - h[i]) / (n[i + step] - n[i])
+                h[i] = candidate
+                n[i] += step
+
+    def state(self):
+        """(count, heights, positions, desired) for checkpointing."""
+        return self.count, list(self._heights), list(self._positions), list(self._desired)
+
+    @classmethod
+    def from_state(cls, q, count, heights, positions, desired):
+        """Rebuild an estimator from state() output."""
+        sketch = cls(q)
+        sketch.count = int(count)
+        sketch._heights = [float(h) for h in heights[:min(sketch.count, 5)]]
+        if sketch.count > 5:
+            sketch._positions = [int(n) for n in positions]
+            sketch._desired = [float(d) for d in desired]
+        return sketch
+
+    def _parabolic(self, i, step):
+        h = self._heights
+        n = self._positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1]))
+
+    def value(self):
+        """Current quantile estimate (exact for five or fewer values, NaN if empty)."""
+        if self.count == 0:
+            return float('nan')
+        if self.count <= 5:
+            return float(np.quantile(self._heights, self.q))
+        return self._heights[2]
+
+
+class RunningMedian:
+    """
+    Exact running median with two heaps (max-heap of the lower half,
+    min-heap of the upper half). O(log n) per value, O(1) to read the
+    median; same result as np.median over the values seen so far.
+    """
+    def __init__(self):
+        self.count = 0
+        self._low = []   # negated, so heapq's min-heap acts as a max-heap
+        self._high = []
+
+    def add(self, value):
+        """Add one observation."""
+        value = float(value)
+        self.count += 1
+
+        if self._low and value > -self._low[0]:
+            heapq.heappush(self._high, value)
+        else:
+            heapq.heappush(self._low, -value)
+
+        # Rebalance so len(low) is len(high) or len(high) + 1
+        if len(self._low) > len(self._high) + 1:
+            heapq.heappush(self._high, -heapq.heappop(self._low))
+        elif len(self._high) > len(self._low):
+            heapq.heappush(self._low, -heapq.heappop(self._high))
+
+    def values(self):
+        """Values seen so far (unordered), e.g. for checkpointing."""
+        return [-v for v in self._low] + self._high
+
+    def value(self):
+        """Current median (NaN if empty)."""
+        if self.count == 0:
+            return float('nan')
+        if self.count % 2:
+            return -self._low[0]
+        return (-self._low[0] + self._high[0]) / 2
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """
+    Wilson score confidence interval for a binomial proportion.
+    Well-behaved at 0 successes, which is the usual false-positive case.
+
+    Returns:
+        (low, high): Interval bounds (NaN, NaN) for zero trials
+    """
+    if trials == 0:
+        return float('nan'), float('nan')
+
+    p = successes / trials
+    denom = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denom
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
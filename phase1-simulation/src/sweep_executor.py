@@ -0,0 +1,165 @@
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def task_seed(root_seed, replicate):
+    """
+    Deterministic integer seed for one replicate.
+
+    Seeds depend only on (root_seed, replicate), so every grid point sees the
+    same noise realizations per replicate (common random numbers) and seeds
+    don't change when axes are added to or removed from the grid.
+    """
+    return int(np.random.SeedSequence(root_seed, spawn_key=(replicate,)).generate_state(1)[0])
+
+
+def expand_grid(axes, n_seeds=1, root_seed=0):
+    """
+    Full-factorial expansion of parameter axes x replicates.
+
+    Args:
+        axes: dict of parameter name -> list of values (order is preserved)
+        n_seeds: Replicates per grid point
+        root_seed: Root of the per-replicate seeds
+    Returns:
+        list of task dicts: parameters plus 'replicate', 'seed' and a stable 'task_id'
+        (named parameters, so results files from differently shaped grids don't collide)
+    """
+    names = list(axes)
+    tasks = []
+    for values in product(*(axes[name] for name in names)):
+        for replicate in range(n_seeds):
+            task = dict(zip(names, values))
+            task['replicate'] = replicate
+            task['seed'] = task_seed(root_seed, replicate)
+            task['task_id'] = json.dumps({'params': dict(zip(names, values)),
+                                          'replicate': replicate,
+                                          'root_seed': root_seed}, sort_keys=True)
+            tasks.append(task)
+    return tasks
+
+
+def _to_jsonable(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _run_chunk(task_fn, chunk):
+    """Worker entry point: run a batch of tasks, return (task, result) pairs."""
+    return [(task, task_fn(task)) for task in chunk]
+
+
+class SweepExecutor:
+    """
+    Distributes sweep tasks over a process pool in chunked batches.
+    Results are appended to a JSON-lines file as chunks finish, so an
+    interrupted sweep resumes where it stopped.
+    """
+    def __init__(self, task_fn, workers=None, chunk_size=16, results_path=None,
+                 progress_interval_s=5.0):
+        """
+        Args:
+            task_fn: Picklable module-level function task_dict -> result dict
+            workers: Worker processes (None = all cores, 1 = run inline)
+            chunk_size: Tasks per submitted batch (amortizes IPC overhead)
+            results_path: JSON-lines file for resumable partial results
+            progress_interval_s: Minimum seconds between progress log lines
+        """
+        self.task_fn = task_fn
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.results_path = results_path
+        self.progress_interval_s = progress_interval_s
+
+    def load_completed(self):
+        """Rows already recorded in results_path (empty if none)."""
+        if not self.results_path or not os.path.exists(self.results_path):
+            return []
+
+        rows = []
+        with open(self.results_path, 'rb') as f:
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break  # truncated last line from an interrupted run
+        return rows
+
+    def _discard_partial_tail(self):
+        """Cut an incomplete trailing line so appended rows start on a fresh line."""
+        with open(self.results_path, 'rb+') as f:
+            good = 0
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                good += len(line)
+            f.truncate(good)
+
+    def run(self, tasks):
+        """
+        Run all tasks not already present in results_path.
+
+        Returns:
+            list of dicts (task parameters merged with results) for `tasks`,
+            including rows completed by earlier runs; other rows in
+            results_path are left in the file but not returned
+        """
+        task_ids = {task['task_id'] for task in tasks}
+        rows = [row for row in self.load_completed() if row.get('task_id') in task_ids]
+        done_ids = {row['task_id'] for row in rows}
+        pending = [task for task in tasks if task['task_id'] not in done_ids]
+
+        total = len(tasks)
+        completed = total - len(pending)
+        if completed:
+            logger.info("Resuming sweep: %d/%d tasks already complete", completed, total)
+
+        chunks = [pending[i:i + self.chunk_size]
+                  for i in range(0, len(pending), self.chunk_size)]
+
+        sink = None
+        if self.results_path:
+            if os.path.exists(self.results_path):
+                self._discard_partial_tail()
+            sink = open(self.results_path, 'a')
+        last_report = time.monotonic()
+        try:
+            for pairs in self._execute(chunks):
+                for task, result in pairs:
+                    row = {**task, **{k: _to_jsonable(v) for k, v in result.items()}}
+                    rows.append(row)
+                    if sink:
+                        sink.write(json.dumps(row) + '\n')
+                if sink:
+                    sink.flush()
+
+                completed += len(pairs)
+                now = time.monotonic()
+                if now - last_report >= self.progress_interval_s or completed == total:
+                    logger.info("Sweep progress: %d/%d tasks", completed, total)
+                    last_report = now
+        finally:
+            if sink:
+                sink.close()
+
+        return rows
+
+    def _execute(self, chunks):
+        if self.workers == 1:
+            for chunk in chunks:
+                yield _run_chunk(self.task_fn, chunk)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(_run_chunk, self.task_fn, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                yield future.result()
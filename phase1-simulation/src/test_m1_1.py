@@ -9,11 +9,8 @@ normal = WoundModel(scenario='normal')
 infection = WoundModel(scenario='infection')
 
 # Generate curves
-pH_normal = [normal.get_pH(t) for t in t_hours]
-T_normal = [normal.get_temperature(t) for t in t_hours]
-
-pH_inf = [infection.get_pH(t) for t in t_hours]
-T_inf = [infection.get_temperature(t) for t in t_hours]
+pH_normal, T_normal = normal.trajectory(t_hours)
+pH_inf, T_inf = infection.trajectory(t_hours)
 
 # Plot
 plt.figure(figsize=(12, 5))
@@ -0,0 +1,208 @@
+import numpy as np
+from alert_logic import AlertLogic, BASELINE_ESTIMATORS, min_alert_count
+
+
+def evaluate_traces(pH, temp, t_hours, alert_logic=None):
+    """
+    Offline, loop-free equivalent of stepping AlertLogic.update over whole traces.
+
+    Args:
+        pH: pH readings, shape (n_steps,) or (n_traces, n_steps)
+        temp: Temperature readings, same shape as pH
+        t_hours: Sample times (hours), shape (n_steps,), shared by all traces
+        alert_logic: AlertLogic whose parameters are used (state is not touched).
+                     Defaults to AlertLogic().
+    Returns:
+        dict: {
+        'baseline': locked temperature baseline (NaN if never locked),
+        'lock_index': index of the sample that locks the baseline (-1 if none),
+        'violations': per-sample violation mask (False while calibrating),
+        'window_counts': violations in the rolling window after each sample,
+        'alert_states': alert state returned after each sample,
+        'first_alert_index': index of the first alert (-1 if none),
+        'first_alert_time': time of the first alert (NaN if none),
+        'peak_violation_rate': max of get_status()['violation_rate'] over the run
+    }
+        Per-trace entries have a leading n_traces axis for 2-D input.
+    """
+    if alert_logic is None:
+        alert_logic = AlertLogic()
+
+    pH, temp, t_hours, single = as_batch(pH, temp, t_hours)
+    n_steps = pH.shape[1]
+    window_size = alert_logic.window_size
+
+    baseline, lock_index = _lock_baseline(temp, t_hours, alert_logic)
+
+    # Per-sample violation mask (only samples from the lock onwards count)
+    violations = np.zeros(pH.shape, dtype=bool)
+    if lock_index < n_steps:
+        post_pH = pH[:, lock_index:] > alert_logic.pH_threshold
+        post_temp = (temp[:, lock_index:] - baseline[:, None]) > alert_logic.temp_delta_threshold
+        violations[:, lock_index:] = post_pH & post_temp
+
+    window_counts = rolling_counts(violations, window_size)
+
+    # Alert only once the window has been filled with post-lock samples
+    full = window_full(n_steps, lock_index, window_size)
+    alert_states = full & (window_counts >= min_alert_count(alert_logic.violation_threshold,
+                                                              window_size))
+
+    first_alert_index, first_alert_time = first_alert(alert_states, t_hours)
+    peak_violation_rate = _peak_rate(window_counts, window_size)
+
+    result = {
+        'baseline': baseline,
+        'lock_index': lock_index if lock_index < n_steps else -1,
+        'violations': violations,
+        'window_counts': window_counts,
+        'alert_states': alert_states,
+        'first_alert_index': first_alert_index,
+        'first_alert_time': first_alert_time,
+        'peak_violation_rate': peak_violation_rate
+    }
+
+    if single:
+        result = {key: (value[0] if isinstance(value, np.ndarray) else value)
+                  for key, value in result.items()}
+
+    return result
+
+
+def evaluate_threshold_grid(pH, temp, t_hours, pH_thresholds, dt_thresholds,
+                            violation_thresholds, alert_logic=None):
+    """
+    Evaluate every (pH_threshold, temp_delta_threshold, violation_threshold)
+    combination against the same traces in one vectorized pass.
+
+    The baseline does not depend on the thresholds, and the violation
+    threshold only enters the final comparison, so window counts are computed
+    once per (pH, dT) pair and reused for every violation threshold.
+
+    Working memory is about 18 bytes per (n_pH x n_dT x n_traces x n_steps)
+    element (violation mask, int64 window counts and their cumulative sum,
+    one alert mask at a time), so callers bound it through the number of
+    traces per call (run_monte_carlo_grid's batch_size).
+
+    Args:
+        pH, temp, t_hours: As for evaluate_traces (1-D or 2-D traces)
+        pH_thresholds, dt_thresholds, violation_thresholds: Values to test
+        alert_logic: AlertLogic supplying the window size and baseline period
+    Returns:
+        dict: {
+        'first_alert_index', 'first_alert_time', 'peak_violation_rate':
+            arrays of shape (n_pH, n_dT, n_violation, n_traces)
+    }
+    """
+    if alert_logic is None:
+        alert_logic = AlertLogic()
+
+    pH, temp, t_hours, _ = as_batch(pH, temp, t_hours)
+    n_traces, n_steps = pH.shape
+    window_size = alert_logic.window_size
+    pH_thresholds = np.asarray(pH_thresholds, dtype=float)
+    dt_thresholds = np.asarray(dt_thresholds, dtype=float)
+
+    baseline, lock_index = _lock_baseline(temp, t_hours, alert_logic)
+
+    # (n_pH, n_dT, n_traces, n_steps) violation masks from the lock onwards
+    violations = np.zeros((len(pH_thresholds), len(dt_thresholds), n_traces, n_steps), dtype=bool)
+    if lock_index < n_steps:
+        post_pH = pH[None, :, lock_index:] > pH_thresholds[:, None, None]
+        delta = temp[:, lock_index:] - baseline[:, None]
+        post_temp = delta[None] > dt_thresholds[:, None, None]
+        violations[..., lock_index:] = post_pH[:, None] & post_temp[None]
+
+    window_counts = rolling_counts(violations, window_size)
+    full = window_full(n_steps, lock_index, window_size)
+
+    shape = (len(pH_thresholds), len(dt_thresholds), len(violation_thresholds), n_traces)
+    first_alert_index = np.empty(shape, dtype=np.int64)
+    first_alert_time = np.empty(shape)
+    for k, threshold in enumerate(violation_thresholds):
+        alert_states = full & (window_counts >= min_alert_count(threshold, window_size))
+        first_alert_index[:, :, k], first_alert_time[:, :, k] = first_alert(alert_states, t_hours)
+
+    peak = _peak_rate(window_counts, window_size)
+    peak_violation_rate = np.broadcast_to(peak[:, :, None, :], shape)
+
+    return {
+        'first_alert_index': first_alert_index,
+        'first_alert_time': first_alert_time,
+        'peak_violation_rate': peak_violation_rate
+    }
+
+
+def evaluate_csv(path, alert_logic=None):
+    """
+    Evaluate a recorded trace in the Phase 1 export layout (time_hours,pH,temp).
+
+    Args:
+        path: CSV file, e.g. data/validation/m1_2_infection.csv
+        alert_logic: AlertLogic providing the parameters
+    Returns:
+        dict: Same as evaluate_traces() for a single trace
+    """
+    data = np.loadtxt(path, delimiter=',', skiprows=1, ndmin=2)
+    return evaluate_traces(data[:, 1], data[:, 2], data[:, 0], alert_logic)
+
+
+def as_batch(pH, temp, t_hours):
+    """
+    Readings as float (n_traces, n_steps) arrays.
+    Returns:
+        (pH, temp, t_hours, single): single is True for 1-D input
+    """
+    pH = np.asarray(pH, dtype=float)
+    temp = np.asarray(temp, dtype=float)
+    t_hours = np.asarray(t_hours, dtype=float)
+    return np.atleast_2d(pH), np.atleast_2d(temp), t_hours, pH.ndim == 1
+
+
+def _lock_baseline(temp, t_hours, alert_logic):
+    """Median of every sample up to and including the first t >= 24h."""
+    locking = np.flatnonzero(t_hours >= alert_logic.baseline_window_hours)
+    if not len(locking):
+        return np.full(temp.shape[0], np.nan), temp.shape[1]
+
+    lock_index = locking[0]
+    calibration = temp[:, :lock_index + 1]
+    if alert_logic.baseline_mode == 'exact':
+        return np.median(calibration, axis=1), lock_index
+
+    # Approximate estimators are sequential; replay them per trace
+    baseline = np.empty(len(calibration))
+    for i, samples in enumerate(calibration.tolist()):
+        estimator = BASELINE_ESTIMATORS[alert_logic.baseline_mode]()
+        for value in samples:
+            estimator.add(value)
+        baseline[i] = estimator.value()
+    return baseline, lock_index
+
+
+def rolling_counts(violations, window_size):
+    """Sliding-window violation counts along the last axis via cumulative sums."""
+    n_steps = violations.shape[-1]
+    csum = np.zeros(violations.shape[:-1] + (n_steps + 1,), dtype=np.int64)
+    np.cumsum(violations, axis=-1, out=csum[..., 1:])
+    end = np.arange(1, n_steps + 1)
+    return csum[..., end] - csum[..., np.maximum(end - window_size, 0)]
+
+
+def window_full(n_steps, lock_index, window_size):
+    """True where the window holds window_size post-lock samples."""
+    return (np.arange(1, n_steps + 1) - lock_index) >= window_size
+
+
+def first_alert(alert_states, t_hours):
+    """(index, time) of the first True along the last axis; -1 and NaN if none."""
+    any_alert = alert_states.any(axis=-1)
+    first_alert_index = np.where(any_alert, alert_states.argmax(axis=-1), -1)
+    first_alert_time = np.where(any_alert, t_hours[np.maximum(first_alert_index, 0)], np.nan)
+    return first_alert_index, first_alert_time
+
+
+def _peak_rate(window_counts, window_size):
+    if not window_size:
+        return np.zeros(window_counts.shape[:-1])
+    return window_counts.max(axis=-1, initial=0) / window_size
@@ -0,0 +1,219 @@
+import json
+import os
+from itertools import islice
+
+import numpy as np
+
+FORMAT_NAME = 'smart-dressing-trace'
+FORMAT_VERSION = 1
+CSV_COLUMNS = ('time_hours', 'pH', 'temp')
+
+# Fixed offsets for int16 quantized columns (physiological mid-range)
+QUANTIZE_OFFSETS = {'pH': 7.0, 'temp': 37.0}
+
+
+class TraceWriter:
+    """
+    Incremental writer for the columnar trace format.
+
+    A trace is a directory with header.json and one raw little-endian file
+    per column. Value columns hold (n_samples, n_traces) row-major, so each
+    append() extends every file in place and a crash loses at most the
+    chunk being written. Readers derive n_samples from the file sizes.
+    """
+    def __init__(self, path, n_traces=1, scenario=None, sampling_interval_minutes=None,
+                 seed=None, dtype='float32', quantize=None, metadata=None):
+        """
+        Args:
+            path: Trace directory (created; existing column files are replaced)
+            n_traces: Traces sharing the time axis
+            scenario, sampling_interval_minutes, seed: Recorded in the header
+            dtype: Storage dtype for unquantized columns ('float32' or 'float64')
+            quantize: dict column -> step, e.g. {'pH': 1e-3, 'temp': 1e-3}, stores
+                      int16 counts around QUANTIZE_OFFSETS (values must fit the range)
+            metadata: Extra JSON-able header fields
+        """
+        quantize = quantize or {}
+        unknown = set(quantize) - set(QUANTIZE_OFFSETS)
+        if unknown:
+            raise ValueError(f"Cannot quantize column(s): {sorted(unknown)}")
+
+        self.path = path
+        self.n_traces = n_traces
+        self.columns = {'time_hours': {'dtype': np.dtype(dtype).name}}
+        for name in ('pH', 'temp'):
+            if name in quantize:
+                self.columns[name] = {'dtype': 'int16', 'scale': quantize[name],
+                                      'offset': QUANTIZE_OFFSETS[name]}
+            else:
+                self.columns[name] = {'dtype': np.dtype(dtype).name}
+
+        header = {
+            'format': FORMAT_NAME,
+            'version': FORMAT_VERSION,
+            'scenario': scenario,
+            'sampling_interval_minutes': sampling_interval_minutes,
+            'seed': seed,
+            'n_traces': n_traces,
+            'columns': self.columns,
+            **(metadata or {})
+        }
+
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, 'header.json'), 'w') as f:
+            json.dump(header, f, indent=2)
+
+        self._files = {name: open(os.path.join(path, f'{name}.bin'), 'wb')
+                       for name in self.columns}
+        self.n_samples = 0
+
+    def append(self, time_hours, pH, temp):
+        """
+        Append a block of samples.
+
+        Args:
+            time_hours: (k,) sample times
+            pH, temp: (k,) for a single trace or (n_traces, k)
+        """
+        time_hours = np.asarray(time_hours)
+        k = len(time_hours)
+        values = {'time_hours': time_hours}
+        for name, column in (('pH', pH), ('temp', temp)):
+            column = np.asarray(column, dtype=float).reshape(self.n_traces, k)
+            values[name] = column.T  # (k, n_traces) row-major on disk
+
+        for name, spec in self.columns.items():
+            _encode(values[name], spec).tofile(self._files[name])
+
+        self.n_samples += k
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Trace:
+    """
+    Read-only view of a trace directory. Float columns are memory-mapped
+    (zero-copy); quantized columns are decoded on access.
+    """
+    def __init__(self, path):
+        with open(os.path.join(path, 'header.json')) as f:
+            self.header = json.load(f)
+        if self.header.get('format') != FORMAT_NAME:
+            raise ValueError(f"Not a trace directory: {path}")
+
+        self.path = path
+        self.n_traces = self.header['n_traces']
+        self.columns = self.header['columns']
+        self.n_samples = self._complete_samples()
+
+    def _complete_samples(self):
+        """Samples present in every column (ignores a partially written tail)."""
+        counts = []
+        for name, spec in self.columns.items():
+            width = 1 if name == 'time_hours' else self.n_traces
+            size = os.path.getsize(os.path.join(self.path, f'{name}.bin'))
+            counts.append(size // (np.dtype(spec['dtype']).itemsize * width))
+        return min(counts)
+
+    def raw(self, name):
+        """Stored column as a memmap: (n_samples,) or (n_samples, n_traces)."""
+        spec = self.columns[name]
+        shape = (self.n_samples,) if name == 'time_hours' else (self.n_samples, self.n_traces)
+        if not self.n_samples:
+            return np.zeros(shape, dtype=spec['dtype'])
+        return np.memmap(os.path.join(self.path, f'{name}.bin'),
+                         dtype=np.dtype(spec['dtype']).newbyteorder('<'), mode='r', shape=shape)
+
+    def column(self, name, start=0, stop=None):
+        """Decoded values for samples [start, stop): (k,) or (k, n_traces)."""
+        raw = self.raw(name)[start:stop]
+        spec = self.columns[name]
+        if 'scale' not in spec:
+            return raw
+        return (spec['offset'] + raw * spec['scale']).astype(np.float32)
+
+    def traces(self, start=0, stop=None):
+        """
+        Arrays in the evaluate_traces layout.
+        Returns:
+            dict: 'time_hours' (k,), 'pH'/'temp' (n_traces, k), or (k,) for a single trace
+        """
+        result = {'time_hours': self.column('time_hours', start, stop)}
+        for name in ('pH', 'temp'):
+            values = self.column(name, start, stop).T
+            result[name] = values[0] if self.n_traces == 1 else values
+        return result
+
+
+def iter_csv_chunks(path, chunk_rows=65536):
+    """
+    Yield (time_hours, pH, temp) arrays from a Phase 1 CSV, chunk_rows at a time.
+    Memory is bounded by the chunk size regardless of file length.
+    """
+    with open(path) as f:
+        f.readline()  # header
+        while True:
+            lines = list(islice(f, chunk_rows))
+            if not lines:
+                return
+            data = np.loadtxt(lines, delimiter=',', ndmin=2)
+            if len(data):
+                yield data[:, 0], data[:, 1], data[:, 2]
+
+
+def csv_to_trace(csv_path, trace_path, chunk_rows=65536, **writer_kwargs):
+    """
+    Convert a time_hours,pH,temp CSV (e.g. data/validation/m1_2_infection.csv)
+    into a single-trace columnar trace.
+
+    Returns:
+        int: Samples written
+    """
+    with TraceWriter(trace_path, n_traces=1, **writer_kwargs) as writer:
+        for t, pH, temp in iter_csv_chunks(csv_path, chunk_rows):
+            writer.append(t, pH, temp)
+        return writer.n_samples
+
+
+def trace_to_csv(trace_path, csv_path, trace_index=0, chunk_rows=65536):
+    """
+    Export one trace to the Phase 1 CSV layout read by the firmware test
+    harness (time_hours,pH,temp). Values are written with enough digits to
+    round-trip the stored precision.
+    """
+    trace = Trace(trace_path)
+    digits = {name: '%.17g' if spec['dtype'] == 'float64' else '%.9g'
+              for name, spec in trace.columns.items()}
+
+    with open(csv_path, 'w', newline='') as f:
+        f.write(','.join(CSV_COLUMNS) + '\n')
+        for start in range(0, trace.n_samples, chunk_rows):
+            stop = min(start + chunk_rows, trace.n_samples)
+            t = trace.column('time_hours', start, stop)
+            pH = trace.column('pH', start, stop)[:, trace_index]
+            temp = trace.column('temp', start, stop)[:, trace_index]
+            block = np.column_stack((t, pH, temp)).astype(float)
+            np.savetxt(f, block, delimiter=',',
+                       fmt=[digits['time_hours'], digits['pH'], digits['temp']])
+
+
+def _encode(values, spec):
+    """Column values as a contiguous little-endian array in the stored dtype."""
+    dtype = np.dtype(spec['dtype']).newbyteorder('<')
+    if 'scale' not in spec:
+        return np.ascontiguousarray(values, dtype=dtype)
+
+    counts = np.rint((values - spec['offset']) / spec['scale'])
+    info = np.iinfo(np.int16)
+    if counts.size and (counts.min() < info.min or counts.max() > info.max):
+        raise ValueError(f"Values outside the quantized range of "
+                         f"{spec['offset']} +/- {info.max * spec['scale']:g}")
+    return np.ascontiguousarray(counts, dtype=dtype)
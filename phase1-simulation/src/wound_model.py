@@ -1,28 +1,62 @@
 import numpy as np
 
 class WoundModel:
-    def __init__(self, scenario='normal'):
+    # Clean trajectories keyed by (model parameters, time grid); shared by all
+    # instances because the ground truth is identical across Monte Carlo replicates
+    _trajectory_cache = {}
+    _trajectory_cache_size = 64
+
+    # Attributes that can be overridden per model (see __init__)
+    PARAMETERS = ('PH_base', 'T_base', 'alpha', 'beta', 'M_base', 'gamma', 'S_base', 'delta',
+                  'onset_hours', 'tau_hours', 'ISI_onset', 'ISI_rise', 'ISI_normal')
+
+    def __init__(self, scenario='normal', **parameters):
+        """
+        Args:
+            scenario: 'normal' (healing), 'infection' or anything else (ISI = 0)
+            **parameters: Overrides for PARAMETERS. Values may be arrays of
+                          shape (n_patients, 1) to evaluate a batch of patients
+                          over a time grid at once (see population.py).
+        """
         self.scenario = scenario
         self.PH_base = 6.0
         self.T_base = 36.8
         self.alpha = 2.0  # ph sensitivity to ISI
         self.beta = 1.65  # Temp sensitivity to ISI
+        self.M_base = 40.0  # wound-bed relative humidity (%)
+        self.gamma = 45.0  # moisture sensitivity to ISI (exudate)
+        self.S_base = 0.5  # dressing strain (%)
+        self.delta = 3.0  # strain sensitivity to ISI (swelling)
+        self.onset_hours = 48.0  # infection onset (Day 3)
+        self.tau_hours = 36.0  # time constant of the ISI rise after onset
+        self.ISI_onset = 0.2  # ISI step at onset
+        self.ISI_rise = 0.6  # further rise towards saturation (ISI_onset + ISI_rise)
+        self.ISI_normal = 0.1  # constant ISI of a healing wound
+
+        unknown = set(parameters) - set(self.PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown wound model parameter(s): {sorted(unknown)}")
+        for name, value in parameters.items():
+            setattr(self, name, value)
 
     def compute_ISI(self, t_hours):
         """
-        t_hours: time since wound ceareation (0-168 for 7 days)
-        Returns: ISI value [0,1]
+        t_hours: time since wound ceareation (0-168 for 7 days), scalar or array
+        Returns: ISI value [0,1], same shape as t_hours
         """
+        t_hours = np.asarray(t_hours, dtype=float)
+
         if self.scenario == 'normal':
-            return 0.1
+            ISI = np.zeros(t_hours.shape) + self.ISI_normal
         elif self.scenario == 'infection':
-            if t_hours < 48:  # Before Day 3
-                return 0.0
-            else:
-                t_inf = t_hours - 48  # hours since infection onset
-                return 0.2 + 0.6 * (1 - np.exp(-t_inf / 36))
+            # Before onset the wound is clean; afterwards ISI saturates towards 0.8
+            t_inf = np.maximum(t_hours - self.onset_hours, 0.0)  # hours since infection onset
+            ISI = np.where(t_hours < self.onset_hours, 0.0,
+                           self.ISI_onset + self.ISI_rise * (1 - np.exp(-t_inf / self.tau_hours)))
+        else:
+            ISI = np.zeros(t_hours.shape)
 
-        return 0.0
+        return ISI[()]
 
     def get_pH(self, t_hours):
         ISI = self.compute_ISI(t_hours)
@@ -31,3 +65,47 @@ class WoundModel:
     def get_temperature(self, t_hours):
         ISI = self.compute_ISI(t_hours)
         return self.T_base + self.beta * ISI
+
+    def get_moisture(self, t_hours):
+        ISI = self.compute_ISI(t_hours)
+        return self.M_base + self.gamma * ISI
+
+    def get_strain(self, t_hours):
+        ISI = self.compute_ISI(t_hours)
+        return self.S_base + self.delta * ISI
+
+    def trajectory(self, time_points):
+        """
+        Clean pH and temperature curves for a whole time grid in one call.
+
+        Results are cached per (scenario, parameters, grid) and returned as
+        read-only arrays, so repeated runs over the same grid reuse them.
+        Models with per-patient (array) parameters are not cached.
+
+        Args:
+            time_points: 1-D array of times since wound creation (hours)
+        Returns:
+            (pH, temperature): 1-D arrays aligned with time_points
+        """
+        time_points = np.ascontiguousarray(time_points, dtype=float)
+        parameters = tuple(getattr(self, name) for name in self.PARAMETERS)
+        if any(isinstance(value, np.ndarray) for value in parameters):
+            return (np.asarray(self.get_pH(time_points), dtype=float),
+                    np.asarray(self.get_temperature(time_points), dtype=float))
+
+        key = (self.scenario, parameters, time_points.shape, time_points.tobytes())
+        cached = WoundModel._trajectory_cache.get(key)
+        if cached is not None:
+            return cached
+
+        pH = np.asarray(self.get_pH(time_points), dtype=float)
+        temperature = np.asarray(self.get_temperature(time_points), dtype=float)
+        pH.flags.writeable = False
+        temperature.flags.writeable = False
+
+        cache = WoundModel._trajectory_cache
+        if len(cache) >= WoundModel._trajectory_cache_size:
+            cache.pop(next(iter(cache)))  # drop oldest grid
+        cache[key] = (pH, temperature)
+
+        return pH, temperature
@@ -0,0 +1,10 @@
+import sys
+import os
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+src_path = os.path.join(project_dir, 'src')
+
+# src/ modules first; the project root holds the m1_3 and cli entry points
+for path in (project_dir, src_path):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from alert_logic import AlertLogic
+from monte_carlo import make_simulator
+from trace_evaluator import evaluate_traces
+from adaptive_sampling import (ENERGY_MODEL, TimeWindowAlert, AdaptiveSchedule, run_schedule,
+                               run_energy, compare_schedules)
+
+
+@pytest.mark.parametrize('scenario', ['normal', 'infection'])
+@pytest.mark.parametrize('interval, params', [
+    (15, dict()),
+    (5, dict(pH_threshold=7.3, temp_delta_threshold=0.8, violation_threshold=0.6)),
+    (60, dict(violation_threshold=0.9)),
+])
+def test_fixed_schedule_reproduces_alert_logic(scenario, interval, params):
+    data = make_simulator(scenario, 5, noise_mult=2.0, seed=1).run(20, 10)
+    stride = interval // 5
+    reference = evaluate_traces(data['pH'][:, ::stride], data['temp'][:, ::stride],
+                                data['time_hours'][::stride],
+                                AlertLogic(sampling_interval_minutes=interval, **params))
+
+    engine = TimeWindowAlert(tick_minutes=5, **params)
+    for i in range(20):
+        run = run_schedule(data['pH'][i], data['temp'][i], data['time_hours'],
+                           AdaptiveSchedule.fixed(interval), engine)
+        assert run['n_samples'] == len(data['time_hours'][::stride])
+        assert run['baseline'] == reference['baseline'][i]
+        assert run['peak_violation_rate'] == reference['peak_violation_rate'][i]
+        np.testing.assert_equal(run['first_alert_time'], reference['first_alert_time'][i])
+
+
+def test_sparse_reading_counts_for_its_whole_interval():
+    engine = TimeWindowAlert(persistence_hours=1, violation_threshold=0.5, tick_minutes=15)
+    for tick in range(0, 97):
+        engine.update(7.0, 37.0, tick)  # calibrate and lock at 24 h
+    assert not engine.update(7.0, 37.0, 99)
+    assert engine.update(8.0, 39.0, 101)  # 2 of the last 4 ticks violated
+    assert engine.peak_violation_rate == 0.5
+    assert not engine.update(7.0, 37.0, 104)  # window (100, 104]: 1 violated tick
+
+    with pytest.raises(ValueError):
+        TimeWindowAlert(persistence_hours=1, tick_minutes=7)
+
+
+def test_adaptive_schedule_cuts_samples_without_losing_detection():
+    infection = compare_schedules('infection', n_patients=100)
+    assert infection['adaptive']['alert_rate'] == infection['fixed']['alert_rate'] > 0.9
+    assert infection['alert_delay_hours'] == {'mean': 0.0, 'max': 0.0}
+    assert infection['missed_alerts'] == infection['extra_alerts'] == 0
+    assert infection['energy_ratio'] < 0.9
+
+    normal = compare_schedules('normal', n_patients=50)
+    assert normal['adaptive']['alert_rate'] == 0.0
+    assert normal['sample_ratio'] < 0.5
+    assert normal['fixed']['samples_per_run'] == 960
+
+
+def test_energy_model_and_interval_validation():
+    per_sample = (ENERGY_MODEL['sample_mJ'] + ENERGY_MODEL['uplink_mJ']) / 1000
+    sleep = ENERGY_MODEL['sleep_mW'] * 3.6
+    assert run_energy(10, 1.0) == pytest.approx(10 * per_sample + sleep)
+    assert run_energy(0, 1.0, {'sample_mJ': 1, 'uplink_mJ': 0, 'sleep_mW': 1}) == 3.6
+
+    data = make_simulator('normal', 5, seed=0).run(1, 2)
+    with pytest.raises(ValueError):
+        run_schedule(data['pH'][0], data['temp'][0], data['time_hours'],
+                     AdaptiveSchedule(calibration_minutes=7),
+                     TimeWindowAlert(tick_minutes=5))
+    with pytest.raises(ValueError):
+        compare_schedules('normal', fixed_interval=12, n_patients=1)
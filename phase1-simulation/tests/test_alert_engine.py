@@ -0,0 +1,164 @@
+import numpy as np
+import pytest
+
+from wound_model import WoundModel
+from noise import NoiseGenerator
+from batch_simulation import BatchSimulator
+from alert_logic import AlertLogic
+
+
+def simulate(scenario, seed, days=10, sampling_interval=15, noise_mult=1.0):
+    sim = BatchSimulator(
+        WoundModel(scenario=scenario),
+        NoiseGenerator(0.05 * noise_mult, 0.002, sampling_interval),
+        NoiseGenerator(0.10 * noise_mult, 0.01, sampling_interval),
+        sampling_interval_minutes=sampling_interval,
+        seed=seed
+    )
+    result = sim.run(n_patients=1, simulation_days=days)
+    return result['pH'][0], result['temp'][0], result['time_hours']
+
+
+def step(engine, pH, temp, t):
+    states, counts = [], []
+    for p, T, ti in zip(pH, temp, t):
+        states.append(engine.update(p, T, ti))
+        counts.append(engine.violation_count)
+    return np.array(states), np.array(counts)
+
+
+def test_running_count_matches_window_sum():
+    pH, temp, t = simulate('infection', seed=1)
+    engine = AlertLogic()
+
+    for p, T, ti in zip(pH, temp, t):
+        engine.update(p, T, ti)
+        assert engine.violation_count == sum(engine.violation_window)
+
+    status = engine.get_status()
+    assert status['violation_count'] == sum(engine.violation_window)
+    assert status['violation_rate'] == sum(engine.violation_window) / engine.window_size
+
+
+def test_reset_clears_running_count():
+    pH, temp, t = simulate('infection', seed=2)
+    engine = AlertLogic()
+    step(engine, pH, temp, t)
+    engine.reset()
+
+    assert engine.violation_count == 0
+    assert engine.get_status()['violation_count'] == 0
+
+
+@pytest.mark.parametrize('scenario', ['normal', 'infection'])
+@pytest.mark.parametrize('sampling_interval', [5, 15, 60])
+def test_update_many_matches_per_sample(scenario, sampling_interval):
+    pH, temp, t = simulate(scenario, seed=3, sampling_interval=sampling_interval, noise_mult=2.0)
+
+    reference = AlertLogic(sampling_interval_minutes=sampling_interval)
+    expected, _ = step(reference, pH, temp, t)
+
+    batched = AlertLogic(sampling_interval_minutes=sampling_interval)
+    got = batched.update_many(pH, temp, t)
+
+    np.testing.assert_array_equal(got, expected)
+    assert batched.temp_baseline == reference.temp_baseline
+    assert batched.alert_active == reference.alert_active
+    assert list(batched.violation_window) == list(reference.violation_window)
+
+
+def test_update_many_in_chunks_matches_per_sample():
+    pH, temp, t = simulate('infection', seed=4, noise_mult=2.0)
+
+    reference = AlertLogic()
+    expected, expected_counts = step(reference, pH, temp, t)
+
+    chunked = AlertLogic()
+    got = []
+    bounds = [0, 7, 50, 96, 97, 98, 300, 301, 700, len(t)]
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        got.append(chunked.update_many(pH[lo:hi], temp[lo:hi], t[lo:hi]))
+        assert chunked.violation_count == expected_counts[hi - 1]
+
+    np.testing.assert_array_equal(np.concatenate(got), expected)
+    assert chunked.get_status() == reference.get_status()
+
+
+def test_threshold_is_inclusive():
+    engine = AlertLogic(persistence_hours=1, sampling_interval_minutes=15,
+                        violation_threshold=0.75)
+    t = np.arange(0, 26, 0.25)
+    temp = np.full(len(t), 36.8)
+    pH = np.full(len(t), 7.0)
+
+    # Exactly 3 of the last 4 post-lock samples violate -> rate == 0.75
+    temp[-4:] = 40.0
+    pH[-4:] = 8.0
+    pH[-4] = 7.0
+
+    states = engine.update_many(pH, temp, t)
+    assert states[-1]
+    assert engine.get_status()['violation_rate'] == 0.75
+
+
+def test_exact_baseline_matches_median_and_lock_is_constant_time(monkeypatch):
+    pH, temp, t = simulate('normal', seed=5, days=2, sampling_interval=5)
+    lock = np.flatnonzero(t >= 24)[0]
+
+    # Locking must not revisit the calibration samples (no sort/median pass)
+    def no_full_pass(*args, **kwargs):
+        raise AssertionError("lock re-scanned the calibration buffer")
+    monkeypatch.setattr(np, 'median', no_full_pass)
+    monkeypatch.setattr(np, 'sort', no_full_pass)
+
+    engine = AlertLogic(sampling_interval_minutes=5)
+    step(engine, pH, temp, t)
+
+    monkeypatch.undo()
+    assert engine.temp_baseline == np.median(temp[:lock + 1])
+    assert engine.baseline_estimator is None  # calibration storage released
+
+
+def test_approximate_baseline_is_close_and_consistent():
+    pH, temp, t = simulate('infection', seed=6, noise_mult=2.0)
+    lock = np.flatnonzero(t >= 24)[0]
+
+    engine = AlertLogic(baseline_mode='approximate')
+    expected, _ = step(engine, pH, temp, t)
+    assert abs(engine.temp_baseline - np.median(temp[:lock + 1])) < 0.05
+
+    batched = AlertLogic(baseline_mode='approximate')
+    np.testing.assert_array_equal(batched.update_many(pH, temp, t), expected)
+    assert batched.temp_baseline == engine.temp_baseline
+
+    with pytest.raises(ValueError):
+        AlertLogic(baseline_mode='mean')
+
+
+def test_peak_rate_is_tracked_without_get_status():
+    pH, temp, t = simulate('infection', seed=4, noise_mult=2.0)
+    engine = AlertLogic()
+    peak = 0.0
+    for p, T, ti in zip(pH, temp, t):
+        engine.update(p, T, ti)
+        peak = max(peak, engine.get_status()['violation_rate'])
+        assert engine.peak_violation_rate == peak
+
+    chunked = AlertLogic()
+    for start in range(0, len(t), 100):
+        chunked.update_many(pH[start:start + 100], temp[start:start + 100], t[start:start + 100])
+    assert chunked.peak_violation_rate == peak > 0
+
+    engine.reset()
+    assert engine.peak_violation_rate == 0.0
+
+
+@pytest.mark.parametrize('violation_threshold', [0.6, 0.75, 0.9, 1.0, 1.1])
+@pytest.mark.parametrize('sampling_interval', [5, 15, 60])
+def test_alert_count_is_smallest_triggering_count(violation_threshold, sampling_interval):
+    engine = AlertLogic(sampling_interval_minutes=sampling_interval,
+                        violation_threshold=violation_threshold)
+    counts = np.arange(engine.window_size + 1)
+    triggering = counts[counts / engine.window_size >= violation_threshold]
+    expected = triggering[0] if len(triggering) else engine.window_size + 1
+    assert engine.alert_count() == expected
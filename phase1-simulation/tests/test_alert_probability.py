@@ -0,0 +1,79 @@
+import math
+
+import numpy as np
+import pytest
+
+from alert_probability import (normal_cdf, drift_offset_sd, first_alert_pmf,
+                               alert_time_distribution, screen)
+from monte_carlo import run_monte_carlo
+
+
+def test_normal_cdf_matches_erf():
+    x = np.linspace(-6, 6, 241)
+    exact = np.array([0.5 * math.erfc(-v / math.sqrt(2)) for v in x])
+    assert np.max(np.abs(normal_cdf(x) - exact)) < 1e-7
+
+
+def test_drift_offset_sd():
+    t = np.array([0.0, 4.0, 9.0])
+    assert np.allclose(drift_offset_sd(t, 0.5), [0.0, 1.0, 1.5])
+
+    # Single calibration sample at s: offset D(t) - D(s) has variance |t - s|
+    assert np.allclose(drift_offset_sd(t, 1.0, [4.0]), [2.0, 0.0, np.sqrt(5.0)])
+
+
+def test_first_alert_pmf_certain_and_impossible():
+    ones = np.ones((1, 20))
+    pmf = first_alert_pmf(ones, window_size=4, alert_count=3, lock_index=2)
+    assert pmf[0, 5] == pytest.approx(1.0)
+    assert pmf.sum() == pytest.approx(1.0)
+
+    assert not first_alert_pmf(np.zeros((1, 20)), 4, 3, 2).any()
+    assert not first_alert_pmf(ones, 4, 5, 2).any()
+
+
+def test_first_alert_pmf_is_a_distribution():
+    p = np.vstack([np.full(200, 0.3), np.linspace(0, 1, 200)])
+    pmf = first_alert_pmf(p, window_size=12, alert_count=9, lock_index=10)
+    assert np.all(pmf >= 0)
+    assert np.all(pmf.sum(axis=1) <= 1 + 1e-12)
+    assert pmf[1].sum() == pytest.approx(1.0)
+    assert not pmf[:, :21].any()  # window not yet full
+
+
+def test_infection_matches_monte_carlo():
+    analytic = alert_time_distribution('infection')
+    mc = run_monte_carlo('infection', n_replicates=1000)
+
+    assert np.all(np.diff(analytic['cdf']) >= 0)
+    assert analytic['alert_probability'] == pytest.approx(mc['alert_rate'], abs=0.06)
+    assert analytic['alert_time_p50_hours'] == pytest.approx(mc['alert_time_p50_hours'], abs=3)
+
+
+def test_noisy_sensor_matches_monte_carlo():
+    analytic = alert_time_distribution('infection', noise_mult=3.0)
+    mc = run_monte_carlo('infection', noise_mult=3.0, n_replicates=1000)
+    assert analytic['alert_probability'] == pytest.approx(mc['alert_rate'], abs=0.08)
+
+
+def test_normal_wound_has_no_false_positives():
+    result = alert_time_distribution('normal')
+    assert result['alert_probability'] < 1e-6
+    assert run_monte_carlo('normal', n_replicates=200)['alert_rate'] == 0
+
+
+def test_without_drift_alerts_earlier_and_surely():
+    noise_only = alert_time_distribution('infection', drift=False)
+    with_drift = alert_time_distribution('infection')
+    assert noise_only['alert_probability'] > with_drift['alert_probability']
+    assert noise_only['alert_probability'] == pytest.approx(1.0, abs=1e-6)
+
+
+def test_screen_rows():
+    rows = screen({'pH_thresh': [7.3, 7.7], 'viol_thresh': [0.75]}, deadline_hours=192)
+    assert [(row['pH_thresh'], row['viol_thresh']) for row in rows] == [(7.3, 0.75), (7.7, 0.75)]
+    for row in rows:
+        assert 0 <= row['detection_probability'] <= 1
+        assert row['false_positive_probability'] < 1e-3
+    # A stricter pH threshold detects less
+    assert rows[0]['detection_probability'] > rows[1]['detection_probability']
@@ -0,0 +1,173 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from wound_model import WoundModel
+from noise import NoiseGenerator
+from batch_simulation import BatchSimulator
+from alert_logic import AlertLogic
+from alert_service import PatientAlertStates, LocalBroker, AlertService
+
+
+def simulate_fleet(n_patients, days=10, seed=8):
+    sim = BatchSimulator(WoundModel('infection'), NoiseGenerator(0.10, 0.002),
+                         NoiseGenerator(0.20, 0.01), seed=seed)
+    return sim.run(n_patients=n_patients, simulation_days=days)
+
+
+def test_batched_states_match_alert_logic_with_interleaving():
+    data = simulate_fleet(12)
+    n_patients, n_steps = data['pH'].shape
+    rng = np.random.default_rng(0)
+
+    # Random arrival order that preserves per-patient time order; ticks may
+    # contain several readings of the same patient
+    arrivals = np.repeat(np.arange(n_patients), n_steps)
+    rng.shuffle(arrivals)
+    step_of = np.zeros(len(arrivals), dtype=np.int64)
+    next_step = np.zeros(n_patients, dtype=np.int64)
+    for i, p in enumerate(arrivals):
+        step_of[i] = next_step[p]
+        next_step[p] += 1
+
+    states = PatientAlertStates(capacity=4)
+    decisions = np.zeros(len(arrivals), dtype=bool)
+    for lo in range(0, len(arrivals), 37):
+        sel = slice(lo, lo + 37)
+        rows, steps = arrivals[sel], step_of[sel]
+        decisions[sel], _ = states.update(rows, data['pH'][rows, steps], data['temp'][rows, steps],
+                                       data['time_hours'][steps])
+
+    for p in range(n_patients):
+        engine = AlertLogic()
+        expected = [engine.update(ph, T, t) for ph, T, t in
+                    zip(data['pH'][p], data['temp'][p], data['time_hours'])]
+        np.testing.assert_array_equal(decisions[arrivals == p], expected)
+        assert states.baseline[p] == engine.temp_baseline
+        assert states.count[p] == engine.violation_count
+
+
+def test_service_consumes_broker_and_publishes_transitions():
+    data = simulate_fleet(5, days=8)
+
+    async def scenario():
+        broker = LocalBroker()
+        alerts = broker.subscribe('dressing/+/alert')
+        service = AlertService(broker, capacity=2)
+
+        total = data['pH'].size
+        task = asyncio.create_task(service.run(stop_after=total))
+        for k, t in enumerate(data['time_hours']):
+            for p in range(5):
+                broker.publish(f'dressing/dev{p}/readings',
+                               {'t_hours': t, 'pH': data['pH'][p, k], 'temp': data['temp'][p, k]})
+            if k % 50 == 0:
+                await asyncio.sleep(0)
+        await task
+
+        events = []
+        while not alerts.empty():
+            events.append(alerts.get_nowait())
+        return service, events
+
+    service, events = asyncio.run(scenario())
+    assert service.stats()['readings_processed'] == data['pH'].size
+    assert service.stats()['max_latency_s'] < 1.0
+
+    for p in range(5):
+        engine = AlertLogic()
+        states = [engine.update(ph, T, t) for ph, T, t in
+                  zip(data['pH'][p], data['temp'][p], data['time_hours'])]
+        first = next((t for t, s in zip(data['time_hours'], states) if s), None)
+        device_events = [payload for topic, payload, _ in events if topic == f'dressing/dev{p}/alert']
+        if first is None:
+            assert not device_events
+        else:
+            assert device_events[0] == {'t_hours': first, 'alert_active': True}
+
+
+def test_transitions_inside_one_batch_are_reported_in_order():
+    # One-hour window: alert turns on and off again within a single batch
+    params = {'persistence_hours': 1}
+    t = np.arange(0, 30, 0.25)
+    pH = np.full(len(t), 6.5)
+    temp = np.full(len(t), 37.0)
+    flare = (t > 25) & (t <= 26.5)
+    pH[flare], temp[flare] = 8.0, 39.0
+
+    engine = AlertLogic(**params)
+    expected = np.array([engine.update(a, b, c) for a, b, c in zip(pH, temp, t)])
+    flips = np.flatnonzero(np.diff(np.r_[False, expected]))
+    assert len(flips) == 2
+
+    states = PatientAlertStates(**params)
+    alerts, changed = states.update(np.zeros(len(t), dtype=np.int64), pH, temp, t)
+    np.testing.assert_array_equal(alerts, expected)
+    np.testing.assert_array_equal(np.flatnonzero(changed), flips)
+
+    broker = LocalBroker()
+    published = broker.subscribe('dressing/+/alert')
+    AlertService(broker, **params).process(['dev0'] * len(t), pH, temp, t)
+    events = [published.get_nowait()[1] for _ in range(published.qsize())]
+    assert events == [{'t_hours': t[flips[0]], 'alert_active': True},
+                      {'t_hours': t[flips[1]], 'alert_active': False}]
+
+
+def test_bounded_queue_applies_backpressure():
+    data = simulate_fleet(3, days=3)
+
+    async def scenario():
+        broker = LocalBroker()
+        service = AlertService(broker, max_batch=16, queue_size=32)
+        task = asyncio.create_task(service.run(stop_after=data['pH'].size))
+
+        peak = 0
+        for k, t in enumerate(data['time_hours']):
+            for p in range(3):
+                await broker.publish_async(f'dressing/dev{p}/readings',
+                                           {'t_hours': t, 'pH': data['pH'][p, k],
+                                            'temp': data['temp'][p, k]})
+                peak = max(peak, service.queue.qsize())
+        with pytest.raises(asyncio.QueueFull):
+            for _ in range(33):
+                broker.publish('dressing/dev0/readings', {'t_hours': 0.0, 'pH': 7.0, 'temp': 37.0})
+        task.cancel()
+        return peak
+
+    assert asyncio.run(scenario()) <= 32
+
+
+def test_full_alert_subscriber_slows_run_instead_of_failing():
+    params = {'persistence_hours': 1}
+    t = np.arange(0, 30, 0.25)
+    flare = (t > 25) & (t <= 26.5)
+    pH, temp = np.where(flare, 8.0, 6.5), np.where(flare, 39.0, 37.0)
+
+    async def scenario():
+        broker = LocalBroker()
+        alerts = broker.subscribe('dressing/+/alert', maxsize=1)
+        service = AlertService(broker, **params)
+        for p in range(2):
+            for k in range(len(t)):
+                broker.publish(f'dressing/dev{p}/readings',
+                               {'t_hours': t[k], 'pH': pH[k], 'temp': temp[k]})
+        task = asyncio.create_task(service.run(stop_after=2 * len(t)))
+
+        events = []
+        while len(events) < 4:
+            events.append((await alerts.get())[1])
+            await asyncio.sleep(0)
+        await task
+        return service, events
+
+    service, events = asyncio.run(scenario())
+    assert [e['alert_active'] for e in events] == [True, False, True, False]
+    assert service.stats()['alerts_dropped'] == 0
+
+    # process() publishes without waiting: the alert that does not fit is counted
+    broker = LocalBroker()
+    broker.subscribe('dressing/+/alert', maxsize=1)
+    service = AlertService(broker, **params)
+    service.process(['dev0'] * len(t), pH, temp, t)
+    assert service.stats()['alerts_dropped'] == 1
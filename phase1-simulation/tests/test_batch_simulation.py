@@ -0,0 +1,68 @@
+import numpy as np
+
+from wound_model import WoundModel
+from noise import NoiseGenerator
+from sensor_channel import SensorChannel
+from batch_simulation import BatchSimulator
+
+
+def make_simulator(scenario='infection', sampling_interval=15):
+    return BatchSimulator(
+        WoundModel(scenario=scenario),
+        NoiseGenerator(0.05, 0.002, sampling_interval),
+        NoiseGenerator(0.10, 0.01, sampling_interval),
+        sampling_interval_minutes=sampling_interval
+    )
+
+
+def test_run_shapes_and_clean_curves():
+    sim = make_simulator()
+    result = sim.run(n_patients=8, simulation_days=10)
+
+    n_steps = 10 * 24 * 4
+    assert result['time_hours'].shape == (n_steps,)
+    assert result['pH'].shape == (8, n_steps)
+    assert result['temp'].shape == (8, n_steps)
+
+    wound = WoundModel(scenario='infection')
+    assert result['pH_clean'][-1] == wound.get_pH(result['time_hours'][-1])
+
+
+def test_noise_statistics_match_spec():
+    sim = make_simulator(scenario='normal')
+    result = sim.run(n_patients=2000, simulation_days=1)
+
+    # Early samples are dominated by white noise (drift has barely accumulated)
+    residual = result['temp'][:, 0] - result['temp_clean'][0]
+    assert abs(residual.std() - 0.10) < 0.01
+
+
+def test_iter_chunks_covers_all_patients():
+    sim = make_simulator()
+    chunks = list(sim.iter_chunks(n_patients=250, simulation_days=2, chunk_size=100))
+
+    assert [c['pH'].shape[0] for c in chunks] == [100, 100, 50]
+
+
+def test_seeded_batch_matches_serial_and_split_runs():
+    sim = BatchSimulator(
+        WoundModel(scenario='infection'),
+        NoiseGenerator(0.05, 0.002, 15),
+        NoiseGenerator(0.10, 0.01, 15),
+        seed=2024
+    )
+    full = sim.run(n_patients=6, simulation_days=3)
+
+    # Serial per-sample path for patient 4
+    channel = SensorChannel(sim.wound_model, sim.patient_noise(sim.temp_channel, 4),
+                            'temperature')
+    serial = [channel.read(t) for t in full['time_hours']]
+    np.testing.assert_array_equal(full['temp'][4], serial)
+
+    # A worker simulating only patients 3..5 sees identical traces
+    part = sim.run(n_patients=3, simulation_days=3, first_patient=3)
+    np.testing.assert_array_equal(part['pH'], full['pH'][3:])
+
+    # Chunked iteration is also identical
+    chunks = list(sim.iter_chunks(n_patients=6, simulation_days=3, chunk_size=4))
+    np.testing.assert_array_equal(np.vstack([c['temp'] for c in chunks]), full['temp'])
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from alert_logic import AlertLogic
+from trace_evaluator import evaluate_traces
+from boundary_search import TraceBank, probe, find_boundary
+
+SEARCH = dict(deadline_hours=192.0, simulation_days=10, batch_size=50, max_replicates=400)
+
+
+def detected_by(deadline):
+    return lambda result: result['first_alert_time'] <= deadline
+
+
+def test_probe_stops_once_decision_is_clear():
+    bank = TraceBank('infection', simulation_days=10, batch_size=50)
+    easy = probe(bank, AlertLogic(temp_delta_threshold=0.5), detected_by(192.0), 0.95,
+                 max_replicates=1000)
+    hopeless = probe(bank, AlertLogic(temp_delta_threshold=2.0), detected_by(192.0), 0.95,
+                     max_replicates=1000)
+
+    assert easy['passed'] and easy['decided'] and easy['n_replicates'] < 1000
+    assert not hopeless['passed'] and hopeless['n_replicates'] == 50
+    assert bank.n_simulated == easy['n_replicates']  # traces are reused across probes
+
+
+def test_boundary_brackets_the_detection_target():
+    result = find_boundary('dt_threshold', 0.5, 1.6, precision=0.02, **SEARCH)
+
+    passing, failing = result['bracket']
+    assert failing - passing <= 0.02
+    assert result['boundary'] == passing
+    assert result['n_simulated'] <= SEARCH['max_replicates']
+
+    # Same replicates, evaluated directly on either side of the boundary
+    bank = TraceBank('infection', simulation_days=10, batch_size=400)
+    data = bank.batch(0)
+    rates = [np.mean(detected_by(192.0)(evaluate_traces(
+        data['pH'], data['temp'], data['time_hours'], AlertLogic(temp_delta_threshold=value))))
+        for value in (passing, failing)]
+    assert rates[0] >= rates[1]
+    assert result['detection']['passed']
+    assert result['false_positive']['n_replicates'] <= SEARCH['max_replicates']
+
+
+def test_bracket_edges_and_validation():
+    top = find_boundary('violation_threshold', 0.3, 0.5, **SEARCH)
+    assert top['boundary'] == 0.5 and top['bracket'] == (0.5, None)
+    assert len(top['probes']) == 1
+
+    none = find_boundary('pH_threshold', 8.5, 9.0, **SEARCH)
+    assert none['boundary'] is None and none['bracket'] == (None, 8.5)
+    assert not none['feasible'] and none['false_positive'] is None
+
+    with pytest.raises(ValueError):
+        find_boundary('noise_multiplier')
+    with pytest.raises(ValueError):
+        find_boundary('dt_threshold', 1.0, 1.0)
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from wound_model import WoundModel
+from noise import NoiseGenerator
+from batch_simulation import BatchSimulator
+from alert_logic import AlertLogic
+from alert_service import PatientAlertStates
+from checkpoint import (open_checkpoint, save_alert_logics, load_alert_logics,
+                        save_patient_states, load_patient_states,
+                        save_noise_generators, load_noise_generators)
+
+
+def simulate_fleet(n_patients, seed=3):
+    sim = BatchSimulator(WoundModel('infection'), NoiseGenerator(0.10, 0.002),
+                         NoiseGenerator(0.20, 0.01), seed=seed)
+    return sim.run(n_patients=n_patients, simulation_days=6)
+
+
+@pytest.mark.parametrize('baseline_mode', ['exact', 'approximate'])
+@pytest.mark.parametrize('split', [3, 50, 96, 97, 400])
+def test_alert_logic_restore_continues_identically(baseline_mode, split):
+    data = simulate_fleet(1)
+    pH, temp, t = data['pH'][0], data['temp'][0], data['time_hours']
+
+    engine = AlertLogic(baseline_mode=baseline_mode)
+    engine.update_many(pH[:split], temp[:split], t[:split])
+    record = engine.snapshot()
+    assert len(record) == engine.snapshot_dtype().itemsize
+
+    restored = AlertLogic(baseline_mode=baseline_mode)
+    restored.restore(record)
+
+    np.testing.assert_array_equal(restored.update_many(pH[split:], temp[split:], t[split:]),
+                                  engine.update_many(pH[split:], temp[split:], t[split:]))
+    assert restored.get_status() == engine.get_status()
+    assert restored.temp_baseline == engine.temp_baseline
+
+
+def test_noise_restore_continues_stream():
+    gen = NoiseGenerator(0.1, 0.01, rng=4, block_size=16)
+    for _ in range(5):
+        gen.sample()
+
+    restored = NoiseGenerator(0.1, 0.01, block_size=16)
+    restored.restore(gen.snapshot())
+
+    assert [restored.sample() for _ in range(40)] == [gen.sample() for _ in range(40)]
+    np.testing.assert_array_equal(restored.sample_block(30)[1], gen.sample_block(30)[1])
+
+
+def test_bulk_noise_checkpoint(tmp_path):
+    generators = [NoiseGenerator(0.1, 0.01, rng=i) for i in range(20)]
+    for i, gen in enumerate(generators):
+        gen.sample_block(i)
+
+    path = str(tmp_path / 'noise.ckpt')
+    save_noise_generators(path, generators)
+
+    for gen, restored in zip(generators, load_noise_generators(path)):
+        np.testing.assert_array_equal(restored.sample_block(50)[1], gen.sample_block(50)[1])
+
+
+def test_patient_table_and_alert_logic_share_checkpoints(tmp_path):
+    data = simulate_fleet(6)
+    n_patients, n_steps = data['pH'].shape
+    rows = np.arange(n_patients)
+
+    # Patients at different points: calibrating, warming up, full window
+    progress = [10, 96, 97, 150, 300, 500]
+    states = PatientAlertStates(capacity=2)
+    engines = [AlertLogic() for _ in rows]
+    for p, k in enumerate(progress):
+        steps = slice(0, k)
+        states.update(np.full(k, p), data['pH'][p, steps], data['temp'][p, steps],
+                      data['time_hours'][steps])
+        engines[p].update_many(data['pH'][p, steps], data['temp'][p, steps],
+                               data['time_hours'][steps])
+
+    table_path = str(tmp_path / 'table.ckpt')
+    objects_path = str(tmp_path / 'objects.ckpt')
+    save_patient_states(table_path, states, n_patients)
+    save_alert_logics(objects_path, engines)
+    table_header, table_records = open_checkpoint(table_path)
+    objects_header, object_records = open_checkpoint(objects_path)
+    assert table_header == objects_header
+    for name in ['baseline_locked', 'temp_baseline', 'violation_count', 'violation_window',
+                 'calibration_count']:
+        np.testing.assert_array_equal(table_records[name], object_records[name])
+
+    # Continue both restored forms over the rest of each trace
+    table = load_patient_states(objects_path)
+    for p, (k, engine) in enumerate(zip(progress, load_alert_logics(table_path))):
+        steps = slice(k, n_steps)
+        expected = engine.update_many(data['pH'][p, steps], data['temp'][p, steps],
+                                      data['time_hours'][steps])
+        got, _ = table.update(np.full(n_steps - k, p), data['pH'][p, steps],
+                              data['temp'][p, steps], data['time_hours'][steps])
+        np.testing.assert_array_equal(got, expected)
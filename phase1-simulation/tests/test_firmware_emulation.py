@@ -0,0 +1,121 @@
+import os
+
+import numpy as np
+import pytest
+
+from wound_model import WoundModel
+from noise import NoiseGenerator
+from batch_simulation import BatchSimulator
+from trace_evaluator import evaluate_csv, evaluate_traces
+from firmware_emulation import emulate_alert_engine, compare_with_reference, differential_check
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def load_validation(scenario):
+    data = np.loadtxt(os.path.join(REPO_ROOT, 'data', 'validation', f'm1_2_{scenario}.csv'),
+                      delimiter=',', skiprows=1)
+    return data[:, 1], data[:, 2], data[:, 0]
+
+
+def test_validation_traces_match_firmware_test():
+    pH, temp, t = load_validation('infection')
+    firmware = emulate_alert_engine(pH, temp, t)
+    reference = evaluate_csv(os.path.join(REPO_ROOT, 'data', 'validation', 'm1_2_infection.csv'))
+
+    # test_alert_engine.cpp expects the alert in hour 156 (printed as uint32)
+    assert int(firmware['first_alert_time']) == 156
+    assert firmware['first_alert_index'] == reference['first_alert_index']
+    assert firmware['baseline'].dtype == np.float32
+
+    pH, temp, t = load_validation('normal')
+    assert emulate_alert_engine(pH, temp, t)['first_alert_index'] == -1
+    assert compare_with_reference(pH, temp, t) == []
+
+
+def test_baseline_is_upper_median_of_integer_hour_calibration():
+    # 30-minute samples: uptime reaches 24 at t=24.0 (index 48), 49 samples
+    t = np.arange(0, 30, 0.5)
+    temp = np.full(len(t), 37.0)
+    temp[:48:2] = 36.0  # 24 low + 25 high calibration samples -> median 37.0
+    temp[1:48:2] = 36.5
+    result = emulate_alert_engine(np.full(len(t), 7.0), temp, t, sampling_interval_minutes=30)
+
+    assert result['lock_index'] == 48
+    assert result['baseline'] == np.float32(36.5)
+
+    # Even count (50 samples incl. one from hour 24.x): firmware picks sorted[n/2]
+    t_even = np.r_[np.arange(0, 24, 24 / 49), np.arange(24, 30, 0.5)]
+    temp_even = np.r_[np.full(25, 36.0), np.full(24, 36.2), np.full(len(t_even) - 49, 36.2)]
+    result = emulate_alert_engine(np.full(len(t_even), 7.0), temp_even, t_even)
+    assert result['lock_index'] == 49
+    assert result['baseline'] == np.float32(36.2)
+
+
+def test_peak_rate_follows_get_violation_rate():
+    # Four violations right after the lock, then none: getViolationRate()
+    # divides by the partly filled window, AlertLogic by window_size
+    t = np.arange(0, 40, 0.25)
+    pH, temp = np.full(len(t), 7.0), np.full(len(t), 37.0)
+    pH[96:100], temp[96:100] = 8.0, 38.5
+    firmware = emulate_alert_engine(pH, temp, t)
+    reference = evaluate_traces(pH, temp, t)
+
+    assert firmware['lock_index'] == 96
+    assert firmware['peak_violation_rate'] == np.float32(1.0)
+    assert reference['peak_violation_rate'] == pytest.approx(4 / 48)
+    assert firmware['first_alert_index'] == reference['first_alert_index'] == -1
+
+
+def test_float32_threshold_comparisons():
+    t = np.arange(0, 60, 0.25)
+    pH = np.full(len(t), 7.5000001)  # rounds to 7.5f: no violation in firmware
+    temp = np.full(len(t), 37.0)
+    temp[100:] = 38.5
+
+    reference = compare_with_reference(pH, temp, t)
+    firmware = emulate_alert_engine(pH, temp, t)
+
+    assert not firmware['violations'].any()
+    assert len(reference) == 1
+    divergence = reference[0]
+    assert divergence['trace'] == 0
+    assert divergence['reference'] and not divergence['firmware']
+    assert divergence['firmware_alert_time'] != divergence['firmware_alert_time']  # NaN
+
+
+def test_violation_count_wraps_like_uint8():
+    # 1-minute samples, 5 h window = 300 samples: a full window of violations
+    # counts 300 % 256 = 44, far below the alert threshold, so the firmware
+    # never alerts while the reference does
+    t = np.arange(0, 40, 1 / 60)
+    pH = np.full(len(t), 8.0)
+    temp = np.r_[np.full(24 * 60, 37.0), np.full(len(t) - 24 * 60, 39.0)]
+    result = emulate_alert_engine(pH, temp, t, sampling_interval_minutes=1, persistence_hours=5)
+
+    assert result['window_counts'].max() == 255
+    assert result['window_counts'][-1] == 300 % 256
+    assert not result['alert_states'].any()
+
+    divergence, = compare_with_reference(pH, temp, t, sampling_interval_minutes=1,
+                                         persistence_hours=5)
+    assert divergence['reference'] and divergence['index'] == result['lock_index'] + 299
+
+
+@pytest.mark.parametrize('scenario', ['normal', 'infection'])
+def test_differential_check_reports_global_indices(scenario):
+    sim = BatchSimulator(WoundModel(scenario), NoiseGenerator(0.15, 0.002),
+                         NoiseGenerator(0.30, 0.01), seed=3)
+    report = differential_check(sim, n_traces=50, simulation_days=8, chunk_size=16)
+
+    assert report['n_traces'] == 50
+    assert report['n_divergent_traces'] == len(report['divergences'])
+    data = sim.run(50, 8)
+    for divergence in report['divergences']:
+        trace = divergence['trace']
+        single = compare_with_reference(data['pH'][trace], data['temp'][trace],
+                                        data['time_hours'])
+        assert single[0]['index'] == divergence['index']
+
+    # float32 rounding only flips decisions for readings within ~1e-6 of a threshold
+    assert report['n_divergent_traces'] <= 2
@@ -0,0 +1,85 @@
+import json
+import logging
+
+import numpy as np
+import pytest
+
+from wound_model import WoundModel
+from noise import NoiseGenerator
+from sensor_channel import SensorChannel
+from alert_logic import AlertLogic
+from monte_carlo import run_monte_carlo
+import instrumentation
+from instrumentation import Profiler, stage, active_profiler
+
+
+def run_loop(n_steps=200):
+    wound = WoundModel('infection')
+    pH_channel = SensorChannel(wound, NoiseGenerator(0.05, 0.002, rng=1), 'pH')
+    temp_channel = SensorChannel(wound, NoiseGenerator(0.10, 0.01, rng=2), 'temperature')
+    engine = AlertLogic()
+    t = np.arange(n_steps) * 0.25
+    pH = pH_channel.read_batch(t)[0]
+    for ti, p in zip(t, pH):
+        engine.update(p, temp_channel.read(ti), ti)
+        engine.get_status()
+
+
+def test_profiler_counts_hot_path_calls_and_items():
+    with Profiler() as profiler:
+        assert active_profiler() is profiler
+        run_loop(200)
+    stages = profiler.to_dict()['stages']
+
+    assert stages['alert_update']['calls'] == 200
+    assert stages['alert_get_status']['calls'] == 200
+    assert stages['sensor_read']['calls'] == 201  # 200 reads + one read_batch
+    assert stages['sensor_read']['items'] == 400
+    assert stages['noise']['calls'] == 201
+    for s in stages.values():
+        assert 0.0 <= s['self_s'] <= s['total_s'] + 1e-9
+    # Nested stages are excluded from the sensor read self time
+    assert stages['sensor_read']['self_s'] < stages['sensor_read']['total_s']
+
+
+def test_disabled_profiling_leaves_code_untouched():
+    original = AlertLogic.__dict__['update']
+    assert stage('anything') is instrumentation._NULL_STAGE
+
+    with Profiler():
+        assert AlertLogic.__dict__['update'] is not original
+        with pytest.raises(ValueError):
+            Profiler().start()
+
+    assert AlertLogic.__dict__['update'] is original
+    assert active_profiler() is None
+
+
+def test_stage_blocks_and_json_export(tmp_path):
+    with Profiler() as profiler:
+        with stage('report.plots', items=10):
+            with stage('report.inner'):
+                pass
+        run_monte_carlo('infection', n_replicates=20, batch_size=10, simulation_days=3)
+
+    path = str(tmp_path / 'profile.json')
+    profiler.save(path, command='test')
+    with open(path) as f:
+        profile = json.load(f)
+
+    assert profile['command'] == 'test'
+    assert profile['stages']['report.plots']['items'] == 10
+    assert profile['stages']['report.inner']['calls'] == 1
+    assert profile['stages']['alert_evaluation']['calls'] == 2
+    assert profile['stages']['batch_simulation']['items'] == 20 * 3 * 24 * 4
+    assert profile['wall_s'] > 0
+
+
+def test_baseline_lock_is_logged_not_printed(capsys, caplog):
+    engine = AlertLogic()
+    with caplog.at_level(logging.INFO, logger='alert_logic'):
+        for t in np.arange(0, 25, 0.25):
+            engine.update(7.0, 37.0, t)
+
+    assert capsys.readouterr().out == ''
+    assert any('Baseline locked: 37.00' in r.getMessage() for r in caplog.records)
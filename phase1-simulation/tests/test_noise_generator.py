@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from noise import NoiseGenerator, stream_seed
+
+
+def test_sample_batch_shapes():
+    gen = NoiseGenerator(noise_sigma=0.05, drift_sigma_per_hour=0.002)
+    noise, drift = gen.sample_batch(96, n_patients=4)
+
+    assert noise.shape == (4, 96)
+    assert drift.shape == (4, 96)
+
+
+def test_drift_is_cumulative_sum_of_increments():
+    gen = NoiseGenerator(noise_sigma=0.0, drift_sigma_per_hour=0.01, rng=7)
+    _, drift = gen.sample_batch(50)
+
+    increments = np.diff(np.concatenate(([0.0], drift[0])))
+    assert abs(increments.std() - gen.drift_sigma_per_sample) < 0.5 * gen.drift_sigma_per_sample
+    assert gen.current_drift == drift[0, -1]
+
+
+def test_sample_batch_continues_drift_state():
+    gen = NoiseGenerator(noise_sigma=0.0, drift_sigma_per_hour=0.0)
+    gen.current_drift = 1.5
+    _, drift = gen.sample_batch(10, n_patients=3)
+
+    np.testing.assert_array_equal(drift, 1.5)
+    np.testing.assert_array_equal(gen.current_drift, [1.5, 1.5, 1.5])
+
+    gen.reset()
+    assert gen.current_drift == 0.0
+
+
+def test_same_seed_same_stream():
+    a = NoiseGenerator(0.1, 0.01, rng=123).sample_block(500)
+    b = NoiseGenerator(0.1, 0.01, rng=123).sample_block(500)
+    c = NoiseGenerator(0.1, 0.01, rng=124).sample_block(500)
+
+    np.testing.assert_array_equal(a[0], b[0])
+    np.testing.assert_array_equal(a[1], b[1])
+    assert not np.array_equal(a[0], c[0])
+
+
+def test_serial_and_block_sampling_are_bit_identical():
+    block = NoiseGenerator(0.1, 0.01, rng=42, block_size=64).sample_block(1000)
+
+    serial_gen = NoiseGenerator(0.1, 0.01, rng=42, block_size=64)
+    serial = [serial_gen.sample() for _ in range(1000)]
+
+    np.testing.assert_array_equal(block[0], [s[0] for s in serial])
+    np.testing.assert_array_equal(block[1], [s[1] for s in serial])
+
+
+def test_mixed_sample_and_block_calls_keep_stream():
+    reference = NoiseGenerator(0.1, 0.01, rng=5).sample_block(300)
+
+    gen = NoiseGenerator(0.1, 0.01, rng=5, block_size=16)
+    parts = [gen.sample_block(10)]
+    parts.append(tuple(np.array([v]) for v in gen.sample()))
+    parts.append(gen.sample_block(200))
+    parts.append(gen.sample_block(89))
+
+    np.testing.assert_array_equal(np.concatenate([p[0] for p in parts]), reference[0])
+    np.testing.assert_array_equal(np.concatenate([p[1] for p in parts]), reference[1])
+
+
+def test_patient_substreams_are_independent_and_stable():
+    first = NoiseGenerator(0.1, 0.01, rng=stream_seed(9, 3, 1)).sample_block(100)
+    again = NoiseGenerator(0.1, 0.01, rng=stream_seed(9, 3, 1)).sample_block(100)
+    other_channel = NoiseGenerator(0.1, 0.01, rng=stream_seed(9, 3, 0)).sample_block(100)
+
+    np.testing.assert_array_equal(first[0], again[0])
+    assert not np.array_equal(first[0], other_channel[0])
+
+
+def test_per_patient_drift_state_requires_reset():
+    gen = NoiseGenerator(0.1, 0.01, rng=3)
+    gen.sample_batch(10, n_patients=4)
+
+    with pytest.raises(ValueError):
+        gen.sample()
+    with pytest.raises(ValueError):
+        gen.sample_batch(10, n_patients=2)
+
+    gen.reset()
+    noise, drift = gen.sample()
+    assert np.ndim(drift) == 0
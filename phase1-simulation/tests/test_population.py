@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from wound_model import WoundModel
+from population import PopulationSampler, batch_trajectory, validate_cohort
+from monte_carlo import run_monte_carlo
+
+
+def test_patients_do_not_depend_on_batch_size():
+    sampler = PopulationSampler(seed=3)
+    whole = sampler.sample(25)
+    batches = list(sampler.iter_batches(25, batch_size=7))
+    assert [len(batch['patient_index']) for batch in batches] == [7, 7, 7, 4]
+    for name, values in whole.items():
+        np.testing.assert_array_equal(values, np.concatenate([batch[name] for batch in batches]))
+
+
+def test_distributions_are_respected():
+    sampler = PopulationSampler(seed=0, infected=('bernoulli', 0.2),
+                                onset_hours=('uniform', 30.0, 60.0),
+                                ISI_rise=('constant', 0.5))
+    params = sampler.sample(4000)
+    assert params['infected'].dtype == bool
+    assert params['infected'].mean() == pytest.approx(0.2, abs=0.03)
+    assert 30.0 <= params['onset_hours'].min() and params['onset_hours'].max() <= 60.0
+    assert np.all(params['ISI_rise'] == 0.5)
+    assert np.median(params['alpha']) == pytest.approx(2.0, rel=0.02)
+    assert 5.0 <= params['PH_base'].min() and params['PH_base'].max() <= 7.0
+
+    # Other parameters keep their draws when one distribution changes
+    baseline = PopulationSampler(seed=0).sample(4000)
+    np.testing.assert_array_equal(params['alpha'], baseline['alpha'])
+
+
+@pytest.mark.parametrize('spec', [
+    {'onset': ('uniform', 0, 1)},
+    {'alpha': ('gamma', 1.0, 2.0)},
+    {'alpha': ('normal', 1.0)},
+    {'alpha': ('bernoulli', 0.5)},
+    {'infected': ('uniform', 0, 1)},
+])
+def test_invalid_distributions(spec):
+    with pytest.raises(ValueError):
+        PopulationSampler(seed=0, **spec)
+
+
+def test_batch_trajectory_matches_wound_model():
+    t = np.arange(0, 240, 0.25)
+    params = PopulationSampler(seed=1).sample(6)
+    pH, temp = batch_trajectory(params, t)
+    assert pH.shape == temp.shape == (6, len(t))
+
+    for i in range(6):
+        scenario = 'infection' if params['infected'][i] else 'normal'
+        model = WoundModel(scenario, **{name: float(params[name][i])
+                                        for name in WoundModel.PARAMETERS if name in params})
+        np.testing.assert_allclose(pH[i], model.get_pH(t), rtol=0, atol=1e-12)
+        np.testing.assert_allclose(temp[i], model.get_temperature(t), rtol=0, atol=1e-12)
+
+
+def test_fixed_cohort_reproduces_monte_carlo():
+    # Every patient at the WoundModel defaults: same detection as run_monte_carlo
+    fixed = PopulationSampler(distributions={'infected': ('bernoulli', 1.0)}, seed=0)
+    result = validate_cohort(fixed, 300, seed=4, batch_size=128)
+    mc = run_monte_carlo('infection', n_replicates=1000)
+
+    assert result['infected']['n_replicates'] == 300
+    assert result['healing']['n_replicates'] == 0
+    assert result['infected']['alert_rate'] == pytest.approx(mc['alert_rate'], abs=0.05)
+    assert result['infected']['alert_time_p50_hours'] == pytest.approx(
+        mc['alert_time_p50_hours'], abs=5)
+
+
+def test_heterogeneous_cohort_has_no_false_positives():
+    result = validate_cohort(PopulationSampler(seed=2), 400, seed=2, batch_size=150)
+    total = result['infected']['n_replicates'] + result['healing']['n_replicates']
+    assert total == 400
+    assert result['healing']['alert_rate'] == 0
+    assert result['infected']['n_alerts'] > 0
@@ -0,0 +1,83 @@
+import os
+
+import numpy as np
+import pytest
+
+from wound_model import WoundModel
+from noise import NoiseGenerator
+from batch_simulation import BatchSimulator
+from alert_logic import AlertLogic
+from trace_io import TraceWriter, trace_to_csv
+from replay import replay_log, score_log, replay_logs, find_logs
+
+
+def write_fleet_logs(directory, n_patients=4, days=8):
+    sim = BatchSimulator(WoundModel('infection'), NoiseGenerator(0.10, 0.002),
+                         NoiseGenerator(0.20, 0.01), seed=17)
+    data = sim.run(n_patients=n_patients, simulation_days=days)
+
+    for p in range(n_patients):
+        trace_path = os.path.join(directory, f'dev{p}.trace')
+        with TraceWriter(trace_path) as writer:
+            writer.append(data['time_hours'], data['pH'][p], data['temp'][p])
+        if p % 2:
+            trace_to_csv(trace_path, os.path.join(directory, f'dev{p}.csv'))
+    return data
+
+
+def expected_transitions(pH, temp, t):
+    engine = AlertLogic()
+    states = np.array([engine.update(a, b, c) for a, b, c in zip(pH, temp, t)])
+    changes = np.flatnonzero(np.diff(np.r_[False, states]))
+    return [(int(i), bool(states[i])) for i in changes]
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 97, 250, 100000])
+def test_chunked_replay_matches_stepping(tmp_path, chunk_rows):
+    write_fleet_logs(str(tmp_path), n_patients=2)
+    path = str(tmp_path / 'dev1.csv')
+    data = np.loadtxt(path, delimiter=',', skiprows=1)
+
+    events = list(replay_log(path, chunk_rows=chunk_rows))
+
+    expected = expected_transitions(data[:, 1], data[:, 2], data[:, 0])
+    assert [(e['index'], e['alert_active']) for e in events] == expected
+    assert all(e['t_hours'] == data[e['index'], 0] for e in events)
+
+
+def test_many_logs_in_parallel_match_inline(tmp_path):
+    write_fleet_logs(str(tmp_path))
+    paths = find_logs(str(tmp_path))
+    assert len(paths) == 6  # four traces plus two CSV exports
+
+    inline = {r['path']: r for r in replay_logs(paths, chunk_rows=200)}
+    pooled = {r['path']: r for r in replay_logs(paths, workers=2, chunk_rows=200, max_pending=3)}
+
+    assert inline.keys() == set(paths)
+    assert pooled == inline
+
+    # CSV export and trace of the same device score identically
+    def transitions(path):
+        return [(e['index'], e['t_hours'], e['alert_active']) for e in inline[path]['events']]
+    assert transitions(str(tmp_path / 'dev1.csv')) == transitions(str(tmp_path / 'dev1.trace'))
+    assert any(r['first_alert_time'] is not None for r in inline.values())
+
+
+def test_score_log_summary(tmp_path):
+    data = write_fleet_logs(str(tmp_path), n_patients=1)
+    summary = score_log(str(tmp_path / 'dev0.trace'),
+                        alert_params={'sampling_interval_minutes': 15})
+
+    assert summary['n_samples'] == len(data['time_hours'])
+    assert summary['baseline'] is not None
+    onsets = [e for e in summary['events'] if e['alert_active']]
+    assert summary['first_alert_time'] == (onsets[0]['t_hours'] if onsets else None)
+
+
+def test_multi_trace_directory_is_rejected(tmp_path):
+    path = str(tmp_path / 'fleet.trace')
+    with TraceWriter(path, n_traces=2) as writer:
+        writer.append([0.0, 0.25], [[7.0, 7.0], [7.1, 7.1]], [[37.0, 37.0], [37.1, 37.1]])
+
+    with pytest.raises(ValueError):
+        list(replay_log(path))
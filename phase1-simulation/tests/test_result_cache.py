@@ -0,0 +1,106 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+import monte_carlo
+from monte_carlo import run_monte_carlo, run_monte_carlo_grid
+from result_cache import ResultCache, cache_key, source_version
+
+
+def test_keys_are_order_independent_and_versioned():
+    a = cache_key({'scenario': 'infection', 'seed': 1, 'alert': {'x': 1, 'y': 2}})
+    b = cache_key({'alert': {'y': 2, 'x': 1}, 'seed': 1, 'scenario': 'infection'})
+    assert a == b
+    assert cache_key({'seed': 2}) != cache_key({'seed': 1})
+    assert cache_key({'seed': 1}, source='other') != cache_key({'seed': 1})
+    assert len(source_version()) == 64
+
+
+def test_summaries_and_traces_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    params = {'scenario': 'normal', 'seed': np.int64(3)}
+
+    assert cache.get(params) is None
+    pH = np.linspace(6, 8, 10)
+    cache.put(params, {'alert_rate': 0.25, 'alert_time': float('nan')}, traces={'pH': pH})
+
+    summary = cache.get(params)
+    assert summary['alert_rate'] == 0.25 and np.isnan(summary['alert_time'])
+    np.testing.assert_array_equal(cache.get_traces(params)['pH'], pH)
+    assert cache.get_traces({'scenario': 'other'}) is None
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'writes': 1,
+                             'evictions': 0}
+    assert not [n for _, _, names in os.walk(str(tmp_path)) for n in names if n.endswith('.tmp')]
+
+
+def test_lru_eviction_keeps_recently_read_entries(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=10 ** 9)
+    for i in range(5):
+        cache.put({'i': i}, {'value': 'x' * 100})
+        path = cache._path(cache.key({'i': i}), '.json')
+        os.utime(path, (1000 + i, 1000 + i))
+
+    cache.get({'i': 0})  # refreshes entry 0
+    entry_size = cache.size_bytes() // 5
+    cache.max_bytes = 3 * entry_size
+    assert cache.evict() == 2
+
+    assert cache.get({'i': 0}) is not None
+    assert cache.get({'i': 1}) is None and cache.get({'i': 2}) is None
+    assert cache.get({'i': 4}) is not None
+    assert cache.size_bytes() <= cache.max_bytes
+
+
+def test_cap_holds_across_short_runs_and_evicts_whole_entries(tmp_path):
+    directory = str(tmp_path)
+    for run in range(4):  # one write per run never reached the old eviction trigger
+        cache = ResultCache(directory, max_bytes=10 ** 9)
+        cache.put({'run': run}, {'value': run}, traces={'pH': np.zeros(100)})
+        for suffix in ('.json', '.npz'):
+            os.utime(cache._path(cache.key({'run': run}), suffix), (1000 + run, 1000 + run))
+    entry_size = cache.size_bytes() // 4
+
+    cache = ResultCache(directory, max_bytes=2 * entry_size)  # opening enforces the cap
+    assert cache.evictions == 2
+    assert cache.get({'run': 1}) is None and cache.get_traces({'run': 1}) is None
+    assert len([n for _, _, names in os.walk(directory) for n in names]) == 4
+
+    cache.put({'run': 4}, {'value': 4}, traces={'pH': np.zeros(100)})
+    assert cache.evictions == 3
+    assert cache.get_traces({'run': 2}) is None and cache.get({'run': 2}) is None
+    assert cache.get({'run': 3}) is not None and cache.get_traces({'run': 4}) is not None
+    assert cache.size_bytes() <= cache.max_bytes
+
+
+def _write_same_keys(directory):
+    cache = ResultCache(directory)
+    for i in range(20):
+        cache.put({'i': i}, {'value': i})
+    return [cache.get({'i': i})['value'] for i in range(20)]
+
+
+def test_concurrent_writers_leave_complete_entries(tmp_path):
+    with ProcessPoolExecutor(max_workers=3) as pool:
+        results = list(pool.map(_write_same_keys, [str(tmp_path)] * 6))
+    assert all(r == list(range(20)) for r in results)
+
+
+def test_monte_carlo_runs_reuse_cached_summaries(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path))
+    kwargs = dict(n_replicates=30, seed=4, simulation_days=8)
+
+    grid = run_monte_carlo_grid('infection', dt_thresholds=[0.8, 1.0], cache=cache, **kwargs)
+    direct = run_monte_carlo('infection', dt_thresh=0.8, **kwargs)
+
+    def no_simulation(*args, **kwargs):
+        raise AssertionError("cached run simulated again")
+    monkeypatch.setattr(monte_carlo, 'make_simulator', no_simulation)
+
+    # Single runs share the grid's entries; a repeated grid is fully cached
+    assert run_monte_carlo('infection', dt_thresh=0.8, cache=cache, **kwargs) == \
+        pytest.approx(direct, nan_ok=True)
+    assert run_monte_carlo_grid('infection', dt_thresholds=[0.8, 1.0], cache=cache,
+                                **kwargs) == grid
+    assert cache.stats()['hits'] == 3
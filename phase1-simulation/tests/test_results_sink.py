@@ -0,0 +1,161 @@
+import csv
+import os
+
+import numpy as np
+import pytest
+
+from results_sink import (ResultsSink, GroupedAggregator, aggregate, iter_chunks, rows_to_columns,
+                          to_csv)
+
+def make_rows(n):
+    rows = []
+    for i in range(n):
+        triggered = i % 3 != 0
+        rows.append({
+            'test': 'T3.1' if i % 2 else 'T3.2',
+            'scenario': 'infection' if i % 4 < 2 else 'normal',
+            'value': float(i % 5),
+            'alert_triggered': triggered,
+            'alert_time': 100.0 + i if triggered else None,
+        })
+    return rows
+
+
+def test_rows_are_written_in_chunks_and_read_back(tmp_path):
+    path = str(tmp_path / 'results')
+    rows = make_rows(25)
+    with ResultsSink(path, chunk_rows=10) as sink:
+        sink.extend(rows[:12])
+        assert len(os.listdir(path)) == 2  # header + one complete chunk
+        sink.extend(rows[12:])
+    assert sink.n_rows == 25
+
+    chunks = list(iter_chunks(path))
+    assert [len(chunk['test']) for chunk in chunks] == [10, 10, 5]
+    alert_time = np.concatenate([chunk['alert_time'] for chunk in chunks])
+    assert np.isnan(alert_time[0]) and alert_time[1] == 101.0
+    assert chunks[0]['alert_triggered'].dtype == bool
+
+    only = list(iter_chunks(path, columns=['value']))
+    assert set(only[0]) == {'value'}
+
+
+def test_append_resumes_and_default_replaces(tmp_path):
+    path = str(tmp_path / 'results')
+    with ResultsSink(path, chunk_rows=4) as sink:
+        sink.extend(make_rows(6))
+
+    with ResultsSink(path, chunk_rows=4, append=True) as sink:
+        assert sink.n_rows == 6
+        sink.extend(make_rows(3))
+    assert sum(len(chunk['test']) for chunk in iter_chunks(path)) == 9
+
+    with ResultsSink(path) as sink:
+        assert sink.n_rows == 0
+        sink.extend(make_rows(2))
+    assert sum(len(chunk['test']) for chunk in iter_chunks(path)) == 2
+
+
+def test_mismatched_row_is_rejected(tmp_path):
+    sink = ResultsSink(str(tmp_path / 'results'))
+    sink.append(make_rows(1)[0])
+    with pytest.raises(ValueError):
+        sink.append({'test': 'T3.1'})
+
+
+def test_none_is_nan_in_numeric_columns_only():
+    chunk = rows_to_columns([{'time': 1, 'test': 'T3.1'}, {'time': None, 'test': 'T3.2'}])
+    assert chunk['time'].dtype == float and np.isnan(chunk['time'][1])
+    with pytest.raises(ValueError):
+        rows_to_columns([{'test': 'T3.1'}, {'test': None}])
+
+
+def test_not_a_results_directory(tmp_path):
+    (tmp_path / 'header.json').write_text('{"format": "other"}')
+    with pytest.raises(ValueError):
+        ResultsSink(str(tmp_path))
+
+
+def test_csv_export(tmp_path):
+    path = str(tmp_path / 'results')
+    with ResultsSink(path, chunk_rows=4) as sink:
+        sink.extend(make_rows(9))
+    csv_path = str(tmp_path / 'results.csv')
+    assert to_csv(path, csv_path) == 9
+
+    with open(csv_path) as f:
+        read = list(csv.DictReader(f))
+    assert len(read) == 9 and read[1]['test'] == 'T3.1' and read[0]['alert_time'] == 'nan'
+
+
+def test_grouped_aggregation_matches_direct_computation(tmp_path):
+    path = str(tmp_path / 'results')
+    rows = make_rows(57)
+    with ResultsSink(path, chunk_rows=8) as sink:
+        sink.extend(rows)
+
+    result = aggregate(path, {
+        'by_point': GroupedAggregator(['test', 'scenario'], {
+            'n': ('value', 'count'),
+            'alerts': ('alert_triggered', 'sum'),
+            'time_mean': ('alert_time', 'mean'),
+            'time_min': ('alert_time', 'min'),
+            'time_max': ('alert_time', 'max'),
+            'first_value': ('value', 'first'),
+            'values': ('value', 'nunique'),
+        }),
+        'normal': GroupedAggregator(['test'], {'alerting': ('alert_triggered', 'nonzero')},
+                                    where={'scenario': 'normal'}),
+    })
+
+    for (test, scenario), got in result['by_point'].items():
+        group = [row for row in rows if (row['test'], row['scenario']) == (test, scenario)]
+        times = [row['alert_time'] for row in group if row['alert_time'] is not None]
+        assert got['n'] == len(group)
+        assert got['alerts'] == sum(row['alert_triggered'] for row in group)
+        assert got['time_mean'] == pytest.approx(np.mean(times))
+        assert (got['time_min'], got['time_max']) == (min(times), max(times))
+        assert got['first_value'] == group[0]['value']
+        assert got['values'] == len({row['value'] for row in group})
+    assert len(result['by_point']) == 4
+
+    for (test,), got in result['normal'].items():
+        assert got['alerting'] == sum(row['alert_triggered'] for row in rows
+                                      if row['test'] == test and row['scenario'] == 'normal')
+
+    # Same result from rows in memory (one chunk)
+    assert aggregate(rows, {'g': GroupedAggregator(['test'], {'n': ('value', 'count')})}) == \
+        {'g': {('T3.1',): {'n': 28}, ('T3.2',): {'n': 29}}}
+
+
+def test_unknown_operation():
+    with pytest.raises(ValueError):
+        GroupedAggregator(['test'], {'x': ('value', 'median')})
+
+
+def test_report_reads_results_directory(tmp_path, capsys):
+    import m1_3_robustness_analysis as m1_3
+
+    rows = []
+    for scenario in m1_3.SCENARIOS:
+        for value in m1_3.DT_THRESHOLDS:
+            rows.append({'test': 'T3.4_DeltaT', 'scenario': scenario,
+                         **dict(m1_3.BASELINE_PARAMS, dt_threshold=value),
+                         'n_replicates': 10, 'n_alerts': 0 if scenario == 'normal' else 9,
+                         'alert_rate': 0.0 if scenario == 'normal' else 0.9,
+                         'alert_rate_ci_low': 0.0, 'alert_rate_ci_high': 1.0,
+                         'alert_time_p05_hours': float('nan'), 'alert_time_p50_hours': 24 * value,
+                         'alert_time_p95_hours': float('nan'), 'alert_time_days': value,
+                         'peak_violation_rate': 0.5})
+    path = str(tmp_path / 'results')
+    with ResultsSink(path, chunk_rows=4) as sink:
+        sink.extend(rows)
+
+    m1_3.generate_summary_table(path)
+    out = capsys.readouterr().out
+    assert '### T3.4_DeltaT' in out and 'dt_threshold' in out
+    assert 'Zero false positives' in out
+
+    x, y = m1_3.sensitivity_series(path)['T3.4_DeltaT']
+    np.testing.assert_allclose(x, m1_3.DT_THRESHOLDS)
+    np.testing.assert_allclose(y, m1_3.DT_THRESHOLDS)
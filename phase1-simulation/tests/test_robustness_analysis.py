@@ -0,0 +1,38 @@
+import pytest
+
+from m1_3_robustness_analysis import run_single_test
+
+
+@pytest.mark.parametrize('scenario', ['normal', 'infection'])
+@pytest.mark.parametrize('params', [
+    (15, 1.0, 7.5, 1.0, 0.75),
+    (5, 2.0, 7.3, 0.8, 0.6),
+    (60, 1.0, 7.7, 1.2, 0.9),
+])
+def test_early_exit_matches_full_run(scenario, params):
+    full = run_single_test(scenario, *params, seed=7)
+    assert full['samples_skipped'] == 0
+
+    alert_only = run_single_test(scenario, *params, seed=7, metrics=['alert_time'])
+    assert alert_only['alert_triggered'] == full['alert_triggered']
+    assert alert_only['alert_time'] == full['alert_time']
+    assert alert_only['violation_rate_peak'] is None
+
+    both = run_single_test(scenario, *params, seed=7, metrics=['alert_time', 'violation_rate_peak'])
+    assert (both['alert_time'], both['violation_rate_peak']) == (full['alert_time'],
+                                                                full['violation_rate_peak'])
+    assert alert_only['samples_skipped'] >= both['samples_skipped']
+
+
+def test_early_exit_skips_samples():
+    # Infection alerts around day 6-7 of 10; normal wounds cannot reach the
+    # alert count once the window stays quiet near the end of the horizon
+    infection = run_single_test('infection', 15, 1.0, 7.5, 1.0, 0.75, seed=0,
+                                metrics=['alert_time'])
+    assert infection['alert_triggered'] and infection['samples_skipped'] > 200
+
+    normal = run_single_test('normal', 15, 1.0, 7.5, 1.0, 0.75, seed=0, metrics=['alert_time'])
+    assert not normal['alert_triggered'] and normal['samples_skipped'] > 0
+
+    with pytest.raises(ValueError):
+        run_single_test('normal', 15, 1.0, 7.5, 1.0, 0.75, seed=0, metrics=['alert_rate'])
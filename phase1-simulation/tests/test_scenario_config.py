@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from scenario_config import load_scenario, load_sensor_specs, build_simulator, build_alert_logic
+from monte_carlo import SENSOR_SPECS, make_simulator
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_shipped_configs_match_run_single_test_defaults():
+    specs = load_sensor_specs()
+    for channel, spec in SENSOR_SPECS.items():
+        for key, value in spec.items():
+            assert specs[channel][key] == value
+
+    for scenario in ['normal', 'infection']:
+        config = load_scenario(scenario)
+        assert config['scenario'] == scenario
+        engine = build_alert_logic(config)
+        assert (engine.pH_threshold, engine.temp_delta_threshold, engine.window_size) == (7.5, 1.0, 48)
+
+
+def test_overrides_and_validation(tmp_path):
+    config = load_scenario('infection', simulation_days=3, seed=None,
+                           alert={'violation_threshold': 0.6})
+    assert config['simulation_days'] == 3
+    assert config['seed'] == 0  # None keeps the file value
+    assert config['alert']['violation_threshold'] == 0.6
+    assert config['alert']['pH_threshold'] == 7.5
+
+    bad = tmp_path / 'scenario_bad.json'
+    bad.write_text('{"scenario": "infection", "alert": {"ph_threshold": 7.5}}')
+    with pytest.raises(ValueError):
+        load_scenario(str(bad))
+
+    specs = tmp_path / 'specs.json'
+    specs.write_text('{"pH": {"noise_sigma": 0.05}}')
+    with pytest.raises(ValueError):
+        load_sensor_specs(str(specs))
+
+
+def test_build_simulator_uses_sensor_specs():
+    config = load_scenario('infection', simulation_days=2)
+    specs = {'pH': {'noise_sigma': 0.5, 'drift_sigma_per_hour': 0.0},
+             'temperature': {'noise_sigma': 0.0, 'drift_sigma_per_hour': 0.0}}
+    data = build_simulator(config, specs).run(50, 2)
+
+    np.testing.assert_array_equal(data['temp'], np.broadcast_to(data['temp_clean'], (50, 192)))
+    assert 0.4 < np.std(data['pH'] - data['pH_clean']) < 0.6
+
+    default = build_simulator(config).run(5, 2)
+    expected = make_simulator('infection', seed=0).run(5, 2)
+    np.testing.assert_array_equal(default['pH'], expected['pH'])
+
+
+def test_analysis_modules_import_without_plotting_stack():
+    code = ("import sys; import m1_3_robustness_analysis, cli; "
+            "print('pandas' in sys.modules, 'matplotlib' in sys.modules)")
+    out = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_DIR, check=True,
+                         capture_output=True, text=True).stdout
+    assert out.split() == ['False', 'False']
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from wound_model import WoundModel
+from noise import NoiseGenerator
+from sensor_channel import SensorChannel
+from sensor_array import SensorArray
+
+
+def test_channels_follow_the_wound_model():
+    wound = WoundModel('infection')
+    array = SensorArray.from_wound_model(wound, seed=0)
+    data = array.run(3, 10)
+
+    assert data['channels'] == ['pH', 'temperature', 'moisture', 'strain']
+    assert data['readings'].shape == (3, len(data['time_hours']), 4)
+    t = data['time_hours']
+    for name, model in [('pH', wound.get_pH), ('temperature', wound.get_temperature),
+                        ('moisture', wound.get_moisture), ('strain', wound.get_strain)]:
+        np.testing.assert_array_equal(data['clean'][:, array.index(name)], model(t))
+    # Infection raises every channel
+    assert (data['clean'][-1] > data['clean'][0]).all()
+
+
+def test_seeded_readings_do_not_depend_on_chunking():
+    array = SensorArray.from_wound_model(WoundModel('normal'), seed=5)
+    whole = array.run(7, 2)['readings']
+    chunks = np.concatenate([chunk['readings'] for chunk in array.iter_chunks(7, 2, chunk_size=3)])
+    np.testing.assert_array_equal(whole, chunks)
+    assert not np.array_equal(whole[0], whole[1])
+
+
+def test_noise_covariance_and_drift_variance():
+    array = SensorArray(sampling_interval_minutes=15, seed=0)
+    zero = lambda t: np.zeros_like(t)
+    for name in ('a', 'b', 'c'):
+        array.add_channel(name, zero, noise_sigma=1.0, drift_sigma_per_hour=0.0)
+    covariance = np.array([[1.0, 0.6, -0.2],
+                           [0.6, 4.0, 0.0],
+                           [-0.2, 0.0, 0.25]])
+    array.set_noise_covariance(covariance)
+    readings = array.read(np.arange(2000) * 0.25, n_patients=20).reshape(-1, 3)
+    np.testing.assert_allclose(np.cov(readings.T), covariance, atol=0.05)
+
+    drifting = SensorArray(sampling_interval_minutes=60, seed=1)
+    drifting.add_channel('d', zero, noise_sigma=0.0, drift_sigma_per_hour=0.5)
+    final = drifting.read(np.arange(100), n_patients=4000)[:, -1, 0]
+    assert np.var(final) == pytest.approx(100 * 0.25, rel=0.1)
+
+
+def test_correlation_keeps_channel_sigmas():
+    array = SensorArray.from_wound_model(WoundModel('normal'), ('pH', 'temperature'), seed=0)
+    array.set_noise_correlation([[1.0, 0.5], [0.5, 1.0]])
+    np.testing.assert_allclose(array.noise_sigma, [0.05, 0.10])
+    assert array.noise_covariance[0, 1] == pytest.approx(0.5 * 0.05 * 0.10)
+
+
+def test_validation():
+    array = SensorArray.from_wound_model(WoundModel('normal'), ('pH', 'temperature'))
+    with pytest.raises(ValueError):
+        array.set_noise_covariance(np.eye(3))
+    with pytest.raises(ValueError):
+        array.set_noise_covariance([[1.0, 2.0], [2.0, 1.0]])  # not positive definite
+    with pytest.raises(ValueError):
+        array.add_channel('pH', np.zeros_like, 0.1, 0.0)
+    with pytest.raises(ValueError):
+        SensorArray.from_wound_model(WoundModel('normal'), ('pH', 'oxygen'))
+    with pytest.raises(ValueError):
+        SensorArray.from_wound_model(WoundModel('normal'), ('moisture',),
+                                     sensor_specs={'pH': {'noise_sigma': 0.05,
+                                                          'drift_sigma_per_hour': 0.0}})
+
+
+def test_sensor_channel_resolves_its_model_once():
+    wound = WoundModel('infection')
+    channel = SensorChannel(wound, NoiseGenerator(1.5, 0.05, rng=0), 'moisture')
+    t = np.arange(0, 48, 0.25)
+    np.testing.assert_array_equal(channel.clean(t), wound.get_moisture(t))
+    assert np.isfinite(channel.read(10.0))
+    assert channel.read_batch(t, 2).shape == (2, len(t))
+
+    with pytest.raises(ValueError):
+        SensorChannel(wound, NoiseGenerator(0.1, 0.0), 'oxygen')
@@ -0,0 +1,68 @@
+import json
+import os
+
+from sweep_executor import SweepExecutor, expand_grid, task_seed
+
+
+def square_task(task):
+    return {'value': task['x'] ** 2, 'pid': os.getpid()}
+
+
+def test_expand_grid_is_full_factorial_with_stable_seeds():
+    tasks = expand_grid({'x': [1, 2, 3], 'scenario': ['normal', 'infection']}, n_seeds=4)
+
+    assert len(tasks) == 3 * 2 * 4
+    assert len({t['task_id'] for t in tasks}) == len(tasks)
+
+    # Seeds depend on the replicate only (common random numbers across grid points)
+    assert {t['seed'] for t in tasks if t['replicate'] == 2} == {task_seed(0, 2)}
+    assert expand_grid({'x': [1]}, n_seeds=4)[3]['seed'] == tasks[3]['seed']
+
+
+def test_parallel_run_matches_inline():
+    tasks = expand_grid({'x': list(range(20))}, n_seeds=2)
+
+    inline = SweepExecutor(square_task, workers=1, chunk_size=3).run(tasks)
+    pooled = SweepExecutor(square_task, workers=2, chunk_size=3).run(tasks)
+
+    def key(rows):
+        return sorted((r['task_id'], r['value']) for r in rows)
+
+    assert key(inline) == key(pooled)
+
+
+def test_resume_skips_completed_tasks(tmp_path):
+    path = str(tmp_path / 'results.jsonl')
+    tasks = expand_grid({'x': list(range(10))})
+
+    SweepExecutor(square_task, workers=1, results_path=path).run(tasks[:4])
+    with open(path, 'a') as f:
+        f.write('{"truncated')  # simulate a crash mid-write
+
+    executor = SweepExecutor(square_task, workers=1, results_path=path)
+    assert len(executor.load_completed()) == 4
+
+    rows = executor.run(tasks)
+    assert sorted(r['x'] for r in rows) == list(range(10))
+
+    with open(path) as f:
+        recorded = [json.loads(line) for line in f if line.startswith('{"x"')]
+    assert len(recorded) == 10
+
+
+def test_task_ids_name_their_axes():
+    by_x = expand_grid({'x': [1]})
+    by_y = expand_grid({'y': [1]})
+
+    assert by_x[0]['task_id'] != by_y[0]['task_id']
+    assert json.loads(by_x[0]['task_id'])['params'] == {'x': 1}
+
+
+def test_run_returns_only_requested_tasks(tmp_path):
+    path = str(tmp_path / 'results.jsonl')
+    SweepExecutor(square_task, workers=1, results_path=path).run(expand_grid({'x': [1, 2, 3]}))
+
+    rows = SweepExecutor(square_task, workers=1, results_path=path).run(
+        expand_grid({'x': [2, 7]}))
+
+    assert sorted(r['x'] for r in rows) == [2, 7]
@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pytest
+
+from wound_model import WoundModel
+from noise import NoiseGenerator
+from batch_simulation import BatchSimulator
+from alert_logic import AlertLogic
+from trace_evaluator import evaluate_traces, evaluate_csv, evaluate_threshold_grid
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def step_reference(engine, pH, temp, t):
+    """What run_single_test loops for."""
+    alert_time, peak = None, 0.0
+    states = []
+    for p, T, ti in zip(pH, temp, t):
+        alert = engine.update(p, T, ti)
+        states.append(alert)
+        if alert and alert_time is None:
+            alert_time = ti
+        peak = max(peak, engine.get_status()['violation_rate'])
+    return np.array(states), alert_time, peak
+
+
+@pytest.mark.parametrize('scenario', ['normal', 'infection'])
+@pytest.mark.parametrize('params', [
+    dict(),
+    dict(pH_threshold=7.3, temp_delta_threshold=0.8, violation_threshold=0.6),
+    dict(sampling_interval_minutes=5),
+    dict(sampling_interval_minutes=60, violation_threshold=0.9),
+    dict(baseline_mode='approximate'),
+])
+def test_batch_evaluation_matches_stepping(scenario, params):
+    interval = params.get('sampling_interval_minutes', 15)
+    sim = BatchSimulator(WoundModel(scenario),
+                         NoiseGenerator(0.15, 0.002, interval),
+                         NoiseGenerator(0.30, 0.01, interval),
+                         sampling_interval_minutes=interval, seed=11)
+    data = sim.run(n_patients=5, simulation_days=10)
+
+    result = evaluate_traces(data['pH'], data['temp'], data['time_hours'], AlertLogic(**params))
+
+    for i in range(5):
+        engine = AlertLogic(**params)
+        states, alert_time, peak = step_reference(engine, data['pH'][i], data['temp'][i],
+                                                  data['time_hours'])
+        np.testing.assert_array_equal(result['alert_states'][i], states)
+        assert result['baseline'][i] == engine.temp_baseline
+        assert result['peak_violation_rate'][i] == peak
+        if alert_time is None:
+            assert result['first_alert_index'][i] == -1
+            assert np.isnan(result['first_alert_time'][i])
+        else:
+            assert result['first_alert_time'][i] == alert_time
+
+
+@pytest.mark.parametrize('scenario', ['normal', 'infection'])
+def test_recorded_csv_matches_stepping(scenario):
+    path = os.path.join(REPO_ROOT, 'data', 'validation', f'm1_2_{scenario}.csv')
+    data = np.loadtxt(path, delimiter=',', skiprows=1)
+
+    result = evaluate_csv(path)
+    states, alert_time, peak = step_reference(AlertLogic(), data[:, 1], data[:, 2], data[:, 0])
+
+    np.testing.assert_array_equal(result['alert_states'], states)
+    assert result['peak_violation_rate'] == peak
+    assert (result['first_alert_index'] >= 0) == (alert_time is not None)
+
+
+def test_short_trace_never_locks():
+    t = np.arange(0, 12, 0.25)
+    result = evaluate_traces(np.full(len(t), 8.0), np.full(len(t), 40.0), t)
+
+    assert result['lock_index'] == -1
+    assert np.isnan(result['baseline'])
+    assert not result['alert_states'].any()
+    assert result['peak_violation_rate'] == 0.0
+
+
+def test_threshold_grid_matches_individual_evaluations():
+    sim = BatchSimulator(WoundModel('infection'), NoiseGenerator(0.10, 0.002),
+                         NoiseGenerator(0.20, 0.01), seed=21)
+    data = sim.run(n_patients=8, simulation_days=10)
+    pH_values, dt_values, viol_values = [7.3, 7.5, 7.7], [0.8, 1.0, 1.2], [0.6, 0.75, 0.9]
+
+    grid = evaluate_threshold_grid(data['pH'], data['temp'], data['time_hours'],
+                                   pH_values, dt_values, viol_values)
+    assert grid['first_alert_time'].shape == (3, 3, 3, 8)
+
+    for i, pH_thresh in enumerate(pH_values):
+        for j, dt_thresh in enumerate(dt_values):
+            for k, viol_thresh in enumerate(viol_values):
+                single = evaluate_traces(data['pH'], data['temp'], data['time_hours'],
+                                         AlertLogic(pH_threshold=pH_thresh,
+                                                    temp_delta_threshold=dt_thresh,
+                                                    violation_threshold=viol_thresh))
+                np.testing.assert_array_equal(grid['first_alert_index'][i, j, k],
+                                              single['first_alert_index'])
+                np.testing.assert_array_equal(grid['peak_violation_rate'][i, j, k],
+                                              single['peak_violation_rate'])
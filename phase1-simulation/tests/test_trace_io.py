@@ -0,0 +1,96 @@
+import os
+
+import numpy as np
+import pytest
+
+from wound_model import WoundModel
+from noise import NoiseGenerator
+from batch_simulation import BatchSimulator
+from trace_evaluator import evaluate_traces, evaluate_csv
+from trace_io import TraceWriter, Trace, iter_csv_chunks, csv_to_trace, trace_to_csv
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def simulate(n_patients, seed=5):
+    sim = BatchSimulator(WoundModel('infection'), NoiseGenerator(0.05, 0.002),
+                         NoiseGenerator(0.10, 0.01), seed=seed)
+    return sim.run(n_patients=n_patients, simulation_days=4)
+
+
+def test_incremental_multi_trace_write_reads_back_as_memmap(tmp_path):
+    data = simulate(3)
+    path = str(tmp_path / 'fleet.trace')
+
+    with TraceWriter(path, n_traces=3, scenario='infection', sampling_interval_minutes=15,
+                     seed=5) as writer:
+        for lo in range(0, len(data['time_hours']), 100):
+            sel = slice(lo, lo + 100)
+            writer.append(data['time_hours'][sel], data['pH'][:, sel], data['temp'][:, sel])
+
+    trace = Trace(path)
+    assert trace.header['seed'] == 5
+    assert trace.n_samples == len(data['time_hours'])
+    assert isinstance(trace.raw('pH'), np.memmap)
+
+    arrays = trace.traces()
+    np.testing.assert_array_equal(arrays['pH'], data['pH'].astype(np.float32))
+    np.testing.assert_array_equal(arrays['temp'][2, 50:60],
+                                  trace.traces(50, 60)['temp'][2])
+
+
+def test_quantized_columns_stay_within_half_a_step(tmp_path):
+    data = simulate(2)
+    path = str(tmp_path / 'q.trace')
+
+    with TraceWriter(path, n_traces=2, quantize={'pH': 1e-3, 'temp': 1e-3}) as writer:
+        writer.append(data['time_hours'], data['pH'], data['temp'])
+
+    trace = Trace(path)
+    assert trace.raw('temp').dtype == np.int16
+    assert np.abs(trace.traces()['temp'] - data['temp']).max() <= 0.5e-3 + 1e-5
+
+    with pytest.raises(ValueError):
+        with TraceWriter(str(tmp_path / 'bad.trace'), quantize={'pH': 1e-5}) as writer:
+            writer.append([0.0], [9.0], [37.0])
+
+
+def test_truncated_tail_is_ignored(tmp_path):
+    path = str(tmp_path / 'crash.trace')
+    with TraceWriter(path) as writer:
+        writer.append(np.arange(10.0), np.full(10, 7.0), np.full(10, 37.0))
+    with open(os.path.join(path, 'temp.bin'), 'ab') as f:
+        f.write(b'\0\0')
+
+    assert Trace(path).n_samples == 10
+
+
+@pytest.mark.parametrize('scenario', ['normal', 'infection'])
+def test_csv_round_trip_keeps_firmware_precision(tmp_path, scenario):
+    csv_path = os.path.join(REPO_ROOT, 'data', 'validation', f'm1_2_{scenario}.csv')
+    trace_path = str(tmp_path / 'm1_2.trace')
+    exported = str(tmp_path / 'm1_2.csv')
+
+    n = csv_to_trace(csv_path, trace_path, chunk_rows=100, scenario=scenario)
+    trace_to_csv(trace_path, exported, chunk_rows=77)
+
+    original = np.loadtxt(csv_path, delimiter=',', skiprows=1)
+    round_trip = np.loadtxt(exported, delimiter=',', skiprows=1)
+    assert n == len(original)
+    with open(exported) as f:
+        assert f.readline().strip() == 'time_hours,pH,temp'
+
+    # Same float32 values the firmware loader (std::stof) reads
+    np.testing.assert_array_equal(round_trip.astype(np.float32), original.astype(np.float32))
+
+    expected = evaluate_csv(exported)
+    arrays = Trace(trace_path).traces()
+    got = evaluate_traces(arrays['pH'], arrays['temp'], arrays['time_hours'])
+    assert got['first_alert_index'] == expected['first_alert_index']
+
+
+def test_csv_chunks_cover_file():
+    csv_path = os.path.join(REPO_ROOT, 'data', 'validation', 'm1_2_normal.csv')
+    chunks = list(iter_csv_chunks(csv_path, chunk_rows=300))
+
+    assert [len(t) for t, _, _ in chunks] == [300, 300, 300, 60]
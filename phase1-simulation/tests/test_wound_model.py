@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from wound_model import WoundModel
+
+
+def scalar_ISI(scenario, t):
+    """Reference per-timestep branch logic."""
+    if scenario == 'normal':
+        return 0.1
+    if t < 48:
+        return 0.0
+    return 0.2 + 0.6 * (1 - np.exp(-(t - 48) / 36))
+
+
+def test_compute_ISI_accepts_arrays():
+    t = np.arange(0, 240, 0.25)
+    for scenario in ['normal', 'infection']:
+        model = WoundModel(scenario=scenario)
+        expected = np.array([scalar_ISI(scenario, ti) for ti in t])
+        np.testing.assert_array_equal(model.compute_ISI(t), expected)
+
+
+def test_scalar_inputs_stay_scalar():
+    model = WoundModel(scenario='infection')
+    assert np.ndim(model.get_pH(10.0)) == 0
+    assert model.compute_ISI(47.9) == 0.0
+    assert model.compute_ISI(48.0) == 0.2
+
+
+def test_trajectory_matches_pointwise_and_is_cached():
+    model = WoundModel(scenario='infection')
+    t = np.arange(0, 240, 0.25)
+
+    pH, temp = model.trajectory(t)
+    np.testing.assert_array_equal(pH, [model.get_pH(ti) for ti in t])
+    np.testing.assert_array_equal(temp, [model.get_temperature(ti) for ti in t])
+
+    # Same scenario + grid from a fresh instance hits the cache
+    again = WoundModel(scenario='infection').trajectory(t.copy())
+    assert again[0] is pH
+    assert not pH.flags.writeable
+
+    # A different scenario on the same grid does not
+    assert WoundModel(scenario='normal').trajectory(t)[0] is not pH
+
+
+def test_parameters_can_be_overridden():
+    model = WoundModel(scenario='infection', onset_hours=24.0, tau_hours=12.0)
+    assert model.compute_ISI(23.9) == 0.0
+    assert model.compute_ISI(24.0) == 0.2
+    assert model.compute_ISI(36.0) == 0.2 + 0.6 * (1 - np.exp(-1.0))
+    assert WoundModel(scenario='normal', ISI_normal=0.15).compute_ISI(100.0) == 0.15
+
+    with pytest.raises(ValueError):
+        WoundModel(scenario='infection', onset=24.0)
+
+
+def test_array_parameters_evaluate_a_batch():
+    t = np.arange(0, 240, 0.25)
+    onsets = np.array([[24.0], [48.0], [96.0]])
+    model = WoundModel(scenario='infection', onset_hours=onsets)
+    pH, _ = model.trajectory(t)
+    assert pH.shape == (3, len(t))
+    for row, onset in enumerate(onsets[:, 0]):
+        np.testing.assert_array_equal(pH[row],
+                                      WoundModel('infection', onset_hours=onset).get_pH(t))